@@ -1,15 +1,19 @@
 """
 Command-line interface for the calculator application.
+
+Startup is kept lean because scripts invoke the CLI many times: modules are
+imported only by the action that needs them, the calculator service (and its
+logger) is created on first use, and a single positional expression is
+evaluated without building the argparse parser.
 """
 import sys
-import argparse
 import os
 # Add the project root to the Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+_PROJECT_ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
-from src.services.calculator_service import CalculatorService
-from src.models.history import History
-from typing import Optional
+from typing import Optional, TextIO
 
 
 class CalculatorCLI:
@@ -17,10 +21,51 @@ class CalculatorCLI:
     Command-line interface for the calculator application.
     """
     
-    def __init__(self):
-        """Initialize the CLI interface."""
-        self.calculator_service = CalculatorService()
-        self.history = History()
+    # Number of formatted batch records buffered before each write to the output
+    BATCH_WRITE_SIZE = 1000
+    
+    # Default on-disk history log, relative to the working directory like calculator.log
+    DEFAULT_HISTORY_FILE = "calculator_history.jsonl"
+    
+    def __init__(self, history_file: Optional[str] = DEFAULT_HISTORY_FILE, history_storage: Optional[str] = None):
+        """
+        Initialize the CLI interface.
+        
+        Args:
+            history_file: Path of the persistent history log, or None to keep history in memory only
+            history_storage: "file", "memory" or "columnar" (defaults to "file" when
+                history_file is set, otherwise "memory")
+        """
+        self.history_file = history_file
+        self.history_storage = history_storage
+        self._calculator_service = None
+        self._history = None
+        self._variables = None
+    
+    @property
+    def calculator_service(self):
+        """Get the calculator service, creating it (and its logger) on first use."""
+        if self._calculator_service is None:
+            from src.services.calculator_service import CalculatorService
+            self._calculator_service = CalculatorService()
+        return self._calculator_service
+    
+    @property
+    def history(self):
+        """Get the calculation history, opening the persistent store on first use."""
+        if self._history is None:
+            from src.models.history import create_history
+            storage = self.history_storage or ("file" if self.history_file else "memory")
+            self._history = create_history(storage, path=self.history_file)
+        return self._history
+    
+    @property
+    def variables(self):
+        """Get the interactive session's variables, creating the graph on first use."""
+        if self._variables is None:
+            from src.models.variable_graph import VariableGraph
+            self._variables = VariableGraph(self.calculator_service.backend)
+        return self._variables
     
     def run(self, args: Optional[list] = None):
         """
@@ -42,7 +87,12 @@ class CalculatorCLI:
         """Run the calculator in interactive mode."""
         print("Calculator CLI - Interactive Mode")
         print("Commands:")
-        print("  <expression> (e.g., '5 + 3', 'sqrt(16)')")
+        print("  <expression> (e.g., '5 + 3', 'sqrt(16)', 'x * ans')")
+        print("  <name> = <expression> - Define a variable (e.g., 'x = 5 * 3'); ans is the last result")
+        print("  vars - Show variables")
+        print("  deps <name> - Show what a variable depends on and what depends on it")
+        print("  recomputed - Show the variables recomputed by the last change")
+        print("  del <name> - Remove a variable")
         print("  history - Show calculation history")
         print("  clear - Clear calculation history")
         print("  quit or exit - Exit the calculator")
@@ -60,20 +110,7 @@ class CalculatorCLI:
                 elif user_input.lower() == 'clear':
                     self.clear_history()
                 elif user_input:
-                    result = self.calculator_service.calculate_from_expression(user_input)
-                    
-                    if result["status"] == "success":
-                        print(f"Result: {result['result']}")
-                        
-                        # Add to history
-                        # Note: For simplicity, we'll just store the expression and result
-                        # In a real implementation, we'd create a proper Calculation object
-                        self.history.add_item({
-                            "expression": user_input,
-                            "result": result["result"]
-                        })
-                    else:
-                        print(f"Error: {result['error']}")
+                    self.execute_line(user_input)
                 
             except KeyboardInterrupt:
                 print("\nGoodbye!")
@@ -89,15 +126,76 @@ class CalculatorCLI:
         Args:
             args: Command line arguments
         """
+        if len(args) == 1 and not self._is_option(args[0]):
+            # A single expression, e.g. calculator_cli.py "5 + 3": no option parsing needed
+            self.calculate_expression(args[0])
+            return
+        
+        import argparse
         parser = argparse.ArgumentParser(description="Calculator CLI")
         parser.add_argument("--operation", "-op", help="Operation to perform")
         parser.add_argument("--operand1", "-o1", help="First operand")
         parser.add_argument("--operand2", "-o2", help="Second operand (optional for unary operations)")
         parser.add_argument("--history", action="store_true", help="Show calculation history")
+        parser.add_argument("--batch", metavar="FILE",
+                            help="Evaluate one expression per line from FILE ('-' for stdin)")
+        parser.add_argument("--expr", metavar="EXPRESSION",
+                            help="Evaluate an expression; with --sweep, over ranges of its variables")
+        parser.add_argument("--sweep", metavar="NAME=START:STOP[:STEP]", action="append",
+                            help="Range of a variable of --expr, stop included (repeat for nested sweeps)")
+        parser.add_argument("--workers", type=int, default=1,
+                            help="Worker processes for --sweep (default: 1)")
+        parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl",
+                            help="Output format for --batch and --sweep (default: jsonl)")
+        parser.add_argument("--fail-fast", action="store_true",
+                            help="Stop --batch or --sweep at the first failing expression")
+        parser.add_argument("--history-file", metavar="FILE",
+                            help=f"Persistent history log (default: {self.DEFAULT_HISTORY_FILE})")
+        parser.add_argument("--history-storage", choices=["file", "memory", "columnar"],
+                            help="History store: the persistent log (default), in memory, or in memory "
+                                 "as columns; given alone, starts interactive mode with it")
+        parser.add_argument("--metrics", choices=["json", "prometheus"],
+                            help="Dump operation timing metrics after running")
+        parser.add_argument("--metrics-file", metavar="FILE",
+                            help="Write --metrics output to FILE instead of stdout")
         
         parsed_args = parser.parse_args(args)
+        if parsed_args.history_file:
+            self.history_file = parsed_args.history_file
+            self._history = None
+        if parsed_args.history_storage:
+            self.history_storage = parsed_args.history_storage
+            self._history = None
         
-        if parsed_args.history:
+        try:
+            self._execute_parsed(parser, parsed_args)
+        finally:
+            if parsed_args.metrics:
+                self.dump_metrics(parsed_args.metrics, parsed_args.metrics_file)
+    
+    @staticmethod
+    def _is_option(arg: str) -> bool:
+        """Check whether an argument is an option (--name, -op, -o1) rather than an expression such as "-5 + 3"."""
+        return arg.startswith("--") or (arg[:1] == "-" and arg[1:2].isalpha() and arg[1:].isalnum())
+    
+    def _execute_parsed(self, parser, parsed_args):
+        """Execute the action selected by the parsed command line arguments."""
+        if parsed_args.sweep and not parsed_args.expr:
+            parser.error("--sweep requires --expr")
+        if parsed_args.batch:
+            try:
+                self.run_batch(parsed_args.batch, parsed_args.format, parsed_args.fail_fast)
+            except OSError as e:
+                print(f"Error: Cannot read batch file {parsed_args.batch}: {e.strerror or e}")
+        elif parsed_args.expr and parsed_args.sweep:
+            try:
+                self.run_sweep(parsed_args.expr, parsed_args.sweep, parsed_args.format,
+                               parsed_args.workers, parsed_args.fail_fast)
+            except ValueError as e:
+                print(self.calculator_service.error_handler.handle_error(e))
+        elif parsed_args.expr:
+            self.calculate_expression(parsed_args.expr)
+        elif parsed_args.history:
             self.show_history()
         elif parsed_args.operation and parsed_args.operand1:
             # Perform validation before calculation
@@ -124,36 +222,396 @@ class CalculatorCLI:
                 # Add to history
                 self.history.add_item({
                     "expression": f"{parsed_args.operand1} {parsed_args.operation} {parsed_args.operand2 or ''}",
-                    "result": result["result"]
+                    "result": result["result"],
+                    # Kept so columnar history can aggregate by operation
+                    "operation": parsed_args.operation,
+                    "operand1": parsed_args.operand1,
+                    "operand2": parsed_args.operand2
                 })
             else:
                 print(f"Error: {result['error']}")
-        elif len(args) == 1 and not parsed_args.history:
-            # If single argument that is not --history, try to parse as expression
-            expression = args[0]
-            result = self.calculator_service.calculate_from_expression(expression)
+        elif parsed_args.history_storage:
+            self.interactive_mode()
+        else:
+            parser.print_help()
+    
+    def calculate_expression(self, expression: str) -> dict:
+        """Evaluate a single expression, print the result and add it to the history."""
+        result = self.calculator_service.calculate_from_expression(expression)
+        
+        if result["status"] == "success":
+            print(f"Result: {result['result']}")
             
+            # Add to history
+            self.history.add_item({
+                "expression": expression,
+                "result": result["result"]
+            })
+        else:
+            print(f"Error: {result['error']}")
+        return result
+    
+    def execute_line(self, line: str):
+        """Execute one interactive line: a variable command, an assignment or an expression."""
+        command, _, argument = line.partition(" ")
+        command = command.lower()
+        argument = argument.strip()
+        if command == "vars" and not argument:
+            self.show_variables()
+        elif command == "deps" and argument:
+            self.show_dependencies(argument)
+        elif command == "recomputed" and not argument:
+            self.show_recomputed()
+        elif command == "del" and argument:
+            self.delete_variable(argument)
+        else:
+            assignment = self.variables.parse_assignment(line)
+            if assignment is not None:
+                self.assign_variable(*assignment)
+            else:
+                self.evaluate_with_variables(line)
+    
+    def assign_variable(self, name: str, expression: str):
+        """Define a variable, print its value and the dependents that were recomputed."""
+        variables = self.variables
+        error_handler = self.calculator_service.error_handler
+        try:
+            recomputed = variables.define(name, expression)
+        except ValueError as e:
+            print(error_handler.handle_error(e))
+            return
+        
+        variable = variables.get(name)
+        if variable.error is None:
+            value = variables.backend.format(variable.value)
+            print(f"{name} = {value}")
+            self.history.add_item({"expression": f"{name} = {expression}", "result": value})
+        else:
+            print(f"{name}: {variable.error}")
+        if len(recomputed) > 1:
+            self._print_recomputed(recomputed[1:], "dependent", limit=10)
+    
+    def evaluate_with_variables(self, expression: str):
+        """Evaluate an expression that may reference variables or ans, updating ans."""
+        from src.lib.expression_parser import variable_names
+        variables = self.variables
+        try:
+            references = variable_names(variables.parser.parse(expression))
+        except ValueError:
+            # Let the service report the error
+            references = ()
+        if not references:
+            result = self.calculate_expression(expression)
             if result["status"] == "success":
-                print(f"Result: {result['result']}")
+                from decimal import Decimal
+                variables.ans = Decimal(result["result"])
+            return
+        
+        try:
+            value = variables.backend.format(variables.evaluate(expression))
+        except ValueError as e:
+            print(self.calculator_service.error_handler.handle_error(e))
+            return
+        print(f"Result: {value}")
+        self.history.add_item({"expression": expression, "result": value})
+    
+    def delete_variable(self, name: str):
+        """Remove a variable; its dependents become errors."""
+        try:
+            recomputed = self.variables.remove(name)
+        except ValueError as e:
+            print(self.calculator_service.error_handler.handle_error(e))
+            return
+        print(f"Removed {name}")
+        if recomputed:
+            self._print_recomputed(recomputed, "dependent", limit=10)
+    
+    def show_variables(self):
+        """Show every variable with its value (or error) and formula."""
+        variables = self.variables
+        if not len(variables):
+            print("No variables defined.")
+            return
+        print(f"Variables ({len(variables)}):")
+        for variable in variables:
+            print(f"  {self._describe_variable(variable)}")
+    
+    def show_dependencies(self, name: str):
+        """Show a variable's formula, the variables it references and the variables referencing it."""
+        variables = self.variables
+        variable = variables.get(name)
+        dependents = variables.dependents(name)
+        if variable is None and not dependents:
+            print(f"Error: Undefined variable: {name}")
+            return
+        print(self._describe_variable(variable) if variable is not None else f"{name} (not defined)")
+        print(f"  depends on: {', '.join(variables.dependencies(name)) or '-'}")
+        print(f"  used by: {', '.join(dependents) or '-'}")
+    
+    def show_recomputed(self):
+        """Show the variables recomputed by the last assignment or removal."""
+        recomputed = self.variables.last_recomputed
+        if not recomputed:
+            print("Nothing recomputed yet.")
+        else:
+            self._print_recomputed(recomputed, "variable")
+    
+    def _print_recomputed(self, names: list, noun: str, limit: Optional[int] = None):
+        """Print recomputed variables with their new values, at most limit of them."""
+        variables = self.variables
+        shown = []
+        for name in names[:limit] if limit else names:
+            variable = variables.get(name)
+            if variable is not None:
+                shown.append(f"{name} = {variables.backend.format(variable.value)}" if variable.error is None
+                             else f"{name} (error)")
+        more = f", ... and {len(names) - len(shown)} more" if len(shown) < len(names) else ""
+        plural = "" if len(names) == 1 else "s"
+        print(f"Recomputed {len(names)} {noun}{plural}: " + ", ".join(shown) + more)
+    
+    def _describe_variable(self, variable) -> str:
+        """Format a variable as "name = value  [formula]"."""
+        if variable.error is None:
+            state = f" = {self.variables.backend.format(variable.value)}"
+        else:
+            state = f": {variable.error}"
+        return f"{variable.name}{state}  [{variable.expression}]"
+    
+    def run_batch(self, source: str, output_format: str = "jsonl", fail_fast: bool = False,
+                  output: Optional[TextIO] = None, summary_output: Optional[TextIO] = None) -> dict:
+        """
+        Evaluate expressions line by line and stream the results.
+        
+        Lines are read lazily and results are written in buffered chunks, so memory
+        use does not grow with the size of the input. Blank lines are skipped.
+        Batch results are not added to the in-memory history.
+        
+        Args:
+            source: Path of the input file, or '-' to read from stdin
+            output_format: 'jsonl' or 'csv'
+            fail_fast: Stop at the first expression that fails
+            output: Stream for results (defaults to stdout)
+            summary_output: Stream for the end-of-run summary (defaults to stderr)
+            
+        Returns:
+            Summary dictionary with counts and throughput
+        """
+        import csv
+        import io
+        import json
+        import time
+        
+        output = output if output is not None else sys.stdout
+        summary_output = summary_output if summary_output is not None else sys.stderr
+        calculator = self.calculator_service.calculator
+        error_handler = self.calculator_service.error_handler
+        
+        if output_format == "csv":
+            row_buffer = io.StringIO()
+            csv_writer = csv.writer(row_buffer, lineterminator="\n")
+            
+            def format_record(line_number, expression, result, error):
+                csv_writer.writerow([
+                    line_number, expression,
+                    "success" if error is None else "error",
+                    result if result is not None else "",
+                    error or ""
+                ])
+                row = row_buffer.getvalue()
+                row_buffer.seek(0)
+                row_buffer.truncate()
+                return row
+            
+            pending = ["line,expression,status,result,error\n"]
+        else:
+            def format_record(line_number, expression, result, error):
+                if error is None:
+                    record = {"line": line_number, "expression": expression,
+                              "result": result, "status": "success"}
+                else:
+                    record = {"line": line_number, "expression": expression,
+                              "error": error, "status": "error"}
+                return json.dumps(record) + "\n"
+            
+            pending = []
+        
+        succeeded = 0
+        failed = 0
+        stopped = False
+        start_time = time.perf_counter()
+        
+        stream = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+        try:
+            for line_number, line in enumerate(stream, 1):
+                expression = line.strip()
+                if not expression:
+                    continue
+                try:
+                    result = str(calculator.calculate_from_expression(expression))
+                    error = None
+                    succeeded += 1
+                except Exception as e:
+                    result = None
+                    error = error_handler.handle_error(e)
+                    failed += 1
                 
-                # Add to history
-                self.history.add_item({
-                    "expression": expression,
-                    "result": result["result"]
-                })
-            else:
-                print(f"Error: {result['error']}")
+                pending.append(format_record(line_number, expression, result, error))
+                if len(pending) >= self.BATCH_WRITE_SIZE:
+                    output.write("".join(pending))
+                    pending.clear()
+                
+                if error is not None and fail_fast:
+                    stopped = True
+                    break
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            if pending:
+                output.write("".join(pending))
+            output.flush()
+        
+        elapsed = time.perf_counter() - start_time
+        total = succeeded + failed
+        summary = {
+            "total": total,
+            "succeeded": succeeded,
+            "failed": failed,
+            "stopped_early": stopped,
+            "elapsed_seconds": round(elapsed, 6),
+            "expressions_per_second": round(total / elapsed, 1) if elapsed > 0 else None
+        }
+        print(
+            f"Batch complete: {total} expressions, {succeeded} succeeded, {failed} failed"
+            f"{' (stopped at first error)' if stopped else ''} "
+            f"in {elapsed:.3f}s ({summary['expressions_per_second'] or 0:.1f} expr/s)",
+            file=summary_output
+        )
+        return summary
+    
+    def run_sweep(self, expression: str, ranges: list, output_format: str = "jsonl", workers: int = 1,
+                  fail_fast: bool = False, output: Optional[TextIO] = None,
+                  summary_output: Optional[TextIO] = None) -> dict:
+        """
+        Evaluate an expression over ranges of its variables and stream the results.
+        
+        Nested ranges are swept as a cartesian product (the last range varies
+        fastest), which is evaluated in chunks and never built in memory. With
+        several workers the chunks run in parallel processes; the output is in the
+        same order either way. Sweep results are not added to the history.
+        
+        Args:
+            expression: Expression to evaluate, e.g. "x ^ 2 / 3"
+            ranges: One "name=start:stop[:step]" range per variable of the expression
+            output_format: 'jsonl' or 'csv'
+            workers: Number of worker processes
+            fail_fast: Stop at the first point that fails
+            output: Stream for results (defaults to stdout)
+            summary_output: Stream for the end-of-run summary (defaults to stderr)
+        
+        Returns:
+            Summary dictionary with counts and throughput
+        
+        Raises:
+            ValueError: If a range or the expression is invalid, or the expression
+                references a variable that is not swept
+        """
+        import csv
+        import io
+        import json
+        import time
+        from src.services.parameter_sweep import ParameterSweep, SweepRange
+        
+        output = output if output is not None else sys.stdout
+        summary_output = summary_output if summary_output is not None else sys.stderr
+        sweep = ParameterSweep(expression, [SweepRange.parse(spec) for spec in ranges],
+                               self.calculator_service.backend)
+        names = sweep.names
+        
+        if output_format == "csv":
+            row_buffer = io.StringIO()
+            csv_writer = csv.writer(row_buffer, lineterminator="\n")
+            csv_writer.writerow([*names, "status", "result", "error"])
+            
+            def format_chunk(rows):
+                for values, result, error in rows:
+                    csv_writer.writerow([*values, "success" if error is None else "error",
+                                         result if result is not None else "", error or ""])
+                text = row_buffer.getvalue()
+                row_buffer.seek(0)
+                row_buffer.truncate()
+                return text
         else:
-            parser.print_help()
+            def format_record(values, result, error):
+                if error is None:
+                    record = {"values": dict(zip(names, values)), "result": result, "status": "success"}
+                else:
+                    record = {"values": dict(zip(names, values)), "error": error, "status": "error"}
+                return json.dumps(record) + "\n"
+            
+            def format_chunk(rows):
+                return "".join([format_record(*row) for row in rows])
+        
+        total = 0
+        failed = 0
+        stopped = False
+        start_time = time.perf_counter()
+        chunks = sweep.chunks(workers)
+        try:
+            for rows in chunks:
+                if fail_fast:
+                    for position, (_, _, error) in enumerate(rows):
+                        if error is not None:
+                            rows = rows[:position + 1]
+                            stopped = True
+                            break
+                total += len(rows)
+                failed += sum(1 for _, _, error in rows if error is not None)
+                output.write(format_chunk(rows))
+                if stopped:
+                    break
+        finally:
+            chunks.close()
+            output.flush()
+        
+        elapsed = time.perf_counter() - start_time
+        summary = {
+            "total": total,
+            "succeeded": total - failed,
+            "failed": failed,
+            "stopped_early": stopped,
+            "elapsed_seconds": round(elapsed, 6),
+            "points_per_second": round(total / elapsed, 1) if elapsed > 0 else None
+        }
+        print(
+            f"Sweep complete: {total} points, {total - failed} succeeded, {failed} failed"
+            f"{' (stopped at first error)' if stopped else ''} "
+            f"in {elapsed:.3f}s ({summary['points_per_second'] or 0:.1f} points/s)",
+            file=summary_output
+        )
+        return summary
+    
+    def dump_metrics(self, output_format: str = "json", path: Optional[str] = None):
+        """
+        Dump the timing metrics recorded by PerformanceMonitor.
+        
+        Args:
+            output_format: "json" or "prometheus"
+            path: File to write to; printed to stdout if omitted
+        """
+        from src.lib.performance_monitor import PerformanceMonitor
+        text = PerformanceMonitor.registry.export(output_format, path)
+        if not path:
+            print(text, end="")
     
     def show_history(self):
         """Show the calculation history."""
-        history_data = self.history.get_items()
-        if not history_data:
+        # Entries are streamed from the history store rather than copied into a list
+        count = self.history.size()
+        if not count:
             print("No calculation history available.")
         else:
-            print(f"Calculation History (last {len(history_data)} items):")
-            for i, entry in enumerate(history_data, 1):
+            print(f"Calculation History (last {count} items):")
+            for i, entry in enumerate(self.history.iter_items(), 1):
                 print(f"  {i}. {entry['expression']} = {entry['result']}")
     
     def clear_history(self):
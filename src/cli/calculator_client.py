@@ -0,0 +1,163 @@
+"""
+Lightweight client for the calculator JSON server.
+"""
+import sys
+import argparse
+import itertools
+import json
+import os
+import socket
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class CalculatorClient:
+    """
+    Blocking client for CalculatorServer speaking newline-delimited JSON.
+    
+    One connection is opened on first use and reused for every call. pipeline()
+    sends many requests before reading their responses, in windows so neither side
+    blocks on a full socket buffer.
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, path: Optional[str] = None,
+                 timeout: Optional[float] = None):
+        """
+        Initialize the client.
+        
+        Args:
+            host: Server TCP host
+            port: Server TCP port
+            path: Server Unix socket path; when given, host and port are ignored
+            timeout: Socket timeout in seconds (None blocks indefinitely)
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._file = None
+        self._ids = itertools.count(1)
+    
+    def _connect(self):
+        if self._socket is None:
+            if self.path:
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.settimeout(self.timeout)
+                self._socket.connect(self.path)
+            else:
+                self._socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            self._file = self._socket.makefile("rwb")
+        return self._file
+    
+    def _encode(self, method: str, params: Dict) -> Tuple[int, bytes]:
+        request_id = next(self._ids)
+        request = {"id": request_id, "method": method, "params": params}
+        return request_id, json.dumps(request, separators=(",", ":")).encode("utf-8") + b"\n"
+    
+    def _read_response(self, request_id: int) -> Dict:
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        response = json.loads(line)
+        if response.get("id") != request_id:
+            raise ConnectionError(f"Response out of order: expected id {request_id}, got {response.get('id')}")
+        return response
+    
+    def call(self, method: str, **params) -> Dict:
+        """
+        Send one request and wait for its response.
+        
+        Returns:
+            Response dictionary (id, status and result or error)
+        """
+        connection = self._connect()
+        request_id, payload = self._encode(method, params)
+        connection.write(payload)
+        connection.flush()
+        return self._read_response(request_id)
+    
+    def pipeline(self, requests: Iterable[Tuple[str, Dict]], window: int = 64) -> List[Dict]:
+        """
+        Send requests without waiting for each response.
+        
+        Args:
+            requests: Iterable of (method, params) pairs
+            window: Maximum number of requests sent before their responses are read
+        
+        Returns:
+            Responses in request order
+        """
+        connection = self._connect()
+        responses = []
+        requests = iter(requests)
+        while True:
+            chunk = [self._encode(method, params) for method, params in itertools.islice(requests, window)]
+            if not chunk:
+                return responses
+            connection.write(b"".join(payload for _, payload in chunk))
+            connection.flush()
+            responses.extend(self._read_response(request_id) for request_id, _ in chunk)
+    
+    def calculate(self, operation: str, operand1: str, operand2: Optional[str] = None) -> Dict:
+        """Perform a calculation on the server."""
+        return self.call("calculate", operation=operation, operand1=operand1, operand2=operand2)
+    
+    def calculate_from_expression(self, expression: str) -> Dict:
+        """Evaluate an expression on the server."""
+        return self.call("calculate_from_expression", expression=expression)
+    
+    def history(self, offset: int = 0, limit: Optional[int] = None) -> Dict:
+        """Get the server's calculation history."""
+        return self.call("history", offset=offset, limit=limit)
+    
+    def clear_history(self) -> Dict:
+        """Clear the server's calculation history."""
+        return self.call("clear_history")
+    
+    def close(self):
+        """Close the connection."""
+        if self._socket is not None:
+            self._file.close()
+            self._socket.close()
+            self._socket = None
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(args: Optional[list] = None):
+    """Command-line entry point: send one request and print the response as JSON."""
+    parser = argparse.ArgumentParser(description="Calculator server client")
+    parser.add_argument("expression", nargs="?", help="Expression to evaluate, e.g. '5 + 3'")
+    parser.add_argument("--host", default="127.0.0.1", help="Server host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Server port (default: 8765)")
+    parser.add_argument("--unix", metavar="PATH", help="Connect to a Unix socket instead of TCP")
+    parser.add_argument("--operation", "-op", help="Operation to perform")
+    parser.add_argument("--operand1", "-o1", help="First operand")
+    parser.add_argument("--operand2", "-o2", help="Second operand (optional for unary operations)")
+    parser.add_argument("--history", action="store_true", help="Show the server's calculation history")
+    parsed_args = parser.parse_args(args)
+    
+    with CalculatorClient(parsed_args.host, parsed_args.port, parsed_args.unix) as client:
+        if parsed_args.history:
+            response = client.history()
+        elif parsed_args.operation and parsed_args.operand1:
+            response = client.calculate(parsed_args.operation, parsed_args.operand1, parsed_args.operand2)
+        elif parsed_args.expression:
+            response = client.calculate_from_expression(parsed_args.expression)
+        else:
+            parser.print_help()
+            return 2
+    print(json.dumps(response))
+    return 0 if response.get("status") == "success" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
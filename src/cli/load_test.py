@@ -0,0 +1,127 @@
+"""
+Load generator for the calculator JSON server.
+
+Example (with a server running on the default port):
+    
+    python src/cli/load_test.py --connections 8 --requests 2000 --pipeline 32
+"""
+import sys
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from typing import Dict, List, Optional
+from src.lib.metrics import Histogram
+
+
+async def _run_connection(host: str, port: int, path: Optional[str], payloads: List[bytes],
+                          pipeline: int, latencies: Histogram) -> Dict:
+    """Send payloads over one connection, keeping up to pipeline requests in flight."""
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path, limit=1 << 24)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit=1 << 24)
+    
+    # Responses arrive in request order, so send times can be matched FIFO
+    sent_at = deque()
+    window = asyncio.Semaphore(pipeline)
+    errors = 0
+    
+    async def send_all():
+        for payload in payloads:
+            await window.acquire()
+            sent_at.append(time.perf_counter_ns())
+            writer.write(payload)
+            await writer.drain()
+    
+    sender = asyncio.ensure_future(send_all())
+    try:
+        for _ in payloads:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("Connection closed by server")
+            latencies.record(time.perf_counter_ns() - sent_at.popleft())
+            window.release()
+            if json.loads(line).get("status") != "success":
+                errors += 1
+        await sender
+    finally:
+        sender.cancel()
+        writer.close()
+    return {"responses": len(payloads), "errors": errors}
+
+
+async def run_load(host: str = "127.0.0.1", port: int = 8765, path: Optional[str] = None,
+                   connections: int = 4, requests: int = 1000, pipeline: int = 16,
+                   method: str = "calculate_from_expression", params: Optional[Dict] = None) -> Dict:
+    """
+    Drive the server with concurrent, pipelined connections.
+    
+    Args:
+        host: Server TCP host
+        port: Server TCP port
+        path: Server Unix socket path; when given, host and port are ignored
+        connections: Number of concurrent connections
+        requests: Number of requests sent on each connection
+        pipeline: Maximum requests in flight per connection
+        method: Request method
+        params: Request parameters (defaults to a small expression)
+    
+    Returns:
+        Summary with request counts, throughput and latency percentiles
+    """
+    params = params if params is not None else {"expression": "(2 + 3) * 4 ^ 2"}
+    payloads = [
+        json.dumps({"id": index, "method": method, "params": params}).encode("utf-8") + b"\n"
+        for index in range(requests)
+    ]
+    latencies = Histogram()
+    
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        _run_connection(host, port, path, payloads, pipeline, latencies)
+        for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+    
+    total = sum(result["responses"] for result in results)
+    latency = latencies.summary()
+    return {
+        "connections": connections,
+        "requests": total,
+        "errors": sum(result["errors"] for result in results),
+        "elapsed_seconds": round(elapsed, 6),
+        "requests_per_second": round(total / elapsed, 1) if elapsed > 0 else None,
+        "latency_ms": {key: round(latency[key], 3) for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")}
+    }
+
+
+def main(args: Optional[list] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Calculator server load generator")
+    parser.add_argument("--host", default="127.0.0.1", help="Server host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Server port (default: 8765)")
+    parser.add_argument("--unix", metavar="PATH", help="Connect to a Unix socket instead of TCP")
+    parser.add_argument("--connections", type=int, default=4, help="Concurrent connections (default: 4)")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per connection (default: 1000)")
+    parser.add_argument("--pipeline", type=int, default=16, help="Requests in flight per connection (default: 16)")
+    parser.add_argument("--expression", default="(2 + 3) * 4 ^ 2", help="Expression sent with every request")
+    parsed_args = parser.parse_args(args)
+    
+    summary = asyncio.run(run_load(
+        parsed_args.host, parsed_args.port, parsed_args.unix,
+        connections=parsed_args.connections,
+        requests=parsed_args.requests,
+        pipeline=parsed_args.pipeline,
+        params={"expression": parsed_args.expression}
+    ))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
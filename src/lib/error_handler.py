@@ -1,32 +1,118 @@
 """
 Error handling utilities for calculator operations.
+
+Every calculator error has an integer code. Exceptions raised by the calculator
+carry their code, and the non-raising paths (Calculator.evaluate and
+CalculatorService.evaluate_many) return a code instead of raising. Messages for
+display are rendered from a code only when they are asked for, through
+ErrorHandler.render.
 """
 
 
-class CalculatorError(Exception):
-    """Base exception class for calculator errors."""
-    pass
+# Error codes; OK means no error
+OK = 0
+DIVISION_BY_ZERO = 1
+NEGATIVE_SQRT = 2
+OUT_OF_RANGE = 3
+UNDEFINED = 4
+NEGATIVE_FACTORIAL = 5
+FACTORIAL_TOO_LARGE = 6
+INVALID_INPUT = 7
+INVALID_OPERATION = 8
+MISSING_OPERAND = 9
+INVALID_ARGUMENT = 10
+UNEXPECTED = 11
+
+# Codes whose message does not depend on the error's details
+_FIXED_MESSAGES = {
+    DIVISION_BY_ZERO: "Error: Cannot divide by zero",
+    NEGATIVE_SQRT: "Error: Cannot calculate square root of negative number",
+    NEGATIVE_FACTORIAL: "Error: Cannot calculate factorial of negative number",
+    FACTORIAL_TOO_LARGE: "Error: Factorial input is too large",
+}
+
+# Message text for a code reported with the offending value instead of an exception
+_DETAIL_TEMPLATES = {
+    INVALID_INPUT: "Invalid number format: {}",
+    INVALID_OPERATION: "Invalid operation: {}",
+    MISSING_OPERAND: "Operation '{}' requires two operands",
+}
+
+# Message text for a code reported without any detail
+_DEFAULT_DETAILS = {
+    OUT_OF_RANGE: "Result is out of range",
+    UNDEFINED: "Result is undefined",
+}
+
+
+class CalculatorError(ValueError):
+    """
+    Base exception class for calculator errors.
+    
+    Calculator errors are ValueErrors, so callers catching ValueError still
+    handle them; code identifies the kind of error without parsing the message.
+    """
+    
+    code = INVALID_ARGUMENT
+    default_message = "Calculator error"
+    
+    def __init__(self, message=None):
+        self.message = message if message is not None else self.default_message
+        super().__init__(self.message)
 
 
 class DivisionByZeroError(CalculatorError):
     """Exception raised when attempting to divide by zero."""
-    def __init__(self, message="Error: Cannot divide by zero"):
-        self.message = message
-        super().__init__(self.message)
+    code = DIVISION_BY_ZERO
+    default_message = "Error: Cannot divide by zero"
 
 
 class InvalidOperationError(CalculatorError):
     """Exception raised for invalid operations."""
-    def __init__(self, message="Invalid operation"):
-        self.message = message
-        super().__init__(self.message)
+    code = INVALID_OPERATION
+    default_message = "Invalid operation"
 
 
 class InvalidInputError(CalculatorError):
     """Exception raised for invalid input values."""
-    def __init__(self, message="Invalid input"):
-        self.message = message
-        super().__init__(self.message)
+    code = INVALID_INPUT
+    default_message = "Invalid input"
+
+
+class MissingOperandError(CalculatorError):
+    """Exception raised when a binary operation is given one operand."""
+    code = MISSING_OPERAND
+    default_message = "Operation requires two operands"
+
+
+class NegativeSquareRootError(CalculatorError):
+    """Exception raised for the square root of a negative number."""
+    code = NEGATIVE_SQRT
+    default_message = "Square root of negative number is not allowed"
+
+
+class NegativeFactorialError(CalculatorError):
+    """Exception raised for the factorial of a negative number."""
+    code = NEGATIVE_FACTORIAL
+    default_message = "Factorial of negative number is not allowed"
+
+
+class FactorialTooLargeError(CalculatorError):
+    """Exception raised when a factorial exceeds the cost ceiling."""
+    code = FACTORIAL_TOO_LARGE
+    default_message = "Factorial input is too large"
+
+
+class OutOfRangeError(CalculatorError):
+    """Exception raised when a result is too large to represent."""
+    code = OUT_OF_RANGE
+    default_message = "Result is out of range"
+
+
+class UndefinedResultError(CalculatorError):
+    """Exception raised when a result is not a real number."""
+    code = UNDEFINED
+    default_message = "Result is undefined"
 
 
 class ErrorHandler:
@@ -34,6 +120,55 @@ class ErrorHandler:
     Provides centralized error handling for calculator operations.
     """
     
+    @staticmethod
+    def classify(error: Exception) -> int:
+        """
+        Get the error code of an exception.
+        
+        Calculator errors carry their code; other ValueErrors (e.g. from plugin
+        operations) are classified by their message.
+        """
+        if isinstance(error, CalculatorError):
+            return error.code
+        if not isinstance(error, ValueError):
+            return UNEXPECTED
+        message = str(error)
+        if "Division by zero" in message:
+            return DIVISION_BY_ZERO
+        if "Square root of negative number" in message:
+            return NEGATIVE_SQRT
+        if "Factorial of negative number" in message:
+            return NEGATIVE_FACTORIAL
+        if "Factorial input is too large" in message:
+            return FACTORIAL_TOO_LARGE
+        return INVALID_ARGUMENT
+    
+    @staticmethod
+    def render(code: int, detail=None) -> str:
+        """
+        Render the user-friendly message for an error code.
+        
+        Args:
+            code: Error code
+            detail: The exception, or the offending value (an operand or operation
+                name) for errors reported without one; None when there is neither
+        
+        Returns:
+            A user-friendly error message
+        """
+        message = _FIXED_MESSAGES.get(code)
+        if message is not None:
+            return message
+        if isinstance(detail, BaseException):
+            text = str(detail)
+        elif code in _DETAIL_TEMPLATES:
+            text = _DETAIL_TEMPLATES[code].format(detail)
+        else:
+            text = _DEFAULT_DETAILS.get(code, "Calculation failed")
+        if code == UNEXPECTED:
+            return f"Unexpected error: {text}"
+        return f"Error: {text}"
+    
     @staticmethod
     def handle_error(error: Exception) -> str:
         """
@@ -41,21 +176,8 @@ class ErrorHandler:
         
         Args:
             error: The exception that occurred
-            
+        
         Returns:
             A user-friendly error message
         """
-        if isinstance(error, ValueError) and "Division by zero" in str(error):
-            return "Error: Cannot divide by zero"
-        elif isinstance(error, ValueError) and "Square root of negative number" in str(error):
-            return "Error: Cannot calculate square root of negative number"
-        elif isinstance(error, ValueError) and "Factorial of negative number" in str(error):
-            return "Error: Cannot calculate factorial of negative number"
-        elif isinstance(error, ValueError) and "Factorial input is too large" in str(error):
-            return "Error: Factorial input is too large"
-        elif isinstance(error, ValueError):
-            # Generic value error with the original message
-            return f"Error: {str(error)}"
-        else:
-            # General error case
-            return f"Unexpected error: {str(error)}"
\ No newline at end of file
+        return ErrorHandler.render(ErrorHandler.classify(error), error)
@@ -0,0 +1,394 @@
+"""
+Compilation of expressions with free variables into reusable closures.
+
+Evaluating a parsed expression walks the tree and looks every operation up in
+the registry by name on each call. A compiled expression does that work once:
+constant sub-expressions are folded, each operation's implementation for the
+backend is bound into a closure, and evaluating the result is a chain of direct
+function calls with no parsing, dispatch or tree walking.
+"""
+import math
+from decimal import Context, Decimal, localcontext
+from operator import itemgetter
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+from src.lib.error_handler import (DivisionByZeroError, InvalidInputError, NegativeSquareRootError,
+                                   OutOfRangeError, UndefinedResultError)
+from src.lib.expression_parser import (BinaryNode, ExpressionParser, FunctionNode, NegateNode, NumberNode,
+                                       VariableNode, variable_names)
+from src.lib.math_utils import MathUtils
+from src.lib.numeric_backend import DecimalBackend, FloatBackend, Number, NumericBackend
+from src.lib.operation_registry import REGISTRY, OperationSpec
+from src.lib.validation import Validation
+
+
+# Parser shared by compile_expression; names that are not functions are variables
+_PARSER = ExpressionParser(allow_variables=True)
+
+# Parses float variable values given as text
+_FLOAT_BACKEND = FloatBackend()
+
+# A compiled sub-expression: takes the tuple of variable values, returns a number
+Closure = Callable[[Tuple[Number, ...]], Number]
+
+
+class CompiledExpression:
+    """
+    An expression compiled for one backend, evaluated with new variable bindings.
+    
+    Call it with the variable values positionally, in the order of variables, or
+    by name: for "x ^ 2 + 3 * x", compiled(4) and compiled(x=4) both give 28.
+    map() evaluates many bindings in one call, which avoids the per-call setup.
+    
+    Results match backend.evaluate on the parsed expression. Decimal results are
+    rounded to the backend's precision: the built-in operations round in the
+    backend's context directly, and a local context is only entered (once per
+    call, or once per map()) for expressions using other operations. Errors such
+    as division by zero are raised when the expression is evaluated, as
+    ValueErrors with error codes.
+    """
+    
+    __slots__ = ("expression", "variables", "backend", "function", "constant", "_context", "_convert")
+    
+    def __init__(self, expression: str, variables: Tuple[str, ...], backend: NumericBackend,
+                 function: Closure, constant: bool, context: Optional[Context] = None):
+        """
+        Initialize a compiled expression (use compile_expression to create one).
+        
+        Args:
+            expression: Source text
+            variables: Names of the variables, in positional order
+            backend: Backend the expression was compiled for
+            function: Closure taking the tuple of variable values
+            constant: Whether the whole expression was folded to a constant
+            context: Decimal context to enter around evaluation, if the closure needs one
+        """
+        self.expression = expression
+        self.variables = variables
+        self.backend = backend
+        self.function = function
+        self.constant = constant
+        self._context = context
+        self._convert = _to_float if isinstance(backend, FloatBackend) else _to_decimal
+    
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.expression!r}, variables={self.variables!r}, backend={self.backend.name!r})"
+    
+    def __call__(self, *values, **bindings) -> Number:
+        """Evaluate with the given variable values (positional, or by name)."""
+        if bindings or len(values) != len(self.variables):
+            arguments = self._arguments(values, bindings)
+        else:
+            arguments = tuple(map(self._convert, values))
+        if self._context is None:
+            return self.function(arguments)
+        with localcontext(self._context):
+            return self.function(arguments)
+    
+    def map(self, bindings: Iterable) -> List[Number]:
+        """
+        Evaluate the expression for many bindings.
+        
+        Args:
+            bindings: For a single variable, an iterable of values; otherwise an
+                iterable of tuples (in the order of variables) or of dicts by name
+        
+        Returns:
+            The results, in order
+        
+        Raises:
+            ValueError: At the first binding whose evaluation fails
+        """
+        function = self.function
+        single = len(self.variables) == 1
+        convert = self._convert
+        arguments_for = self._arguments
+        results = []
+        append = results.append
+        with localcontext(self._context) if self._context is not None else _NO_CONTEXT:
+            for binding in bindings:
+                if single and not isinstance(binding, (tuple, list, dict)):
+                    append(function((convert(binding),)))
+                elif isinstance(binding, dict):
+                    append(function(arguments_for((), binding)))
+                else:
+                    append(function(arguments_for(binding, {})))
+        return results
+    
+    def _arguments(self, values: Sequence, bindings: dict) -> Tuple[Number, ...]:
+        """Convert call arguments to the tuple of variable values the closure expects."""
+        variables = self.variables
+        if bindings:
+            if values:
+                raise InvalidInputError("Pass variable values either by position or by name, not both")
+            try:
+                values = [bindings[name] for name in variables]
+            except KeyError as e:
+                raise InvalidInputError(f"Undefined variable: {e.args[0]}")
+            if len(bindings) != len(variables):
+                unknown = sorted(set(bindings).difference(variables))
+                raise InvalidInputError(f"Unknown variable: {unknown[0]}")
+        elif len(values) != len(variables):
+            raise InvalidInputError(f"Expected {len(variables)} variable values ({', '.join(variables)}), "
+                                    f"got {len(values)}")
+        return tuple(map(self._convert, values))
+
+
+class _NoContext:
+    """Context manager doing nothing (the float backend needs no decimal context)."""
+    
+    def __enter__(self):
+        return None
+    
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_CONTEXT = _NoContext()
+
+
+def _to_decimal(value) -> Decimal:
+    """Convert a variable value for the Decimal backend."""
+    if value.__class__ is Decimal:
+        return value
+    if value.__class__ is int:
+        return Decimal(value)
+    if value.__class__ is float:
+        # The shortest repr, so 0.1 binds as 0.1 and not its binary expansion
+        return Decimal(repr(value))
+    return Validation.validate_operand(value)
+
+
+def _to_float(value) -> float:
+    """Convert a variable value for the float backend."""
+    if value.__class__ is float:
+        return value
+    if value.__class__ is int or value.__class__ is Decimal:
+        return float(value)
+    return _FLOAT_BACKEND.parse(value)
+
+
+def compile_expression(expression: str, *, backend: Optional[NumericBackend] = None,
+                       variables: Optional[Sequence[str]] = None) -> CompiledExpression:
+    """
+    Compile an expression with free variables for repeated evaluation.
+    
+    Args:
+        expression: Expression text, e.g. "x ^ 2 + 3 * x"
+        backend: Backend to evaluate with (defaults to a DecimalBackend with the default precision)
+        variables: Order of the positional arguments (defaults to the variables
+            in alphabetical order); may name variables the expression does not use
+    
+    Returns:
+        The compiled expression
+    
+    Raises:
+        ValueError: If the expression cannot be parsed, or variables does not list
+            every variable the expression references
+    """
+    backend = backend if backend is not None else DecimalBackend()
+    node = _PARSER.parse(expression)
+    names = variable_names(node)
+    if variables is None:
+        variables = tuple(sorted(names))
+    else:
+        variables = tuple(variables)
+        missing = sorted(names.difference(variables))
+        if missing:
+            raise InvalidInputError(f"Undefined variable: {missing[0]}")
+    compiler = _Compiler(backend, variables)
+    if compiler.context is not None:
+        with localcontext(compiler.context):
+            function, value = compiler.compile(node)
+    else:
+        function, value = compiler.compile(node)
+    if function is None:
+        function = lambda arguments: value
+    context = compiler.context if compiler.needs_context else None
+    return CompiledExpression(expression, variables, backend, function, value is not None, context)
+
+
+def _decimal_operations(context: Context) -> dict:
+    """
+    The built-in MathUtils operations on operands that are already Decimals, rounding in context.
+    
+    They give the same results and errors as the MathUtils functions run in context,
+    without converting each operand with Decimal() or entering the context on every call.
+    Keyed by implementation, so an operation registered in place of a built-in is not affected.
+    """
+    def divide(operand1: Decimal, operand2: Decimal) -> Decimal:
+        if operand2 == 0:
+            raise DivisionByZeroError("Division by zero is not allowed")
+        return context.divide(operand1, operand2)
+    
+    def power(operand1: Decimal, operand2: Decimal) -> Decimal:
+        # Looked up on each call, like MathUtils.power, so a replaced engine is used
+        return MathUtils.power_engine.compute(operand1, operand2, context)
+    
+    def sqrt(operand1: Decimal, operand2=None) -> Decimal:
+        if operand1 < 0:
+            raise NegativeSquareRootError("Square root of negative number is not allowed")
+        return context.sqrt(operand1)
+    
+    def percentage(operand1: Decimal, operand2: Decimal) -> Decimal:
+        return context.multiply(context.divide(operand1, _HUNDRED), operand2)
+    
+    return {
+        MathUtils.add: context.add,
+        MathUtils.subtract: context.subtract,
+        MathUtils.multiply: context.multiply,
+        MathUtils.divide: divide,
+        MathUtils.power: power,
+        MathUtils.sqrt: sqrt,
+        MathUtils.percentage: percentage,
+    }
+
+
+_HUNDRED = Decimal(100)
+
+
+def _checked(result: float) -> float:
+    # inf - inf and nan - nan are nan, which is not equal to 0
+    if result - result != 0:
+        raise OutOfRangeError("Result is out of range for the float backend")
+    return result
+
+
+def _float_add(operand1: float, operand2: float) -> float:
+    return _checked(operand1 + operand2)
+
+
+def _float_subtract(operand1: float, operand2: float) -> float:
+    return _checked(operand1 - operand2)
+
+
+def _float_multiply(operand1: float, operand2: float) -> float:
+    return _checked(operand1 * operand2)
+
+
+def _float_divide(operand1: float, operand2: float) -> float:
+    if operand2 == 0:
+        raise DivisionByZeroError("Division by zero is not allowed")
+    return _checked(operand1 / operand2)
+
+
+def _float_power(operand1: float, operand2: float) -> float:
+    if operand1 == 0 and operand2 < 0:
+        raise DivisionByZeroError("Division by zero is not allowed")
+    try:
+        # math.pow raises instead of returning inf or nan for finite operands
+        return math.pow(operand1, operand2)
+    except OverflowError:
+        raise OutOfRangeError("Result is out of range for the float backend")
+    except ValueError:
+        raise UndefinedResultError(f"Power is undefined for {operand1} ^ {operand2}")
+
+
+# The FloatMath arithmetic with the float backend's range check folded in
+_FLOAT_OPERATIONS = {
+    MathUtils.add: _float_add,
+    MathUtils.subtract: _float_subtract,
+    MathUtils.multiply: _float_multiply,
+    MathUtils.divide: _float_divide,
+    MathUtils.power: _float_power,
+}
+
+
+class _Compiler:
+    """Builds the closure for one expression tree (single use)."""
+    
+    def __init__(self, backend: NumericBackend, variables: Tuple[str, ...]):
+        self.backend = backend
+        self.is_float = isinstance(backend, FloatBackend)
+        self.positions = {name: position for position, name in enumerate(variables)}
+        # A private copy of the Decimal backend's context, so the signal flags set while
+        # evaluating do not touch the backend's; None for the float backend
+        self.context = backend.context.copy() if isinstance(backend, DecimalBackend) else None
+        self.decimal_operations = _decimal_operations(self.context) if self.context is not None else {}
+        # Set when an operation is compiled that rounds in the current context
+        self.needs_context = False
+    
+    def compile(self, node) -> Tuple[Optional[Closure], Optional[Number]]:
+        """
+        Compile a sub-expression.
+        
+        Returns:
+            (None, value) when the sub-expression folds to a constant, otherwise (closure, None)
+        """
+        if isinstance(node, NumberNode):
+            return None, float(node.value) if self.is_float else node.value
+        if isinstance(node, VariableNode):
+            return itemgetter(self.positions[node.name]), None
+        if isinstance(node, NegateNode):
+            return self._negate(*self.compile(node.operand))
+        if isinstance(node, BinaryNode):
+            spec = REGISTRY.require(node.operation)
+            return self._apply(spec, self.compile(node.left), self.compile(node.right))
+        if isinstance(node, FunctionNode):
+            spec = REGISTRY.require(node.operation)
+            return self._apply(spec, self.compile(node.argument), None)
+        raise InvalidInputError(f"Cannot compile expression node: {node!r}")
+    
+    def _negate(self, operand: Optional[Closure], value: Optional[Number]):
+        if operand is None:
+            return None, -value if self.is_float else value.copy_negate()
+        if self.is_float:
+            return (lambda arguments: -operand(arguments)), None
+        return (lambda arguments: operand(arguments).copy_negate()), None
+    
+    def _function(self, spec: OperationSpec) -> Callable[[Number, Optional[Number]], Number]:
+        """The operation's implementation for the backend, as (operand1, operand2) -> result."""
+        if not self.is_float:
+            function = self.decimal_operations.get(spec.function)
+            if function is not None:
+                return function
+            # Other operations round in the current context, which evaluation then enters
+            self.needs_context = True
+            return spec.call
+        function = _FLOAT_OPERATIONS.get(spec.function) if spec.float_function is not None else None
+        if function is not None:
+            return function
+        function = spec.float_call
+        if function is None:
+            backend = self.backend
+            return lambda operand1, operand2: backend.apply(spec, operand1, operand2)
+        isfinite = math.isfinite
+        
+        def checked(operand1: float, operand2: Optional[float]) -> float:
+            result = function(operand1, operand2)
+            if not isfinite(result):
+                raise OutOfRangeError("Result is out of range for the float backend")
+            return result
+        return checked
+    
+    def _apply(self, spec: OperationSpec, left: Tuple[Optional[Closure], Optional[Number]],
+               right: Optional[Tuple[Optional[Closure], Optional[Number]]]):
+        function = self._function(spec)
+        left_closure, left_value = left
+        if right is None:
+            # Unary operation
+            if left_closure is None:
+                folded = self._fold(function, left_value, None)
+                if folded is not None:
+                    return None, folded
+                return (lambda arguments: function(left_value, None)), None
+            return (lambda arguments: function(left_closure(arguments), None)), None
+        
+        right_closure, right_value = right
+        if left_closure is None and right_closure is None:
+            folded = self._fold(function, left_value, right_value)
+            if folded is not None:
+                return None, folded
+            return (lambda arguments: function(left_value, right_value)), None
+        if left_closure is None:
+            return (lambda arguments: function(left_value, right_closure(arguments))), None
+        if right_closure is None:
+            return (lambda arguments: function(left_closure(arguments), right_value)), None
+        return (lambda arguments: function(left_closure(arguments), right_closure(arguments))), None
+    
+    @staticmethod
+    def _fold(function, operand1: Number, operand2: Optional[Number]) -> Optional[Number]:
+        """Compute a constant sub-expression now; failures are left to be raised at evaluation."""
+        try:
+            return function(operand1, operand2)
+        except Exception:
+            return None
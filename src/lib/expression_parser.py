@@ -0,0 +1,311 @@
+"""
+Expression parsing utilities: tokenizer, precedence-climbing parser and AST evaluation.
+"""
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Callable, List, Mapping, Optional, Set, Tuple
+from src.lib.error_handler import InvalidInputError, InvalidOperationError
+from src.lib.operation_registry import REGISTRY
+
+
+NUMBER = "number"
+NAME = "name"
+OPERATOR = "operator"
+
+# Unary minus binds tighter than multiplication but looser than power, so -2 ^ 2 == -4
+UNARY_PRECEDENCE = 3
+
+# Signature of the callback used to apply an operation during evaluation
+ApplyFunction = Callable[[str, Decimal, Optional[Decimal]], Decimal]
+
+# Values of the variables referenced by an expression, by name
+Variables = Mapping[str, Decimal]
+
+
+class NumberNode:
+    """A numeric literal."""
+    __slots__ = ("value",)
+    
+    def __init__(self, value: Decimal):
+        self.value = value
+    
+    def evaluate(self, apply: ApplyFunction, variables: Optional[Variables] = None) -> Decimal:
+        return self.value
+
+
+class VariableNode:
+    """A reference to a variable (only produced by parsers that allow variables)."""
+    __slots__ = ("name",)
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def evaluate(self, apply: ApplyFunction, variables: Optional[Variables] = None) -> Decimal:
+        value = variables.get(self.name) if variables is not None else None
+        if value is None:
+            raise InvalidInputError(f"Undefined variable: {self.name}")
+        return value
+
+
+class NegateNode:
+    """Unary negation of a sub-expression."""
+    __slots__ = ("operand",)
+    
+    def __init__(self, operand):
+        self.operand = operand
+    
+    def evaluate(self, apply: ApplyFunction, variables: Optional[Variables] = None) -> Decimal:
+        return Decimal(self.operand.evaluate(apply, variables)).copy_negate()
+
+
+class BinaryNode:
+    """A binary operation such as addition or power."""
+    __slots__ = ("operation", "left", "right")
+    
+    def __init__(self, operation: str, left, right):
+        self.operation = operation
+        self.left = left
+        self.right = right
+    
+    def evaluate(self, apply: ApplyFunction, variables: Optional[Variables] = None) -> Decimal:
+        return apply(self.operation, self.left.evaluate(apply, variables), self.right.evaluate(apply, variables))
+
+
+class FunctionNode:
+    """A unary function call such as sqrt(16)."""
+    __slots__ = ("operation", "argument")
+    
+    def __init__(self, operation: str, argument):
+        self.operation = operation
+        self.argument = argument
+    
+    def evaluate(self, apply: ApplyFunction, variables: Optional[Variables] = None) -> Decimal:
+        return apply(self.operation, self.argument.evaluate(apply, variables), None)
+
+
+def variable_names(node) -> Set[str]:
+    """Get the names of the variables an expression tree references."""
+    names = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, VariableNode):
+            names.add(node.name)
+        elif isinstance(node, BinaryNode):
+            stack.append(node.left)
+            stack.append(node.right)
+        elif isinstance(node, NegateNode):
+            stack.append(node.operand)
+        elif isinstance(node, FunctionNode):
+            stack.append(node.argument)
+    return names
+
+
+def substitute(node, values: Variables):
+    """Get a copy of an expression tree with the given variables replaced by their values."""
+    if isinstance(node, VariableNode):
+        value = values.get(node.name)
+        return NumberNode(value) if value is not None else node
+    if isinstance(node, BinaryNode):
+        return BinaryNode(node.operation, substitute(node.left, values), substitute(node.right, values))
+    if isinstance(node, NegateNode):
+        return NegateNode(substitute(node.operand, values))
+    if isinstance(node, FunctionNode):
+        return FunctionNode(node.operation, substitute(node.argument, values))
+    return node
+
+
+class ExpressionParser:
+    """
+    Parses expression strings into ASTs, keeping recently parsed ASTs in a bounded LRU cache.
+    """
+    
+    def __init__(self, cache_size: int = 256, allow_variables: bool = False):
+        """
+        Initialize the expression parser.
+        
+        Args:
+            cache_size: Maximum number of parsed expressions to keep (0 disables caching)
+            allow_variables: Parse names that are not functions as variable references
+                (VariableNode) instead of rejecting them
+        """
+        if cache_size < 0:
+            raise ValueError("Cache size must not be negative")
+        self._cache_size = cache_size
+        self.allow_variables = allow_variables
+        self._cache: "OrderedDict[str, object]" = OrderedDict()
+        # Registry version the cached ASTs were parsed against
+        self._registry_version = REGISTRY.version
+        # Guards cache updates; hits only read, so parsing can be shared between threads
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def normalize(expression: str) -> str:
+        """Normalize expression text for use as a cache key (collapse whitespace)."""
+        return " ".join(expression.split())
+    
+    def parse(self, expression: str):
+        """
+        Parse an expression string into an AST, using the cache when possible.
+        
+        Args:
+            expression: Expression text, e.g. "(2 + 3) * sqrt(16) ^ 2"
+        
+        Returns:
+            Root node of the parsed expression
+        """
+        key = self.normalize(expression)
+        cache = self._cache
+        if self._registry_version != REGISTRY.version:
+            # Operations were registered or removed since these were parsed
+            with self._lock:
+                cache.clear()
+                self._registry_version = REGISTRY.version
+        node = cache.get(key)
+        if node is not None:
+            try:
+                cache.move_to_end(key)
+            except KeyError:
+                # Evicted by another thread since the lookup
+                pass
+            return node
+        
+        node = _Parser(key, self.tokenize(key), self.allow_variables).parse()
+        
+        if self._cache_size:
+            with self._lock:
+                cache[key] = node
+                if len(cache) > self._cache_size:
+                    cache.popitem(last=False)
+        return node
+    
+    def evaluate(self, expression: str, apply: ApplyFunction, variables: Optional[Variables] = None) -> Decimal:
+        """Parse (or fetch from cache) and evaluate an expression."""
+        return self.parse(expression).evaluate(apply, variables)
+    
+    def clear_cache(self):
+        """Remove all cached expressions."""
+        with self._lock:
+            self._cache.clear()
+    
+    def cache_size(self) -> int:
+        """Get the current number of cached expressions."""
+        return len(self._cache)
+    
+    @staticmethod
+    def tokenize(expression: str) -> List[Tuple[str, str]]:
+        """
+        Split an expression into (kind, text) tokens.
+        
+        Raises:
+            ValueError: If the expression contains an unsupported character
+        """
+        token_pattern = REGISTRY.token_pattern()
+        tokens = []
+        position = 0
+        length = len(expression)
+        while position < length:
+            match = token_pattern.match(expression, position)
+            if match is None:
+                # Only trailing whitespace remains
+                break
+            number, name, operator, unknown = match.groups()
+            if number is not None:
+                tokens.append((NUMBER, number))
+            elif name is not None:
+                tokens.append((NAME, name))
+            elif operator is not None:
+                tokens.append((OPERATOR, operator))
+            elif unknown is not None:
+                raise InvalidInputError(f"Unsupported operator: {unknown}")
+            position = match.end()
+        return tokens
+
+
+class _Parser:
+    """Precedence-climbing parser over a token list (single use)."""
+    
+    def __init__(self, expression: str, tokens: List[Tuple[str, str]], allow_variables: bool = False):
+        self.expression = expression
+        self.tokens = tokens
+        self.allow_variables = allow_variables
+        self.position = 0
+    
+    def parse(self):
+        if not self.tokens:
+            self._fail()
+        node = self._parse_expression(1)
+        if self.position != len(self.tokens):
+            self._fail()
+        return node
+    
+    def _fail(self):
+        raise InvalidInputError(f"Invalid expression format: {self.expression}")
+    
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+    
+    def _expect(self, text: str):
+        token = self._peek()
+        if token is None or token != (OPERATOR, text):
+            self._fail()
+        self.position += 1
+    
+    def _parse_expression(self, min_precedence: int):
+        left = self._parse_unary()
+        while True:
+            token = self._peek()
+            # Binary operators are symbols such as "+", or registered names such as "mod"
+            spec = REGISTRY.binary_operator(token[1]) if token is not None and token[0] != NUMBER else None
+            if spec is None or spec.precedence < min_precedence:
+                return left
+            self.position += 1
+            right = self._parse_expression(spec.precedence if spec.right_associative else spec.precedence + 1)
+            left = BinaryNode(spec.name, left, right)
+    
+    def _parse_unary(self):
+        token = self._peek()
+        if token == (OPERATOR, '-'):
+            self.position += 1
+            operand = self._parse_expression(UNARY_PRECEDENCE)
+            if isinstance(operand, NumberNode):
+                # Fold negative literals so "-5" stays an exact constant
+                return NumberNode(operand.value.copy_negate())
+            return NegateNode(operand)
+        if token == (OPERATOR, '+'):
+            self.position += 1
+            return self._parse_expression(UNARY_PRECEDENCE)
+        return self._parse_primary()
+    
+    def _parse_primary(self):
+        token = self._peek()
+        if token is None:
+            self._fail()
+        kind, text = token
+        self.position += 1
+        
+        if kind == NUMBER:
+            return NumberNode(Decimal(text))
+        
+        if kind == NAME:
+            spec = REGISTRY.function(text)
+            if spec is None:
+                if self._peek() == (OPERATOR, '('):
+                    raise InvalidOperationError(f"Unsupported unary operation: {text}")
+                if self.allow_variables and REGISTRY.binary_operator(text) is None:
+                    return VariableNode(text)
+                self._fail()
+            self._expect('(')
+            argument = self._parse_expression(1)
+            self._expect(')')
+            return FunctionNode(spec.name, argument)
+        
+        if token == (OPERATOR, '('):
+            node = self._parse_expression(1)
+            self._expect(')')
+            return node
+        
+        self._fail()
@@ -0,0 +1,81 @@
+"""
+Exact factorial computation using binary splitting.
+"""
+import math
+from decimal import Decimal, Context, MAX_PREC, MAX_EMAX, MIN_EMIN
+from src.lib.error_handler import FactorialTooLargeError, NegativeFactorialError
+
+
+# Context wide enough that products of integers are never rounded
+_EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+# Precomputed factorials for small inputs
+_SMALL_FACTORIALS = tuple(Decimal(math.factorial(n)) for n in range(33))
+
+# Digit estimates are capped here (the result would not fit in any context)
+_DIGITS_LIMIT = MAX_PREC + 1
+
+# Ranges at most this long are multiplied as native ints before converting to Decimal
+_LEAF_SIZE = 256
+
+
+class FactorialEngine:
+    """
+    Computes exact factorials with a divide-and-conquer (binary splitting) product.
+    
+    Leaf ranges are multiplied as native ints; larger partial products are combined
+    as exact Decimals, whose large-number multiplication is asymptotically fast and
+    which avoids converting a huge int to Decimal or str at the end. Requests whose
+    estimated result size exceeds max_digits are rejected before any work is done.
+    """
+    
+    def __init__(self, max_digits: int = 500_000):
+        """
+        Initialize the factorial engine.
+        
+        Args:
+            max_digits: Cost ceiling, as the maximum number of decimal digits in a result
+                        (the default allows n up to about 107 000)
+        """
+        if max_digits <= 0:
+            raise ValueError("Max digits must be greater than 0")
+        self.max_digits = max_digits
+    
+    @staticmethod
+    def estimate_digits(n: int) -> int:
+        """Estimate the number of decimal digits in n! without computing it."""
+        if n < 2:
+            return 1
+        # n! has more than n digits from n = 25, so larger n are over the cap
+        # (and would overflow lgamma's float argument)
+        if n >= _DIGITS_LIMIT:
+            return _DIGITS_LIMIT
+        return min(int(math.lgamma(n + 1) / math.log(10)) + 1, _DIGITS_LIMIT)
+    
+    def compute(self, n: int) -> Decimal:
+        """
+        Compute n! exactly.
+        
+        Args:
+            n: Non-negative integer
+        
+        Returns:
+            n! as an exact Decimal
+        
+        Raises:
+            ValueError: If n is negative or the result would exceed the cost ceiling
+        """
+        if n < 0:
+            raise NegativeFactorialError("Factorial of negative number is not allowed")
+        if n < len(_SMALL_FACTORIALS):
+            return _SMALL_FACTORIALS[n]
+        if self.estimate_digits(n) > self.max_digits:
+            raise FactorialTooLargeError("Factorial input is too large")
+        return self._product(2, n + 1)
+    
+    def _product(self, low: int, high: int) -> Decimal:
+        """Exact product of the integers in [low, high)."""
+        if high - low <= _LEAF_SIZE:
+            return Decimal(math.prod(range(low, high)))
+        middle = (low + high) // 2
+        return _EXACT_CONTEXT.multiply(self._product(low, middle), self._product(middle, high))
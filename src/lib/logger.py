@@ -1,9 +1,166 @@
 """
 Logging utilities for calculator operations.
 """
+import atexit
 import logging
 import os
+import queue
+import threading
+import warnings
 from datetime import datetime
+from typing import Dict, List, Optional
+
+
+# Queue policies for asynchronous logging when the queue is full
+BLOCK = "block"
+DROP = "drop"
+
+_STOP = object()
+
+# Serializes the check-then-add of handlers on the shared named loggers
+_CONFIGURE_LOCK = threading.Lock()
+
+
+class _SharedHandlers:
+    """
+    The handlers a CalculatorLogger installed on a named logger, shared by every
+    CalculatorLogger using that name and removed when the last of them closes.
+    """
+    
+    def __init__(self, handlers: List[logging.Handler], queue_handler: Optional["_RecordQueueHandler"] = None,
+                 listener: Optional["_BatchingListener"] = None):
+        self.handlers = handlers
+        self.queue_handler = queue_handler
+        self.listener = listener
+        self.users = 0
+    
+    def install(self, logger: logging.Logger):
+        if self.listener is not None:
+            # The logger only enqueues; the listener owns the real handlers
+            self.listener.start()
+            logger.addHandler(self.queue_handler)
+            atexit.register(self.shutdown, logger)
+        else:
+            for handler in self.handlers:
+                logger.addHandler(handler)
+    
+    def shutdown(self, logger: logging.Logger):
+        """Remove the handlers, writing any queued records first (safe to call twice)."""
+        if self.listener is not None:
+            logger.removeHandler(self.queue_handler)
+            self.listener.stop()
+            atexit.unregister(self.shutdown)
+        else:
+            for handler in self.handlers:
+                logger.removeHandler(handler)
+        for handler in self.handlers:
+            handler.close()
+
+
+# Logger name -> the handlers installed on it by CalculatorLogger
+_SHARED: Dict[str, _SharedHandlers] = {}
+
+
+class _RecordQueueHandler(logging.Handler):
+    """
+    Handler that puts unformatted records on a queue.
+    
+    Message formatting (record.getMessage() and the formatter) is deferred to the
+    listener thread, so the calling thread only pays for creating the record.
+    """
+    
+    def __init__(self, record_queue: queue.Queue, full_policy: str):
+        super().__init__()
+        self.queue = record_queue
+        self.block = full_policy == BLOCK
+        self.dropped = 0
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        # The queue is already thread-safe, so skip the handler lock taken by Handler.handle
+        if not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+    
+    def emit(self, record: logging.LogRecord):
+        if self.block:
+            self.queue.put(record)
+        else:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+
+class _BatchingListener:
+    """
+    Background thread that drains the record queue and writes records in batches.
+    
+    Each batch is formatted and written to every handler's stream with a single
+    write and a single flush.
+    """
+    
+    def __init__(self, record_queue: queue.Queue, handlers: List[logging.StreamHandler], batch_size: int):
+        self.queue = record_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self._thread = threading.Thread(target=self._run, name="CalculatorLogListener", daemon=True)
+    
+    def start(self):
+        """Start the listener thread."""
+        self._thread.start()
+    
+    def stop(self):
+        """Write all queued records and stop the listener thread."""
+        if self._thread.is_alive():
+            self.queue.put(_STOP)
+            self._thread.join()
+    
+    def _run(self):
+        record_queue = self.queue
+        while True:
+            batch = [record_queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(record_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stopping = False
+            records = []
+            for record in batch:
+                if record is _STOP:
+                    stopping = True
+                else:
+                    records.append(record)
+            
+            if records:
+                self._write(records)
+            if stopping:
+                return
+    
+    def _write(self, records: List[logging.LogRecord]):
+        for handler in self.handlers:
+            lines = []
+            for record in records:
+                if record.levelno >= handler.level:
+                    try:
+                        lines.append(handler.format(record) + handler.terminator)
+                    except Exception:
+                        handler.handleError(record)
+            if not lines:
+                continue
+            handler.acquire()
+            try:
+                if handler.stream is None:
+                    # A FileHandler created with delay=True opens its file on the first write
+                    handler.stream = handler._open()
+                handler.stream.write("".join(lines))
+                handler.flush()
+            except Exception:
+                handler.handleError(records[-1])
+            finally:
+                handler.release()
 
 
 class CalculatorLogger:
@@ -11,38 +168,69 @@ class CalculatorLogger:
     Provides logging functionality for calculator operations.
     """
     
-    def __init__(self, log_file: str = "calculator.log", log_level: str = "INFO"):
+    def __init__(self, log_file: str = "calculator.log", log_level: str = "INFO",
+                 async_mode: bool = False, queue_size: int = 10000, full_policy: str = BLOCK,
+                 batch_size: int = 256, name: str = "Calculator"):
         """
         Initialize the calculator logger.
         
         Args:
             log_file: Name of the log file
             log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+            async_mode: Enqueue records on the calling thread and write them from a background listener
+            queue_size: Maximum number of pending records in asynchronous mode
+            full_policy: What to do when the queue is full: "block" the caller or "drop" the record
+            batch_size: Maximum number of records written per batch in asynchronous mode
+            name: Name of the underlying logging.Logger
         """
-        self.logger = logging.getLogger("Calculator")
+        if full_policy not in (BLOCK, DROP):
+            raise ValueError(f"Invalid queue full policy: {full_policy}")
         
-        # Only configure if not already configured
-        if not self.logger.handlers:
-            self.logger.setLevel(getattr(logging, log_level.upper()))
-            
-            # Create file handler
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setLevel(getattr(logging, log_level.upper()))
-            
-            # Create console handler
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(getattr(logging, log_level.upper()))
-            
-            # Create formatter
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            file_handler.setFormatter(formatter)
-            console_handler.setFormatter(formatter)
-            
-            # Add handlers to logger
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+        self.logger = logging.getLogger(name)
+        
+        # Only configure if not already configured; services may be created from several threads
+        with _CONFIGURE_LOCK:
+            shared = _SHARED.get(name)
+            if shared is None and not self.logger.handlers:
+                shared = _SHARED[name] = self._configure(log_file, log_level, async_mode, queue_size,
+                                                         full_policy, batch_size)
+            if shared is not None:
+                shared.users += 1
+        self._shared = shared
+        # The handlers writing this logger's records (empty when configured outside CalculatorLogger)
+        self._handlers: List[logging.Handler] = shared.handlers if shared is not None else []
+        if async_mode and not self.async_mode:
+            warnings.warn(f"Logger {name!r} is already configured to write synchronously; "
+                          f"async_mode is ignored", RuntimeWarning, stacklevel=2)
+    
+    def _configure(self, log_file: str, log_level: str, async_mode: bool, queue_size: int,
+                   full_policy: str, batch_size: int) -> _SharedHandlers:
+        self.logger.setLevel(getattr(logging, log_level.upper()))
+        
+        # Create file handler; the file is opened on the first record, not at startup
+        file_handler = logging.FileHandler(log_file, delay=True)
+        file_handler.setLevel(getattr(logging, log_level.upper()))
+        
+        # Create console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(getattr(logging, log_level.upper()))
+        
+        # Create formatter
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        file_handler.setFormatter(formatter)
+        console_handler.setFormatter(formatter)
+        handlers = [file_handler, console_handler]
+        
+        if async_mode:
+            record_queue = queue.Queue(maxsize=queue_size)
+            queue_handler = _RecordQueueHandler(record_queue, full_policy)
+            shared = _SharedHandlers(handlers, queue_handler, _BatchingListener(record_queue, handlers, batch_size))
+        else:
+            shared = _SharedHandlers(handlers)
+        shared.install(self.logger)
+        return shared
     
     def log_calculation(self, operation: str, operand1: str, operand2: str, result: str, success: bool = True):
         """
@@ -55,13 +243,14 @@ class CalculatorLogger:
             result: The result of the calculation
             success: Whether the operation was successful
         """
+        # Arguments are passed separately so the message is only built if a handler writes it
         if success:
             self.logger.info(
-                f"Calculation: {operand1} {operation} {operand2 or ''} = {result}"
+                "Calculation: %s %s %s = %s", operand1, operation, operand2 or '', result
             )
         else:
             self.logger.error(
-                f"Calculation Failed: {operand1} {operation} {operand2 or ''} - {result}"
+                "Calculation Failed: %s %s %s - %s", operand1, operation, operand2 or '', result
             )
     
     def log_error(self, error_message: str):
@@ -74,4 +263,33 @@ class CalculatorLogger:
     
     def log_warning(self, warning_message: str):
         """Log a warning message."""
-        self.logger.warning(warning_message)
\ No newline at end of file
+        self.logger.warning(warning_message)
+    
+    @property
+    def async_mode(self) -> bool:
+        """Whether this logger writes through a background listener."""
+        return self._shared is not None and self._shared.listener is not None
+    
+    @property
+    def dropped_records(self) -> int:
+        """Number of records dropped because the queue was full (drop policy only)."""
+        return self._shared.queue_handler.dropped if self.async_mode else 0
+    
+    def close(self):
+        """
+        Release this logger's use of the shared handlers.
+        
+        The handlers stay installed while other CalculatorLogger instances with the
+        same name are open; the last one to close removes them. In asynchronous mode
+        that waits for the listener to write everything that was queued.
+        """
+        with _CONFIGURE_LOCK:
+            shared, self._shared = self._shared, None
+            if shared is None:
+                return
+            shared.users -= 1
+            if shared.users:
+                return
+            if _SHARED.get(self.logger.name) is shared:
+                del _SHARED[self.logger.name]
+        shared.shutdown(self.logger)
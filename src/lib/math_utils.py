@@ -1,86 +1,227 @@
 """
 Mathematical utilities for calculator operations with precision handling.
 """
-from decimal import Decimal, getcontext, InvalidOperation
+from decimal import Decimal, InvalidOperation
 import math
+from src.lib.error_handler import (OK, DIVISION_BY_ZERO, NEGATIVE_FACTORIAL, NEGATIVE_SQRT, DivisionByZeroError,
+                                   NegativeFactorialError, NegativeSquareRootError, OutOfRangeError,
+                                   UndefinedResultError)
+from src.lib.factorial import FactorialEngine
+from src.lib.power import PowerEngine
+from src.lib.operation_registry import REGISTRY, Operand, OperationSpec
 
 
 class MathUtils:
     """
     Provides mathematical operations with high precision and accuracy.
+    
+    Operands may be strings or Decimals already parsed by Validation.validate_operand;
+    Decimal() returns a parsed Decimal unchanged, so those are not parsed again.
+    
+    Results are rounded by the current decimal context. The calculator runs these
+    through a numeric backend (see src.lib.numeric_backend), which supplies a local
+    context with the requested precision instead of changing the global one.
     """
     
-    # Set precision for decimal operations to 10 decimal places as per spec
-    getcontext().prec = 10
+    # Engine used for exact factorials; replace to change the cost ceiling
+    factorial_engine = FactorialEngine()
+    
+    # Engine used for powers; replace to change the digit budget for exact results
+    power_engine = PowerEngine()
     
     @staticmethod
-    def add(operand1: str, operand2: str) -> Decimal:
+    def add(operand1: Operand, operand2: Operand) -> Decimal:
         """Perform addition with decimal precision."""
         num1 = Decimal(operand1)
         num2 = Decimal(operand2)
         return num1 + num2
     
     @staticmethod
-    def subtract(operand1: str, operand2: str) -> Decimal:
+    def subtract(operand1: Operand, operand2: Operand) -> Decimal:
         """Perform subtraction with decimal precision."""
         num1 = Decimal(operand1)
         num2 = Decimal(operand2)
         return num1 - num2
     
     @staticmethod
-    def multiply(operand1: str, operand2: str) -> Decimal:
+    def multiply(operand1: Operand, operand2: Operand) -> Decimal:
         """Perform multiplication with decimal precision."""
         num1 = Decimal(operand1)
         num2 = Decimal(operand2)
         return num1 * num2
     
     @staticmethod
-    def divide(operand1: str, operand2: str) -> Decimal:
+    def divide(operand1: Operand, operand2: Operand) -> Decimal:
         """Perform division with decimal precision, handling division by zero."""
         num1 = Decimal(operand1)
         num2 = Decimal(operand2)
         
         if num2 == 0:
-            raise ValueError("Division by zero is not allowed")
+            raise DivisionByZeroError("Division by zero is not allowed")
         
         return num1 / num2
     
     @staticmethod
-    def power(operand1: str, operand2: str) -> Decimal:
-        """Perform power operation with decimal precision."""
+    def power(operand1: Operand, operand2: Operand) -> Decimal:
+        """
+        Perform power operation.
+        
+        Integral exponents give exact results up to the digit budget of
+        MathUtils.power_engine (see PowerEngine); other results are rounded to
+        the current precision.
+        """
         num1 = Decimal(operand1)
         num2 = Decimal(operand2)
-        return num1 ** num2
+        return MathUtils.power_engine.compute(num1, num2)
     
     @staticmethod
-    def sqrt(operand1: str) -> Decimal:
+    def sqrt(operand1: Operand) -> Decimal:
         """Perform square root operation with decimal precision."""
         num = Decimal(operand1)
         
         if num < 0:
-            raise ValueError("Square root of negative number is not allowed")
+            raise NegativeSquareRootError("Square root of negative number is not allowed")
         
         return num.sqrt()
     
     @staticmethod
-    def percentage(operand1: str, operand2: str) -> Decimal:
+    def percentage(operand1: Operand, operand2: Operand) -> Decimal:
         """Calculate percentage: operand1 % of operand2."""
         num1 = Decimal(operand1)
         num2 = Decimal(operand2)
         return (num1 / 100) * num2
     
     @staticmethod
-    def factorial(operand1: str) -> int:
-        """Calculate factorial of operand1."""
-        num = int(Decimal(operand1))
+    def factorial(operand1: Operand) -> Decimal:
+        """
+        Calculate factorial of operand1 exactly.
         
+        The size limit is the cost ceiling of MathUtils.factorial_engine
+        (see FactorialEngine.max_digits).
+        """
+        num = int(Decimal(operand1))
+        return MathUtils.factorial_engine.compute(num)
+
+
+class FloatMath:
+    """
+    The MathUtils operations on native floats, used by the float backend.
+    
+    Error messages match MathUtils so errors are reported the same way.
+    """
+    
+    # Largest n whose factorial is a finite float
+    MAX_FACTORIAL = 170
+    
+    @staticmethod
+    def add(operand1: float, operand2: float) -> float:
+        """Perform float addition."""
+        return operand1 + operand2
+    
+    @staticmethod
+    def subtract(operand1: float, operand2: float) -> float:
+        """Perform float subtraction."""
+        return operand1 - operand2
+    
+    @staticmethod
+    def multiply(operand1: float, operand2: float) -> float:
+        """Perform float multiplication."""
+        return operand1 * operand2
+    
+    @staticmethod
+    def divide(operand1: float, operand2: float) -> float:
+        """Perform float division, handling division by zero."""
+        if operand2 == 0:
+            raise DivisionByZeroError("Division by zero is not allowed")
+        return operand1 / operand2
+    
+    @staticmethod
+    def power(operand1: float, operand2: float) -> float:
+        """Perform float power, rejecting overflow and complex results."""
+        if operand1 == 0 and operand2 < 0:
+            raise DivisionByZeroError("Division by zero is not allowed")
+        try:
+            return math.pow(operand1, operand2)
+        except OverflowError:
+            raise OutOfRangeError("Result is out of range for the float backend")
+        except ValueError:
+            raise UndefinedResultError(f"Power is undefined for {operand1} ^ {operand2}")
+    
+    @staticmethod
+    def sqrt(operand1: float) -> float:
+        """Perform float square root."""
+        if operand1 < 0:
+            raise NegativeSquareRootError("Square root of negative number is not allowed")
+        return math.sqrt(operand1)
+    
+    @staticmethod
+    def percentage(operand1: float, operand2: float) -> float:
+        """Calculate percentage on floats: operand1 % of operand2."""
+        return (operand1 / 100) * operand2
+    
+    @staticmethod
+    def factorial(operand1: float) -> float:
+        """Calculate factorial as a float (n up to MAX_FACTORIAL)."""
+        num = int(operand1)
         if num < 0:
-            raise ValueError("Factorial of negative number is not allowed")
-        
-        if num > 100:  # Prevent extremely large calculations
-            raise ValueError("Factorial input is too large")
-        
-        result = 1
-        for i in range(1, num + 1):
-            result *= i
-        return result
\ No newline at end of file
+            raise NegativeFactorialError("Factorial of negative number is not allowed")
+        if num > FloatMath.MAX_FACTORIAL:
+            raise OutOfRangeError("Result is out of range for the float backend")
+        return float(math.factorial(num))
+
+
+def _factorial_cost(operand1: Operand, operand2: Operand = None) -> float:
+    """Estimated number of digits of operand1!; factorials the engine rejects up front cost 1."""
+    digits = FactorialEngine.estimate_digits(int(Decimal(operand1)))
+    return digits if digits <= MathUtils.factorial_engine.max_digits else 1
+
+
+def _power_cost(operand1: Operand, operand2: Operand) -> float:
+    """
+    Estimated number of digits of an exact power; powers rounded to the context
+    precision (or rejected) are cheap and cost 1.
+    """
+    base = Decimal(operand1)
+    exponent = Decimal(operand2)
+    if base == 0 or exponent <= 0 or exponent != exponent.to_integral_value():
+        return 1
+    digits = PowerEngine.estimate_digits(base, int(exponent))
+    return digits if digits <= MathUtils.power_engine.max_digits else 1
+
+
+def _check_divide(operand1, operand2) -> int:
+    """Error code of a division, before it runs."""
+    return DIVISION_BY_ZERO if operand2 == 0 else OK
+
+
+def _check_power(operand1, operand2) -> int:
+    """Error code of a power, before it runs (0 ^ negative divides by zero)."""
+    return DIVISION_BY_ZERO if operand1 == 0 and operand2 < 0 else OK
+
+
+def _check_sqrt(operand1, operand2=None) -> int:
+    """Error code of a square root, before it runs."""
+    return NEGATIVE_SQRT if operand1 < 0 else OK
+
+
+def _check_factorial(operand1, operand2=None) -> int:
+    """Error code of a factorial, before it runs (the operand is truncated, so -0.5 is allowed)."""
+    return NEGATIVE_FACTORIAL if operand1 <= -1 else OK
+
+
+# Built-in operations; symbols are the infix operators (binary) or extra function names (unary)
+for _spec in (
+    OperationSpec("add", MathUtils.add, 2, ("+",), precedence=1, float_function=FloatMath.add),
+    OperationSpec("subtract", MathUtils.subtract, 2, ("-",), precedence=1, float_function=FloatMath.subtract),
+    OperationSpec("multiply", MathUtils.multiply, 2, ("*",), precedence=2, float_function=FloatMath.multiply),
+    OperationSpec("divide", MathUtils.divide, 2, ("/",), precedence=2, float_function=FloatMath.divide,
+                  check=_check_divide),
+    OperationSpec("percentage", MathUtils.percentage, 2, ("%",), precedence=2, label="% of",
+                  float_function=FloatMath.percentage),
+    OperationSpec("power", MathUtils.power, 2, ("^", "**"), precedence=3, right_associative=True,
+                  cost_estimator=_power_cost, float_function=FloatMath.power, check=_check_power),
+    OperationSpec("sqrt", MathUtils.sqrt, 1, float_function=FloatMath.sqrt, check=_check_sqrt),
+    OperationSpec("factorial", MathUtils.factorial, 1, cost_estimator=_factorial_cost,
+                  float_function=FloatMath.factorial, check=_check_factorial),
+):
+    REGISTRY.register(_spec, replace=True)
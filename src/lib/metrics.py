@@ -0,0 +1,232 @@
+"""
+In-process metrics registry with fixed-bucket latency histograms.
+"""
+import json
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+
+# Upper bucket bounds in nanoseconds: a 1-2-5 series from 1 microsecond to 50 seconds.
+# Samples above the last bound fall into a final overflow (+Inf) bucket.
+DEFAULT_BUCKET_BOUNDS_NS = tuple(
+    mantissa * 10 ** exponent
+    for exponent in range(3, 11)
+    for mantissa in (1, 2, 5)
+)
+
+
+class Histogram:
+    """
+    Latency histogram with fixed buckets.
+    
+    Memory use is constant regardless of the number of samples: each sample only
+    increments one bucket counter and updates the running count, sum and max.
+    Percentiles are estimated by linear interpolation inside the matching bucket.
+    """
+    
+    __slots__ = ("bounds", "counts", "count", "sum_ns", "max_ns")
+    
+    def __init__(self, bounds: tuple = DEFAULT_BUCKET_BOUNDS_NS):
+        """
+        Initialize the histogram.
+        
+        Args:
+            bounds: Sorted upper bounds of the buckets, in nanoseconds
+        """
+        self.bounds = bounds
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum_ns = 0
+        self.max_ns = 0
+    
+    def record(self, duration_ns: int):
+        """Record one sample, in nanoseconds."""
+        self.counts[bisect_left(self.bounds, duration_ns)] += 1
+        self.count += 1
+        self.sum_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+    
+    def merge(self, other: "Histogram"):
+        """Add the samples of another histogram with the same bounds."""
+        counts = self.counts
+        for index, bucket_count in enumerate(other.counts):
+            counts[index] += bucket_count
+        self.count += other.count
+        self.sum_ns += other.sum_ns
+        if other.max_ns > self.max_ns:
+            self.max_ns = other.max_ns
+    
+    def percentile(self, percent: float) -> float:
+        """
+        Estimate a percentile of the recorded samples.
+        
+        Args:
+            percent: Percentile to estimate, between 0 and 100
+        
+        Returns:
+            Estimated value in nanoseconds (0.0 if no samples were recorded)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = percent / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max_ns
+                upper = min(upper, self.max_ns)
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (upper - lower) * max(fraction, 0.0)
+            cumulative += bucket_count
+        return float(self.max_ns)
+    
+    def summary(self) -> Dict:
+        """Get count, mean, p50/p95/p99 and max, with times in milliseconds."""
+        return {
+            "count": self.count,
+            "sum_ms": self.sum_ns / 1e6,
+            "mean_ms": self.sum_ns / self.count / 1e6 if self.count else 0.0,
+            "p50_ms": self.percentile(50) / 1e6,
+            "p95_ms": self.percentile(95) / 1e6,
+            "p99_ms": self.percentile(99) / 1e6,
+            "max_ms": self.max_ns / 1e6
+        }
+
+
+class MetricsRegistry:
+    """
+    Collection of per-operation latency histograms that can be exported as JSON or Prometheus text.
+    
+    Recording is safe from any number of threads without a lock: each thread
+    records into its own set of histograms (a shard), and reads merge the shards.
+    The lock is only taken when a thread records for the first time and when
+    reading. Shards of threads that have finished are folded into one on read.
+    """
+    
+    PROMETHEUS_METRIC = "calculator_operation_duration_seconds"
+    
+    def __init__(self, bounds: tuple = DEFAULT_BUCKET_BOUNDS_NS):
+        """
+        Initialize the registry.
+        
+        Args:
+            bounds: Bucket upper bounds in nanoseconds used for every histogram
+        """
+        self._bounds = bounds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # (owning thread, shard) pairs; the thread is None for the shard of finished threads
+        self._shards: List[Tuple[Optional[threading.Thread], Dict[str, Histogram]]] = []
+    
+    def record(self, name: str, duration_ns: int):
+        """Record a duration in nanoseconds for the named operation."""
+        try:
+            histograms = self._local.histograms
+        except AttributeError:
+            histograms = self._new_shard()
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram(self._bounds)
+        histogram.record(duration_ns)
+    
+    def _new_shard(self) -> Dict[str, Histogram]:
+        """Create the calling thread's shard."""
+        histograms: Dict[str, Histogram] = {}
+        with self._lock:
+            self._shards.append((threading.current_thread(), histograms))
+        self._local.histograms = histograms
+        return histograms
+    
+    def _merged(self) -> Dict[str, Histogram]:
+        """Merge every shard into new histograms, folding the shards of finished threads together."""
+        with self._lock:
+            live = []
+            retired: Dict[str, Histogram] = {}
+            for thread, histograms in self._shards:
+                if thread is None or not thread.is_alive():
+                    for name, histogram in histograms.items():
+                        if name not in retired:
+                            retired[name] = Histogram(self._bounds)
+                        retired[name].merge(histogram)
+                else:
+                    live.append((thread, histograms))
+            if retired:
+                live.append((None, retired))
+            self._shards = live
+            shards = [histograms for _, histograms in live]
+        
+        merged: Dict[str, Histogram] = {}
+        for histograms in shards:
+            for name, histogram in list(histograms.items()):
+                if name not in merged:
+                    merged[name] = Histogram(self._bounds)
+                merged[name].merge(histogram)
+        return merged
+    
+    def histogram(self, name: str) -> Optional[Histogram]:
+        """Get the histogram for an operation (merged across threads), or None if nothing was recorded."""
+        return self._merged().get(name)
+    
+    def names(self) -> List[str]:
+        """Get the names of all recorded operations."""
+        return sorted(self._merged())
+    
+    def reset(self):
+        """Remove all recorded metrics."""
+        with self._lock:
+            for _, histograms in self._shards:
+                histograms.clear()
+    
+    def snapshot(self) -> Dict[str, Dict]:
+        """Get a summary of every histogram, keyed by operation name."""
+        merged = self._merged()
+        return {name: merged[name].summary() for name in sorted(merged)}
+    
+    def to_json(self) -> str:
+        """Render the registry summary as JSON."""
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+    
+    def to_prometheus(self) -> str:
+        """Render the registry in the Prometheus text exposition format."""
+        metric = self.PROMETHEUS_METRIC
+        lines = [
+            f"# HELP {metric} Duration of calculator operations.",
+            f"# TYPE {metric} histogram"
+        ]
+        merged = self._merged()
+        for name in sorted(merged):
+            histogram = merged[name]
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.bounds, histogram.counts):
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{operation="{label}",le="{bound / 1e9:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{operation="{label}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{metric}_sum{{operation="{label}"}} {histogram.sum_ns / 1e9:.9f}')
+            lines.append(f'{metric}_count{{operation="{label}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+    
+    def export(self, output_format: str = "json", path: Optional[str] = None) -> str:
+        """
+        Render the registry and optionally write it to a file.
+        
+        Args:
+            output_format: "json" or "prometheus"
+            path: File to write to (optional)
+        
+        Returns:
+            The rendered text
+        """
+        if output_format == "json":
+            text = self.to_json() + "\n"
+        elif output_format == "prometheus":
+            text = self.to_prometheus()
+        else:
+            raise ValueError(f"Unsupported metrics format: {output_format}")
+        
+        if path:
+            with open(path, "w", encoding="utf-8") as metrics_file:
+                metrics_file.write(text)
+        return text
@@ -0,0 +1,176 @@
+"""
+Numeric backends: exact Decimal arithmetic in a local context, or native floats.
+
+A backend decides how operands are parsed, which implementation of an operation
+runs and how results are formatted. The Decimal backend never changes the
+process-wide decimal context: every call runs in a local context with the
+backend's precision, so services and threads can use different precisions
+side by side.
+"""
+import math
+from decimal import Context, Decimal, localcontext
+from typing import Mapping, Optional, Tuple, Union
+from src.lib.error_handler import InvalidInputError, OutOfRangeError
+from src.lib.operation_registry import REGISTRY, Operand, OperationSpec
+from src.lib.validation import Validation
+
+
+# Significant digits used when no precision is given
+DEFAULT_PRECISION = 10
+
+# Upper bound for a requested precision; very high precisions make sqrt and power slow
+MAX_PRECISION = 1000
+
+# Names accepted by create_backend
+BACKEND_NAMES = ("decimal", "float")
+
+Number = Union[Decimal, float]
+
+
+class NumericBackend:
+    """
+    Interface shared by the numeric backends.
+    
+    Subclasses set name and key and implement parse, try_parse, apply, evaluate and format.
+    """
+    
+    name = ""
+    
+    # Distinguishes results of different backends (and precisions) in result caches
+    key: Tuple = ()
+    
+    def parse(self, operand: Operand) -> Number:
+        """Validate an operand and convert it to the backend's number type."""
+        raise NotImplementedError
+    
+    def try_parse(self, operand: Operand) -> Optional[Number]:
+        """Like parse, but return None for an invalid operand instead of raising."""
+        raise NotImplementedError
+    
+    def apply(self, spec: OperationSpec, operand1: Number, operand2: Optional[Number] = None) -> Number:
+        """Apply an operation to parsed operands (operand2 is None for unary operations)."""
+        raise NotImplementedError
+    
+    def evaluate(self, node, variables: Optional[Mapping[str, Number]] = None) -> Number:
+        """Evaluate a parsed expression tree (variables holds the values of any variables it references)."""
+        raise NotImplementedError
+    
+    def format(self, result: Number) -> str:
+        """Format a result for display."""
+        raise NotImplementedError
+
+
+class DecimalBackend(NumericBackend):
+    """Decimal arithmetic rounded to a fixed number of significant digits."""
+    
+    name = "decimal"
+    
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        """
+        Initialize the backend.
+        
+        Args:
+            precision: Significant digits of rounded results (1 to MAX_PRECISION)
+        """
+        if not isinstance(precision, int) or not 1 <= precision <= MAX_PRECISION:
+            raise ValueError(f"Precision must be between 1 and {MAX_PRECISION}")
+        self.precision = precision
+        self.context = Context(prec=precision)
+        self.key = (self.name, precision)
+        self.parse = Validation.validate_operand
+        self.try_parse = Validation.parse_operand
+    
+    def apply(self, spec: OperationSpec, operand1: Decimal, operand2: Optional[Decimal] = None) -> Decimal:
+        with localcontext(self.context):
+            return spec.call(operand1, operand2)
+    
+    def evaluate(self, node, variables: Optional[Mapping[str, Number]] = None) -> Decimal:
+        with localcontext(self.context):
+            return node.evaluate(_apply_decimal, variables)
+    
+    def format(self, result: Decimal) -> str:
+        return str(result)
+
+
+def _apply_decimal(operation: str, operand1: Decimal, operand2: Optional[Decimal]) -> Decimal:
+    return REGISTRY.require(operation).call(operand1, operand2)
+
+
+class FloatBackend(NumericBackend):
+    """
+    Native float arithmetic for throughput workloads.
+    
+    Results are binary floating point (about 15-17 significant digits). Operations
+    registered without a float implementation are computed by the default Decimal
+    backend and converted.
+    """
+    
+    name = "float"
+    key = ("float",)
+    
+    def parse(self, operand: Operand) -> float:
+        if operand.__class__ is float:
+            return operand
+        if operand.__class__ is not Decimal and not Validation.is_valid_number(operand):
+            raise InvalidInputError(f"Invalid number format: {operand}")
+        return float(operand)
+    
+    def try_parse(self, operand: Operand) -> Optional[float]:
+        if operand.__class__ is float:
+            return operand
+        if operand.__class__ is not Decimal and not Validation.is_valid_number(operand):
+            return None
+        return float(operand)
+    
+    def apply(self, spec: OperationSpec, operand1: float, operand2: Optional[float] = None) -> float:
+        function = spec.float_call
+        if function is None:
+            result = float(DEFAULT_BACKEND.apply(
+                spec,
+                Decimal(repr(operand1)),
+                Decimal(repr(operand2)) if operand2 is not None else None
+            ))
+        else:
+            result = function(operand1, operand2)
+        if not math.isfinite(result):
+            raise OutOfRangeError("Result is out of range for the float backend")
+        return result
+    
+    def evaluate(self, node, variables: Optional[Mapping[str, Number]] = None) -> float:
+        # Expression literals are parsed as Decimals; they are converted on first use
+        return float(node.evaluate(self._apply_node, variables))
+    
+    def _apply_node(self, operation: str, operand1: Number, operand2: Optional[Number]) -> float:
+        return self.apply(
+            REGISTRY.require(operation),
+            float(operand1),
+            float(operand2) if operand2 is not None else None
+        )
+    
+    def format(self, result: float) -> str:
+        text = repr(float(result))
+        return text[:-2] if text.endswith(".0") else text
+
+
+# Backend used where none is given (Calculation objects, fallback for float operations)
+DEFAULT_BACKEND = DecimalBackend()
+
+
+def create_backend(name: str = "decimal", precision: Optional[int] = None) -> NumericBackend:
+    """
+    Create a backend by name.
+    
+    Args:
+        name: "decimal" or "float"
+        precision: Significant digits for the decimal backend (defaults to DEFAULT_PRECISION)
+    
+    Raises:
+        ValueError: If the name is unknown, or a precision is given for the float backend
+    """
+    if name == "decimal":
+        return DecimalBackend(DEFAULT_PRECISION if precision is None else precision)
+    if name == "float":
+        if precision is not None:
+            raise ValueError("Precision is only supported by the decimal backend")
+        return FloatBackend()
+    raise ValueError(f"Unknown numeric backend: {name}")
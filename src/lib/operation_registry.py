@@ -0,0 +1,241 @@
+"""
+Central registry of calculator operations: implementation, arity, symbols and cost estimate.
+
+Dispatch (Calculator, Calculation), validation, expression parsing and cost-based
+routing all look operations up here, so a new operation only has to be registered
+once. The built-in operations are registered by src.lib.math_utils.
+"""
+import importlib
+import re
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Union
+from src.lib.error_handler import InvalidOperationError
+
+
+# An operand as accepted by the calculator: raw text, or a Decimal already produced by
+# Validation.validate_operand. Parsed Decimals are passed through without re-validation.
+Operand = Union[str, Decimal]
+
+# Estimates the cost of one call from its operands (see OperationSpec.estimate_cost)
+CostEstimator = Callable[[Operand, Optional[Operand]], float]
+
+# Checks operands before an operation runs, returning an error code (OK to proceed)
+ErrorCheck = Callable[..., int]
+
+# Symbols the expression parser always treats as operators (unary minus/plus, grouping)
+_FIXED_OPERATOR_SYMBOLS = ("(", ")", "-", "+")
+
+
+class OperationSpec:
+    """
+    Description of one operation.
+    
+    Binary operations (arity 2) are written infix in expressions using their
+    symbols, e.g. "+" or "mod". Unary operations (arity 1) are written as function
+    calls, e.g. sqrt(16), using their name or any of their symbols.
+    """
+    
+    __slots__ = ("name", "function", "arity", "symbols", "precedence", "right_associative",
+                 "label", "cost_estimator", "float_function", "check", "call", "float_call")
+    
+    def __init__(self, name: str, function: Callable[..., Decimal], arity: int = 2, symbols: tuple = (),
+                 precedence: int = 2, right_associative: bool = False, label: Optional[str] = None,
+                 cost_estimator: Optional[CostEstimator] = None,
+                 float_function: Optional[Callable[..., float]] = None, check: Optional[ErrorCheck] = None):
+        """
+        Initialize an operation specification.
+        
+        Args:
+            name: Operation name used by the API, e.g. "add"
+            function: Implementation taking arity Decimal operands and returning a Decimal
+            arity: Number of operands (1 or 2)
+            symbols: Expression aliases: infix operators for binary operations,
+                extra function names for unary ones
+            precedence: Binding strength of a binary operator (+ is 1, * is 2, ^ is 3)
+            right_associative: Whether a binary operator groups right to left
+            label: Text used between the operands when displaying a calculation
+                (defaults to the first symbol, or the name)
+            cost_estimator: Function (operand1, operand2) -> estimated cost; operations
+                without one cost 1
+            float_function: Implementation on native floats used by the float backend
+                (optional; without one the Decimal implementation is used and converted)
+            check: Function (operand1, operand2) -> error code, called with parsed
+                operands before the operation runs on the non-raising path
+                (Calculator.evaluate); it returns OK, or the code of an error the
+                operation would raise, such as DIVISION_BY_ZERO for a zero divisor
+        """
+        if arity not in (1, 2):
+            raise ValueError(f"Unsupported arity: {arity}")
+        self.name = name
+        self.function = function
+        self.arity = arity
+        self.symbols = tuple(symbols)
+        self.precedence = precedence
+        self.right_associative = right_associative
+        self.label = label or (self.symbols[0] if self.symbols else name)
+        self.cost_estimator = cost_estimator
+        self.float_function = float_function
+        self.check = check
+        # Uniform (operand1, operand2) entry points used for dispatch; unary operations ignore operand2
+        self.call = self._binary(function)
+        self.float_call = self._binary(float_function) if float_function is not None else None
+    
+    def _binary(self, function: Callable) -> Callable:
+        if self.arity == 2:
+            return function
+        return lambda operand1, operand2=None: function(operand1)
+    
+    def estimate_cost(self, operand1: Operand, operand2: Optional[Operand] = None) -> float:
+        """Estimate the cost of applying the operation to the given operands."""
+        if self.cost_estimator is None:
+            return 1
+        return self.cost_estimator(operand1, operand2)
+
+
+class OperationRegistry:
+    """
+    Operations keyed by name, with lookup tables for expression symbols.
+    
+    Lookups are dictionary accesses. version increases on every change, so
+    callers that cache derived data (such as parsed expressions) can tell when
+    to rebuild it.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._operations: Dict[str, OperationSpec] = {}
+        self._binary_symbols: Dict[str, OperationSpec] = {}
+        self._functions: Dict[str, OperationSpec] = {}
+        self._token_pattern: Optional[re.Pattern] = None
+        self.version = 0
+    
+    def register(self, spec: OperationSpec, replace: bool = False) -> OperationSpec:
+        """
+        Register an operation.
+        
+        Args:
+            spec: The operation to add
+            replace: Allow replacing an operation with the same name or symbols
+        
+        Returns:
+            The registered spec
+        
+        Raises:
+            ValueError: If the name or a symbol is already taken and replace is False
+        """
+        if not replace:
+            if spec.name in self._operations:
+                raise ValueError(f"Operation already registered: {spec.name}")
+            table = self._binary_symbols if spec.arity == 2 else self._functions
+            for symbol in self._expression_names(spec):
+                if symbol in table:
+                    raise ValueError(f"Symbol already registered: {symbol}")
+        
+        names = set(self._expression_names(spec))
+        operations = {}
+        for name, existing in self._operations.items():
+            # Drop what the new spec replaces: the same name, or a symbol in the same table
+            if name == spec.name or (existing.arity == spec.arity and names.intersection(self._expression_names(existing))):
+                continue
+            operations[name] = existing
+        operations[spec.name] = spec
+        self._rebuild(operations)
+        return spec
+    
+    def unregister(self, name: str):
+        """Remove an operation (no error if it is not registered)."""
+        if name in self._operations:
+            operations = dict(self._operations)
+            del operations[name]
+            self._rebuild(operations)
+    
+    @staticmethod
+    def _expression_names(spec: OperationSpec) -> tuple:
+        """Names an operation can be written as in an expression."""
+        return spec.symbols if spec.arity == 2 else (spec.name,) + spec.symbols
+    
+    def _rebuild(self, operations: Dict[str, OperationSpec]):
+        binary_symbols = {}
+        functions = {}
+        for spec in operations.values():
+            table = binary_symbols if spec.arity == 2 else functions
+            for symbol in self._expression_names(spec):
+                table[symbol] = spec
+        self._operations = operations
+        self._binary_symbols = binary_symbols
+        self._functions = functions
+        self._token_pattern = None
+        self.version += 1
+    
+    def get(self, name: str) -> Optional[OperationSpec]:
+        """Get an operation by name, or None if it is not registered."""
+        return self._operations.get(name)
+    
+    def require(self, name: str) -> OperationSpec:
+        """Get an operation by name, raising ValueError if it is not registered."""
+        spec = self._operations.get(name)
+        if spec is None:
+            raise InvalidOperationError(f"Unsupported operation: {name}")
+        return spec
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._operations
+    
+    def names(self) -> List[str]:
+        """Get the names of all registered operations in registration order."""
+        return list(self._operations)
+    
+    def binary_operator(self, symbol: str) -> Optional[OperationSpec]:
+        """Get the binary operation written with an infix symbol, e.g. "+"."""
+        return self._binary_symbols.get(symbol)
+    
+    def function(self, name: str) -> Optional[OperationSpec]:
+        """Get the unary operation written as a function call, e.g. "sqrt"."""
+        return self._functions.get(name)
+    
+    def token_pattern(self) -> re.Pattern:
+        """
+        Get the tokenizer pattern for the registered symbols.
+        
+        Groups: number, identifier, operator symbol, and any other character.
+        Longer symbols are tried first, so "**" is not read as two "*".
+        """
+        if self._token_pattern is None:
+            symbols = {symbol for symbol in self._binary_symbols if not re.fullmatch(r'[A-Za-z_]\w*', symbol)}
+            symbols.update(_FIXED_OPERATOR_SYMBOLS)
+            operators = "|".join(re.escape(symbol) for symbol in sorted(symbols, key=len, reverse=True))
+            self._token_pattern = re.compile(
+                rf'\s*(?:(\d+\.?\d*|\.\d+)|([A-Za-z_]\w*)|({operators})|(\S))'
+            )
+        return self._token_pattern
+    
+    def load_plugin(self, module_name: str):
+        """
+        Import a plugin module that registers operations.
+        
+        The module may register operations when imported (through register_operation)
+        or define a register(registry) function, which is called with this registry.
+        """
+        module = importlib.import_module(module_name)
+        register = getattr(module, "register", None)
+        if callable(register):
+            register(self)
+
+
+# The registry used by the calculator
+REGISTRY = OperationRegistry()
+
+
+def register_operation(name: str, function: Callable[..., Decimal], arity: int = 2, symbols: tuple = (),
+                       precedence: int = 2, right_associative: bool = False, label: Optional[str] = None,
+                       cost_estimator: Optional[CostEstimator] = None,
+                       float_function: Optional[Callable[..., float]] = None,
+                       check: Optional[ErrorCheck] = None, replace: bool = False) -> OperationSpec:
+    """Register an operation with the calculator's registry (see OperationSpec for the arguments)."""
+    spec = OperationSpec(name, function, arity, symbols, precedence, right_associative, label, cost_estimator,
+                         float_function, check)
+    return REGISTRY.register(spec, replace=replace)
+
+
+# Register the built-in operations; math_utils imports this module, so either import order works
+import src.lib.math_utils  # noqa: E402,F401
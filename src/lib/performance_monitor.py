@@ -4,6 +4,7 @@ Performance monitoring for calculator operations.
 import time
 from typing import Callable, Any
 from functools import wraps
+from src.lib.metrics import MetricsRegistry
 
 
 class PerformanceMonitor:
@@ -11,28 +12,30 @@ class PerformanceMonitor:
     Provides performance monitoring for calculator operations.
     """
     
+    # Registry receiving every timing recorded by time_operation
+    registry = MetricsRegistry()
+    
     @staticmethod
     def time_operation(operation_name: str = None) -> Callable:
         """
         Decorator to time calculator operations.
         
+        Timings are measured with perf_counter_ns and recorded in
+        PerformanceMonitor.registry under the operation name.
+        
         Args:
-            operation_name: Name of the operation being timed (optional)
+            operation_name: Name of the operation being timed (optional, defaults to the function name)
         """
         def decorator(func: Callable) -> Callable:
+            name = operation_name or func.__qualname__
+            
             @wraps(func)
             def wrapper(*args, **kwargs) -> Any:
-                start_time = time.time()
+                start_time = time.perf_counter_ns()
                 try:
-                    result = func(*args, **kwargs)
-                    return result
+                    return func(*args, **kwargs)
                 finally:
-                    end_time = time.time()
-                    execution_time = (end_time - start_time) * 1000  # Convert to milliseconds
-                    if operation_name:
-                        print(f"DEBUG: Operation '{operation_name}' took {execution_time:.2f} ms")
-                    else:
-                        print(f"DEBUG: Operation took {execution_time:.2f} ms")
+                    PerformanceMonitor.registry.record(name, time.perf_counter_ns() - start_time)
             return wrapper
         return decorator
     
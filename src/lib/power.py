@@ -0,0 +1,110 @@
+"""
+Power computation with a bound on the size of the result.
+"""
+import math
+from decimal import Decimal, Context, Overflow, getcontext, MAX_PREC, MAX_EMAX, MIN_EMIN
+from typing import Optional
+from src.lib.error_handler import DivisionByZeroError, OutOfRangeError, UndefinedResultError
+
+
+# Context wide enough that integer powers are never rounded
+_EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+# Digit estimates are capped here (the result would not fit in any context)
+_DIGITS_LIMIT = MAX_PREC + 1
+
+
+class PowerEngine:
+    """
+    Computes base ^ exponent, estimating the size of the result before any work is done.
+    
+    Non-negative integral exponents give exact results: the base is raised by
+    repeated squaring in an exact Decimal context, so 2 ^ 100 and 1.5 ^ 40 keep
+    every digit (like factorials). When the exact result would have more than
+    max_digits digits it is downgraded to the current context's precision, which
+    costs a few multiplications at that precision whatever the exponent. Negative
+    and fractional exponents are always computed at the current context's precision.
+    Results too large for the context (above 10 ^ Emax) are rejected up front.
+    """
+    
+    def __init__(self, max_digits: int = 500_000):
+        """
+        Initialize the power engine.
+        
+        Args:
+            max_digits: Digit budget, as the maximum number of digits in an exact result
+        """
+        if max_digits <= 0:
+            raise ValueError("Max digits must be greater than 0")
+        self.max_digits = max_digits
+    
+    @staticmethod
+    def estimate_magnitude(base: Decimal, exponent: Decimal) -> float:
+        """Estimate log10 of |base ^ exponent| without computing it (base must be non-zero)."""
+        adjusted = base.adjusted()
+        mantissa = float(base.copy_abs().scaleb(-adjusted))
+        log_base = adjusted + math.log10(mantissa)
+        if log_base == 0:
+            return 0.0
+        return float(exponent) * log_base
+    
+    @staticmethod
+    def estimate_digits(base: Decimal, exponent: int) -> int:
+        """Estimate the number of digits in the exact result of base ^ exponent (exponent >= 0)."""
+        coefficient = base.copy_abs().scaleb(-base.as_tuple().exponent)
+        if exponent == 0 or coefficient == 1:
+            return 1
+        magnitude = PowerEngine.estimate_magnitude(coefficient, Decimal(exponent))
+        # Exponents too large for a float give an infinite estimate
+        return int(magnitude) + 1 if magnitude < _DIGITS_LIMIT else _DIGITS_LIMIT
+    
+    def compute(self, base: Decimal, exponent: Decimal, context: Optional[Context] = None) -> Decimal:
+        """
+        Compute base ^ exponent.
+        
+        Args:
+            base: Finite Decimal base
+            exponent: Finite Decimal exponent
+            context: Context to round in and check the range against (defaults to the current context)
+        
+        Returns:
+            The exact power for integral exponents within the digit budget, otherwise
+            the power rounded to the context's precision
+        
+        Raises:
+            ValueError: If the result is too large for the context, or a
+                negative base is raised to a fractional exponent
+        """
+        if context is None:
+            context = getcontext()
+        # Zero has no magnitude to estimate, and any power of it is small
+        if base == 0:
+            if exponent < 0:
+                raise DivisionByZeroError("Division by zero is not allowed")
+            # 0 ^ 0 is left to Decimal
+            return context.power(base, exponent)
+        integral = exponent == exponent.to_integral_value()
+        if integral and exponent > 0:
+            n = int(exponent)
+            adjusted = base.adjusted()
+            # Cheap bounds first (the text of the base has at least as many characters as its
+            # coefficient has digits, and is much faster to get than as_tuple(); then the
+            # result's adjusted exponent); the logarithmic estimates are only needed for large results
+            if n * len(str(base)) <= self.max_digits or self.estimate_digits(base, n) <= self.max_digits:
+                if context.Emin <= n * adjusted and n * (adjusted + 1) <= context.Emax:
+                    return _EXACT_CONTEXT.power(base, n)
+                magnitude = self.estimate_magnitude(base, exponent)
+                if magnitude > context.Emax + 1:
+                    raise OutOfRangeError("Power result is too large")
+                if magnitude > context.Emin:
+                    return _EXACT_CONTEXT.power(base, n)
+        elif base < 0 and not integral:
+            raise UndefinedResultError(f"Power is undefined for {base} ^ {exponent}")
+        
+        if abs(base) != 1 and self.estimate_magnitude(base, exponent) > context.Emax + 1:
+            raise OutOfRangeError("Power result is too large")
+        try:
+            return context.power(base, exponent)
+        except Overflow:
+            # The estimate is within one digit of the limit
+            raise OutOfRangeError("Power result is too large")
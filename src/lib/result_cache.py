@@ -0,0 +1,151 @@
+"""
+Result caching for calculator operations.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Callable, Dict, Hashable, Tuple
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of calculation results with hit/miss/eviction statistics.
+    
+    The cache is bounded both by entry count and by the memory its results use
+    (sys.getsizeof, which for Decimals and ints grows with the number of digits):
+    exact results can have hundreds of thousands of digits, so a few of them
+    would otherwise hold far more memory than many small results. Least recently
+    used entries are evicted until both bounds hold, and a result larger than
+    the whole byte budget is returned without being cached.
+    
+    Keys are built from the operation and the numeric value of the operands, so
+    "5", "5.0" and "+5" share one entry (Decimal values that compare equal also
+    hash equal). A cache hit therefore returns a numerically equal result, which
+    may differ in trailing zeros from a fresh calculation. Failures are cached too
+    and re-raised on a hit without recomputing.
+    
+    The cache can be shared between threads. Lookups and stores hold a lock only
+    for the dictionary update, never while computing; two threads missing on the
+    same key may both compute it.
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Initialize the result cache.
+        
+        Args:
+            max_entries: Maximum number of results to retain before evicting the least recently used
+            max_bytes: Maximum total size of the retained results, in bytes
+        """
+        if max_entries <= 0:
+            raise ValueError("Max entries must be greater than 0")
+        if max_bytes <= 0:
+            raise ValueError("Max bytes must be greater than 0")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        # key -> (success, result or error, size in bytes)
+        self._entries: "OrderedDict[Hashable, Tuple[bool, object, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(operation: str, operand1, operand2=None) -> Tuple:
+        """Build a cache key from the operation and normalized operands."""
+        return (
+            operation,
+            Decimal(operand1),
+            Decimal(operand2) if operand2 is not None else None
+        )
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Decimal]) -> Decimal:
+        """
+        Return the cached result for key, computing and storing it on a miss.
+        
+        Args:
+            key: Cache key (see make_key)
+            compute: Zero-argument callable producing the result
+        
+        Returns:
+            The cached or freshly computed result
+        
+        Raises:
+            Exception: The cached or freshly raised error of a failing calculation
+        """
+        entries = self._entries
+        with self._lock:
+            entry = entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                entries.move_to_end(key)
+            else:
+                self.misses += 1
+        if entry is not None:
+            success, value, _ = entry
+            if success:
+                return value
+            raise value.with_traceback(None)
+        
+        try:
+            value = compute()
+        except Exception as e:
+            self._store(key, False, e)
+            raise
+        self._store(key, True, value)
+        return value
+    
+    def _store(self, key: Hashable, success: bool, value: object):
+        """Insert an entry, evicting the least recently used ones until the cache is within its bounds."""
+        weight = sys.getsizeof(value)
+        if weight > self._max_bytes:
+            return
+        entries = self._entries
+        with self._lock:
+            previous = entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            entries[key] = (success, value, weight)
+            self._bytes += weight
+            while len(entries) > self._max_entries or self._bytes > self._max_bytes:
+                self._bytes -= entries.popitem(last=False)[1][2]
+                self.evictions += 1
+    
+    def clear(self):
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def size(self) -> int:
+        """Get the current number of cached results."""
+        return len(self._entries)
+    
+    @property
+    def max_entries(self) -> int:
+        """Get the maximum number of cached results."""
+        return self._max_entries
+    
+    @property
+    def max_bytes(self) -> int:
+        """Get the maximum total size of the cached results, in bytes."""
+        return self._max_bytes
+    
+    def stats(self) -> Dict:
+        """Get cache statistics as a dictionary."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_entries": self._max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
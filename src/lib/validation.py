@@ -3,6 +3,13 @@ Input validation utilities for calculator operations.
 """
 import re
 from decimal import Decimal, InvalidOperation
+from typing import Optional
+from src.lib.error_handler import InvalidInputError, InvalidOperationError
+from src.lib.operation_registry import REGISTRY, Operand, OperationSpec
+
+
+# Numbers with optional decimal point and sign
+_NUMBER_PATTERN = re.compile(r'^[-+]?(\d+\.?\d*|\.\d+)$')
 
 
 class Validation:
@@ -16,35 +23,63 @@ class Validation:
         if not value:
             return False
         
-        # Allow numbers with optional decimal point and sign
-        pattern = r'^[-+]?(\d+\.?\d*|\.\d+)$'
-        return bool(re.match(pattern, value))
+        return _NUMBER_PATTERN.match(value) is not None
     
     @staticmethod
     def is_valid_operation(operation: str) -> bool:
-        """Check if the operation string is one of the supported operations."""
-        valid_operations = {'add', 'subtract', 'multiply', 'divide', 'power', 'sqrt', 'percentage', 'factorial'}
-        return operation in valid_operations
+        """Check if the operation string is a registered operation."""
+        return operation in REGISTRY
     
     @staticmethod
-    def validate_operand(operand: str) -> Decimal:
-        """Validate and convert operand string to Decimal."""
-        if not Validation.is_valid_number(operand):
-            raise ValueError(f"Invalid number format: {operand}")
+    def validate_operand(operand: Operand) -> Decimal:
+        """
+        Validate and convert an operand to Decimal.
+        
+        This is the single place an operand string is checked and parsed; a Decimal
+        returned from here can be passed on to Calculator and MathUtils as-is.
+        """
+        if operand.__class__ is Decimal:
+            return operand
+        if not operand or _NUMBER_PATTERN.match(operand) is None:
+            raise InvalidInputError(f"Invalid number format: {operand}")
         
         try:
             decimal_value = Decimal(operand)
             return decimal_value
         except (InvalidOperation, ValueError):
-            raise ValueError(f"Cannot convert to number: {operand}")
+            raise InvalidInputError(f"Cannot convert to number: {operand}")
+    
+    @staticmethod
+    def parse_operand(operand: Operand) -> Optional[Decimal]:
+        """
+        Convert an operand to Decimal without raising.
+        
+        Returns:
+            The parsed Decimal, or None if the operand is not a valid number
+            (where validate_operand would raise InvalidInputError)
+        """
+        if operand.__class__ is Decimal:
+            return operand
+        if not operand or _NUMBER_PATTERN.match(operand) is None:
+            return None
+        # Strings matching the pattern always convert
+        return Decimal(operand)
     
     @staticmethod
     def validate_operation(operation: str) -> str:
         """Validate operation string."""
         if not Validation.is_valid_operation(operation):
-            raise ValueError(f"Invalid operation: {operation}")
+            raise InvalidOperationError(f"Invalid operation: {operation}")
         return operation
     
+    @staticmethod
+    def operation_spec(operation: str) -> OperationSpec:
+        """Validate an operation string and return its registry entry."""
+        spec = REGISTRY.get(operation)
+        if spec is None:
+            raise InvalidOperationError(f"Invalid operation: {operation}")
+        return spec
+    
     @staticmethod
     def validate_format(operand1: str, operand2: str = None, operation: str = None) -> tuple:
         """Validate the format of operation components."""
@@ -56,7 +91,8 @@ class Validation:
         Validation.validate_operand(operand1)
         
         # Validate operand2 if provided (not for unary operations like sqrt, factorial)
-        if operand2 and operation not in ['sqrt', 'factorial']:
+        spec = REGISTRY.get(operation) if operation else None
+        if operand2 and (spec is None or spec.arity == 2):
             Validation.validate_operand(operand2)
         
         return True
\ No newline at end of file
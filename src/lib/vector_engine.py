@@ -0,0 +1,227 @@
+"""
+Vectorized engine applying one operation over arrays of operands.
+
+NumPy is optional. When it is installed, operations run as NumPy ufuncs on
+float64 arrays; otherwise the same API runs a Python loop over FloatMath and
+stores the results in array.array columns.
+"""
+import math
+from array import array
+from typing import List, Optional, Sequence, Union
+from src.lib.error_handler import (OK, DIVISION_BY_ZERO, NEGATIVE_SQRT, OUT_OF_RANGE, UNDEFINED, ErrorHandler,
+                                   OutOfRangeError, UndefinedResultError)
+from src.lib.math_utils import FloatMath
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# True when NumPy can be imported
+HAS_NUMPY = np is not None
+
+# Per-element error codes are the ErrorHandler codes (OK means the element was computed):
+# DIVISION_BY_ZERO, NEGATIVE_SQRT, OUT_OF_RANGE and UNDEFINED
+
+# ErrorHandler messages for each error code, so vector errors read like calculate() errors
+ERROR_MESSAGES = {
+    DIVISION_BY_ZERO: ErrorHandler.render(DIVISION_BY_ZERO),
+    NEGATIVE_SQRT: ErrorHandler.render(NEGATIVE_SQRT),
+    # With the float backend's wording
+    OUT_OF_RANGE: ErrorHandler.render(OUT_OF_RANGE, OutOfRangeError("Result is out of range for the float backend")),
+    UNDEFINED: ErrorHandler.render(UNDEFINED),
+}
+
+VECTOR_OPERATIONS = ("add", "subtract", "multiply", "divide", "power", "sqrt", "percentage")
+
+Operands = Union[Sequence[float], float, "np.ndarray"]
+
+_NAN = float("nan")
+
+
+class VectorResult:
+    """
+    Results of a vectorized operation with a per-element error code.
+    
+    values holds float64 results, with NaN wherever errors is not OK. Both are
+    NumPy arrays when computed by NumPy, and array.array columns otherwise.
+    """
+    
+    def __init__(self, values, errors, engine: str):
+        """
+        Initialize the result.
+        
+        Args:
+            values: float64 results (NaN for failed elements)
+            errors: Error code of each element (OK when computed)
+            engine: "numpy" or "python"
+        """
+        self.values = values
+        self.errors = errors
+        self.engine = engine
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    @property
+    def error_count(self) -> int:
+        """Number of elements that failed."""
+        if self.engine == "numpy":
+            return int(np.count_nonzero(self.errors))
+        return len(self.errors) - self.errors.count(OK)
+    
+    def masked(self):
+        """
+        Get the values with failed elements masked.
+        
+        Returns:
+            A numpy.ma.MaskedArray with NumPy, otherwise a list with None for failed elements
+        """
+        if self.engine == "numpy":
+            return np.ma.MaskedArray(self.values, mask=self.errors != OK)
+        return [value if error == OK else None for value, error in zip(self.values, self.errors)]
+    
+    def error_messages(self) -> List[Optional[str]]:
+        """Get the ErrorHandler message of each element (None for computed elements)."""
+        return [ERROR_MESSAGES.get(int(error)) for error in self.errors]
+
+
+class VectorEngine:
+    """
+    Applies add, subtract, multiply, divide, power, sqrt or percentage over arrays.
+    
+    Either operand may be a scalar, which is applied to every element of the other.
+    Elements that fail (division by zero, square root of a negative number, results
+    that overflow float64 or are undefined) do not raise; they are reported through
+    the error codes of the returned VectorResult.
+    """
+    
+    def __init__(self, use_numpy: Optional[bool] = None):
+        """
+        Initialize the engine.
+        
+        Args:
+            use_numpy: Use NumPy (defaults to whether it is installed)
+        """
+        if use_numpy is None:
+            use_numpy = HAS_NUMPY
+        if use_numpy and not HAS_NUMPY:
+            raise ValueError("NumPy is not installed")
+        self.use_numpy = use_numpy
+    
+    @property
+    def engine(self) -> str:
+        """Name of the implementation in use: "numpy" or "python"."""
+        return "numpy" if self.use_numpy else "python"
+    
+    def compute(self, operation: str, operand1: Operands, operand2: Optional[Operands] = None) -> VectorResult:
+        """
+        Apply an operation element-wise.
+        
+        Args:
+            operation: One of VECTOR_OPERATIONS
+            operand1: Array (or scalar) of first operands
+            operand2: Array (or scalar) of second operands (omitted for sqrt)
+        
+        Returns:
+            VectorResult with one value and error code per element
+        
+        Raises:
+            ValueError: If the operation is not supported, an operand is missing,
+                or the operand arrays have different lengths
+        """
+        if operation not in VECTOR_OPERATIONS:
+            raise ValueError(f"Unsupported vector operation: {operation}")
+        if operation != "sqrt" and operand2 is None:
+            raise ValueError(f"Operation '{operation}' requires two operands")
+        if self.use_numpy:
+            return self._compute_numpy(operation, operand1, operand2)
+        return self._compute_python(operation, operand1, operand2)
+    
+    @staticmethod
+    def _compute_numpy(operation: str, operand1: Operands, operand2: Optional[Operands]) -> VectorResult:
+        a = np.asarray(operand1, dtype=np.float64)
+        b = np.asarray(operand2, dtype=np.float64) if operation != "sqrt" else None
+        # Like the Python loop, one-element arrays are broadcast as scalars
+        if b is not None and a.size != 1 and b.size != 1 and a.shape != b.shape:
+            raise ValueError("Operand arrays must have the same length")
+        
+        with np.errstate(all="ignore"):
+            if operation == "add":
+                values = np.add(a, b)
+            elif operation == "subtract":
+                values = np.subtract(a, b)
+            elif operation == "multiply":
+                values = np.multiply(a, b)
+            elif operation == "divide":
+                values = np.divide(a, b)
+            elif operation == "power":
+                values = np.power(a, b)
+            elif operation == "sqrt":
+                values = np.sqrt(a)
+            else:
+                values = np.multiply(np.divide(a, 100), b)
+        values = np.atleast_1d(values)
+        
+        errors = np.zeros(values.shape, dtype=np.uint8)
+        # Non-finite results first, so the specific codes below take precedence
+        errors[np.isinf(values)] = OUT_OF_RANGE
+        errors[np.isnan(values)] = UNDEFINED
+        if operation == "divide":
+            errors[np.broadcast_to(b == 0, values.shape)] = DIVISION_BY_ZERO
+        elif operation == "power":
+            # NumPy gives inf for 0 ^ negative; FloatMath treats it as a division by zero
+            errors[np.broadcast_to((a == 0) & (b < 0), values.shape)] = DIVISION_BY_ZERO
+        elif operation == "sqrt":
+            errors[np.broadcast_to(a < 0, values.shape)] = NEGATIVE_SQRT
+        values[errors != OK] = np.nan
+        return VectorResult(values, errors, "numpy")
+    
+    @staticmethod
+    def _compute_python(operation: str, operand1: Operands, operand2: Optional[Operands]) -> VectorResult:
+        function = getattr(FloatMath, operation)
+        first = _as_floats(operand1)
+        if operation == "sqrt":
+            pairs = ((value, None) for value in first)
+            call = lambda value, _: function(value)
+        else:
+            second = _as_floats(operand2)
+            if len(first) != len(second):
+                if len(first) == 1:
+                    first = first * len(second)
+                elif len(second) == 1:
+                    second = second * len(first)
+                else:
+                    raise ValueError("Operand arrays must have the same length")
+            pairs = zip(first, second)
+            call = function
+        
+        values = array('d')
+        errors = array('B')
+        for value1, value2 in pairs:
+            try:
+                result = call(value1, value2)
+                if math.isinf(result):
+                    raise OutOfRangeError("Result is out of range for the float backend")
+                if math.isnan(result):
+                    raise UndefinedResultError("Result is undefined")
+                values.append(result)
+                errors.append(OK)
+            except ValueError as e:
+                values.append(_NAN)
+                errors.append(_error_code(e))
+        return VectorResult(values, errors, "python")
+
+
+def _as_floats(operand: Operands) -> array:
+    """Convert an operand array (or a scalar, as a one-element array) to float64."""
+    if isinstance(operand, (int, float)) or hasattr(operand, "as_tuple"):
+        return array('d', (float(operand),))
+    return array('d', (float(value) for value in operand))
+
+
+def _error_code(error: ValueError) -> int:
+    """Map a FloatMath error to one of the vector error codes."""
+    code = ErrorHandler.classify(error)
+    return code if code in ERROR_MESSAGES else UNDEFINED
@@ -6,19 +6,45 @@ import os
 # Add the project root to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
+import itertools
+import time
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
-from src.lib.validation import Validation
-from src.lib.math_utils import MathUtils
+from src.lib.error_handler import InvalidInputError, InvalidOperationError
+from src.lib.numeric_backend import DEFAULT_BACKEND
+from src.lib.operation_registry import REGISTRY
+from src.lib.validation import Validation, Operand
+
+
+# Calculation IDs are "<pid in hex>-<sequence number>": unique within the process and
+# increasing in creation order, without a uuid4/os.urandom call per calculation
+_id_prefix = f"{os.getpid():x}"
+_id_counter = itertools.count(1)
+
+
+def _reset_id_generator():
+    """Give a forked child process its own ID prefix and sequence."""
+    global _id_prefix, _id_counter
+    _id_prefix = f"{os.getpid():x}"
+    _id_counter = itertools.count(1)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_id_generator)
 
 
 class Calculation:
     """
     Represents a single mathematical operation with input values, operation type, and result.
+    
+    Instances use __slots__ and defer building the expression string and the
+    timestamp datetime until they are first read.
     """
     
-    def __init__(self, operand1: str, operand2: Optional[str], operation: str, 
+    __slots__ = ("_id", "_operand1", "_operand2", "_operation", "_result", "_created", "_expression")
+    
+    def __init__(self, operand1: Operand, operand2: Optional[Operand], operation: str, 
                  result: Decimal = None, expression: str = None):
         """
         Initialize a calculation object.
@@ -35,47 +61,38 @@ class Calculation:
         self._operand2 = self._validate_operand(operand2, "operand2") if operand2 is not None else None
         self._operation = self._validate_operation(operation)
         self._result = result
-        self._timestamp = datetime.now()
-        self._expression = expression if expression else self._create_expression()
+        # Seconds since the epoch; converted to a datetime only when the timestamp is read
+        self._created = time.time()
+        # Built lazily by the expression property when not supplied
+        self._expression = expression or None
     
     def _generate_id(self) -> str:
-        """Generate a unique identifier for the calculation."""
-        import uuid
-        return str(uuid.uuid4())
+        """Generate a process-unique, monotonically increasing identifier for the calculation."""
+        return f"{_id_prefix}-{next(_id_counter)}"
     
-    def _validate_operand(self, operand: str, operand_name: str) -> Decimal:
-        """Validate an operand according to requirements."""
+    def _validate_operand(self, operand: Operand, operand_name: str) -> Decimal:
+        """Validate an operand according to requirements, parsing it to Decimal once."""
         if operand is None:
             return None
         
-        if not Validation.is_valid_number(operand):
-            raise ValueError(f"Invalid number format for {operand_name}: {operand}")
-        
-        return Validation.validate_operand(operand)
+        try:
+            return Validation.validate_operand(operand)
+        except ValueError:
+            raise InvalidInputError(f"Invalid number format for {operand_name}: {operand}")
     
     def _validate_operation(self, operation: str) -> str:
         """Validate the operation according to requirements."""
         if not Validation.is_valid_operation(operation):
-            raise ValueError(f"Invalid operation: {operation}")
+            raise InvalidOperationError(f"Invalid operation: {operation}")
         return operation
     
     def _create_expression(self) -> str:
         """Create an expression string from the operation components."""
-        if self._operation == 'sqrt':
-            return f"sqrt({self._operand1})"
-        elif self._operation == 'factorial':
-            return f"factorial({self._operand1})"
+        spec = REGISTRY.require(self._operation)
+        if spec.arity == 1:
+            return f"{self._operation}({self._operand1})"
         elif self._operand2 is not None:
-            op_symbol_map = {
-                'add': '+',
-                'subtract': '-',
-                'multiply': '*',
-                'divide': '/',
-                'power': '^',
-                'percentage': '% of'
-            }
-            symbol = op_symbol_map.get(self._operation, self._operation)
-            return f"{self._operand1} {symbol} {self._operand2}"
+            return f"{self._operand1} {spec.label} {self._operand2}"
         else:
             return f"{self._operand1} {self._operation}"
     
@@ -86,27 +103,7 @@ class Calculation:
         Returns:
             The calculated result as a Decimal
         """
-        calc_service = MathUtils()
-        
-        if self._operation == "add":
-            self._result = calc_service.add(str(self._operand1), str(self._operand2))
-        elif self._operation == "subtract":
-            self._result = calc_service.subtract(str(self._operand1), str(self._operand2))
-        elif self._operation == "multiply":
-            self._result = calc_service.multiply(str(self._operand1), str(self._operand2))
-        elif self._operation == "divide":
-            self._result = calc_service.divide(str(self._operand1), str(self._operand2))
-        elif self._operation == "power":
-            self._result = calc_service.power(str(self._operand1), str(self._operand2))
-        elif self._operation == "sqrt":
-            self._result = calc_service.sqrt(str(self._operand1))
-        elif self._operation == "percentage":
-            self._result = calc_service.percentage(str(self._operand1), str(self._operand2))
-        elif self._operation == "factorial":
-            self._result = calc_service.factorial(str(self._operand1))
-        else:
-            raise ValueError(f"Unsupported operation: {self._operation}")
-        
+        self._result = DEFAULT_BACKEND.apply(REGISTRY.require(self._operation), self._operand1, self._operand2)
         return self._result
     
     @property
@@ -140,11 +137,13 @@ class Calculation:
     @property
     def timestamp(self) -> datetime:
         """Get the calculation timestamp."""
-        return self._timestamp
+        return datetime.fromtimestamp(self._created)
     
     @property
     def expression(self) -> str:
-        """Get the expression string."""
+        """Get the expression string, building it on first access."""
+        if self._expression is None:
+            self._expression = self._create_expression()
         return self._expression
     
     def to_dict(self) -> dict:
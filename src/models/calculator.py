@@ -6,10 +6,16 @@ import os
 # Add the project root to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from decimal import Decimal
-from typing import Optional, Union
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+from src.lib.error_handler import (OK, INVALID_INPUT, INVALID_OPERATION, MISSING_OPERAND, ErrorHandler,
+                                   MissingOperandError)
 from src.lib.math_utils import MathUtils
-from src.lib.validation import Validation
+from src.lib.numeric_backend import DecimalBackend, Number, NumericBackend
+from src.lib.operation_registry import REGISTRY, OperationSpec
+from src.lib.validation import Validation, Operand
+from src.lib.expression_parser import ExpressionParser
+from src.lib.expression_compiler import CompiledExpression, compile_expression
+from src.lib.result_cache import ResultCache
 from .calculation import Calculation
 
 
@@ -18,55 +24,132 @@ class Calculator:
     Base calculator model implementing core calculation operations with validation.
     """
     
-    def __init__(self):
-        """Initialize the calculator."""
+    def __init__(self, cache_size: int = 0, backend: Optional[NumericBackend] = None):
+        """
+        Initialize the calculator.
+        
+        Args:
+            cache_size: Maximum number of results to memoize in calculate() (0 disables the cache)
+            backend: Numeric backend used when a call does not name one
+                (defaults to a DecimalBackend with the default precision)
+        """
+        self.backend = backend if backend is not None else DecimalBackend()
         self.math_utils = MathUtils()
         self.validation = Validation()
+        self.expression_parser = ExpressionParser()
+        self.result_cache = ResultCache(cache_size) if cache_size > 0 else None
     
-    def calculate(self, operation: str, operand1: str, operand2: Optional[str] = None) -> Decimal:
+    def calculate(self, operation: str, operand1: Operand, operand2: Optional[Operand] = None,
+                  backend: Optional[NumericBackend] = None) -> Number:
         """
         Perform a calculation based on the operation and operands.
         
         Args:
             operation: The operation to perform (add, subtract, multiply, divide, power, sqrt, percentage, factorial)
-            operand1: First operand as string
-            operand2: Second operand as string (optional for unary operations)
+            operand1: First operand as string (or a Decimal already parsed by Validation)
+            operand2: Second operand as string or Decimal (optional for unary operations)
+            backend: Numeric backend for this call (defaults to the calculator's backend)
             
         Returns:
-            Decimal result of the calculation
+            Result of the calculation (a Decimal, or a float from the float backend)
         """
-        # Validate the operation and operands
-        self.validation.validate_operation(operation)
-        self.validation.validate_operand(operand1)
+        backend = backend or self.backend
+        # Validate the operation and parse the operands once; the parsed values are passed on
+        spec = self.validation.operation_spec(operation)
+        operand1 = backend.parse(operand1)
         
-        if operation not in ['sqrt', 'factorial']:
+        if spec.arity == 2:
             if operand2 is None:
-                raise ValueError(f"Operation '{operation}' requires two operands")
-            self.validation.validate_operand(operand2)
+                raise MissingOperandError(f"Operation '{operation}' requires two operands")
+            operand2 = backend.parse(operand2)
+        else:
+            operand2 = None
+        
+        if self.result_cache is not None:
+            return self._execute_cached(backend, spec, operand1, operand2)
+        return backend.apply(spec, operand1, operand2)
+    
+    def evaluate(self, operation: str, operand1: Operand, operand2: Optional[Operand] = None,
+                 backend: Optional[NumericBackend] = None) -> Tuple[Any, int]:
+        """
+        Perform a calculation, returning an error code instead of raising.
+        
+        Invalid operations and operands, missing operands and the failures an
+        operation's check detects (such as division by zero) are found without
+        raising an exception; the remaining failures are caught and classified.
+        
+        Args:
+            operation: The operation to perform
+            operand1: First operand as string or Decimal
+            operand2: Second operand (optional for unary operations)
+            backend: Numeric backend for this call (defaults to the calculator's backend)
+            
+        Returns:
+            (result, OK) on success, otherwise (detail, code): the error code and what
+            ErrorHandler.render needs for the message (the offending operand or operation,
+            the exception, or None)
+        """
+        return self._evaluator(operation, backend or self.backend)(operand1, operand2)
+    
+    def evaluate_batch(self, operation: str, operands: Iterable[Tuple[Operand, Optional[Operand]]],
+                       backend: Optional[NumericBackend] = None) -> List[Tuple[Any, int]]:
+        """
+        Perform the same operation over many operand pairs without raising.
         
-        # Perform the appropriate calculation based on the operation
-        if operation == "add":
-            return self.math_utils.add(operand1, operand2)
-        elif operation == "subtract":
-            return self.math_utils.subtract(operand1, operand2)
-        elif operation == "multiply":
-            return self.math_utils.multiply(operand1, operand2)
-        elif operation == "divide":
-            return self.math_utils.divide(operand1, operand2)
-        elif operation == "power":
-            return self.math_utils.power(operand1, operand2)
-        elif operation == "sqrt":
-            # For square root, we only use operand1
-            return self.math_utils.sqrt(operand1)
-        elif operation == "percentage":
-            return self.math_utils.percentage(operand1, operand2)
-        elif operation == "factorial":
-            # For factorial, we only use operand1 and convert to int
-            return self.math_utils.factorial(operand1)
+        Returns:
+            List of evaluate() tuples in input order
+        """
+        evaluate = self._evaluator(operation, backend or self.backend)
+        return [evaluate(operand1, operand2) for operand1, operand2 in operands]
+    
+    def _evaluator(self, operation: str, backend: NumericBackend):
+        """Build the evaluate() function for one operation and backend."""
+        # Operations that are not strings (e.g. a list from a JSON request) are invalid, not unhashable
+        spec = REGISTRY.get(operation) if isinstance(operation, str) else None
+        if spec is None:
+            return lambda operand1, operand2: (operation, INVALID_OPERATION)
+        
+        parse = backend.try_parse
+        unary = spec.arity == 1
+        check = spec.check
+        if self.result_cache is not None:
+            execute = lambda operand1, operand2: self._execute_cached(backend, spec, operand1, operand2)
         else:
-            raise ValueError(f"Unsupported operation: {operation}")
+            execute = lambda operand1, operand2: backend.apply(spec, operand1, operand2)
+        
+        def evaluate(operand1: Operand, operand2: Optional[Operand]) -> Tuple[Any, int]:
+            # Only unexpected input (e.g. operands that are not strings) and failures
+            # the check does not foresee reach the except clause
+            try:
+                value1 = parse(operand1)
+                if value1 is None:
+                    return operand1, INVALID_INPUT
+                if unary:
+                    value2 = None
+                elif operand2 is None:
+                    return operation, MISSING_OPERAND
+                else:
+                    value2 = parse(operand2)
+                    if value2 is None:
+                        return operand2, INVALID_INPUT
+                if check is not None:
+                    code = check(value1, value2)
+                    if code != OK:
+                        return None, code
+                return execute(value1, value2), OK
+            except Exception as e:
+                return e, ErrorHandler.classify(e)
+        
+        return evaluate
+    
+    def _execute_cached(self, backend: NumericBackend, spec: OperationSpec,
+                        operand1: Number, operand2: Optional[Number]) -> Number:
+        """Execute a validated operation through the result cache (operand2 is None for unary operations)."""
+        # Results depend on the backend and its precision, so they are part of the key
+        key = backend.key + self.result_cache.make_key(spec.name, operand1, operand2)
+        return self.result_cache.get_or_compute(key, lambda: backend.apply(spec, operand1, operand2))
     
-    def calculate_with_calculation_object(self, operation: str, operand1: str, operand2: Optional[str] = None) -> Calculation:
+    def calculate_with_calculation_object(self, operation: str, operand1: Operand, operand2: Optional[Operand] = None) -> Calculation:
         """
         Perform a calculation and return a Calculation object.
         
@@ -82,51 +165,29 @@ class Calculator:
         calculation.execute()
         return calculation
     
-    def calculate_from_expression(self, expression: str) -> Decimal:
+    def calculate_from_expression(self, expression: str, backend: Optional[NumericBackend] = None) -> Number:
         """
         Parse and calculate from an expression string.
-        Supports basic format: "number operator number" (e.g., "5 + 3")
-        Supports unary format: "operation(number)" (e.g., "sqrt(16)")
+        Supports operator precedence and parentheses, e.g. "(2 + 3) * sqrt(16) ^ 2".
+        Binary operators: + - * / ^ (or **) and % (percentage); functions: sqrt(x), factorial(x).
+        Parsed expressions are cached, so repeated expressions skip parsing.
+        The expression is evaluated by backend (defaults to the calculator's backend).
         """
-        expression = expression.strip()
-        
-        # Handle unary operations like sqrt(16), factorial(5)
-        import re
-        unary_pattern = r'(\w+)\(([^)]+)\)'
-        match = re.match(unary_pattern, expression)
-        
-        if match:
-            operation_name, operand = match.groups()
-            operation_map = {
-                'sqrt': 'sqrt',
-                'factorial': 'factorial'
-            }
-            
-            if operation_name in operation_map:
-                return self.calculate(operation_map[operation_name], operand)
-            else:
-                raise ValueError(f"Unsupported unary operation: {operation_name}")
-        
-        # Handle binary operations like "5 + 3"
-        parts = expression.split()
-        if len(parts) != 3:
-            raise ValueError(f"Invalid expression format: {expression}")
-        
-        operand1, operator, operand2 = parts
+        return (backend or self.backend).evaluate(self.expression_parser.parse(expression))
+    
+    def compile_expression(self, expression: str, *, backend: Optional[NumericBackend] = None,
+                           variables: Optional[Sequence[str]] = None) -> CompiledExpression:
+        """
+        Compile an expression with free variables for repeated evaluation.
         
-        # Map string operators to operation names
-        operator_map = {
-            '+': 'add',
-            '-': 'subtract',
-            '*': 'multiply', 
-            '/': 'divide',
-            '^': 'power',
-            '**': 'power',
-            '%': 'percentage'  # Note: This would be for percentage calculation
-        }
+        The expression is parsed once, constant sub-expressions are folded and each
+        operation is bound for the backend, so evaluating the result for new values,
+        e.g. compiled(x=3) or compiled.map(values), skips parsing and dispatch.
+        Operations registered after compiling do not affect the compiled expression.
         
-        if operator in operator_map:
-            operation = operator_map[operator]
-            return self.calculate(operation, operand1, operand2)
-        else:
-            raise ValueError(f"Unsupported operator: {operator}")
\ No newline at end of file
+        Args:
+            expression: Expression text with variables, e.g. "x ^ 2 + 3 * x"
+            backend: Numeric backend to evaluate with (defaults to the calculator's backend)
+            variables: Order of positional values (defaults to alphabetical order)
+        """
+        return compile_expression(expression, backend=backend or self.backend, variables=variables)
@@ -0,0 +1,346 @@
+"""
+Columnar history model storing calculations in parallel arrays for compact storage and fast aggregates.
+"""
+import threading
+import time
+import uuid
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Union
+from src.lib.operation_registry import REGISTRY
+
+
+# Operation names by the code stored in the operation column. Code 0 ('expression') is
+# used for expressions and unknown names; registered operations, plugins included,
+# get the next free code the first time they are stored
+OPERATION_CODES: List[str] = ['expression']
+_CODE_BY_OPERATION = {'expression': 0}
+_codes_lock = threading.Lock()
+
+# The operation column holds one byte per entry
+_MAX_CODE = 255
+
+_NAN = float("nan")
+
+TimeBound = Union[datetime, int, None]
+
+
+def _operation_code(operation: Optional[str]) -> int:
+    """Get the code of an operation, assigning one to a registered operation seen for the first time."""
+    code = _CODE_BY_OPERATION.get(operation)
+    if code is not None:
+        return code
+    if not isinstance(operation, str) or operation not in REGISTRY:
+        return 0
+    with _codes_lock:
+        code = _CODE_BY_OPERATION.get(operation)
+        if code is None:
+            if len(OPERATION_CODES) > _MAX_CODE:
+                return 0
+            code = len(OPERATION_CODES)
+            OPERATION_CODES.append(operation)
+            _CODE_BY_OPERATION[operation] = code
+        return code
+
+
+def _to_float(value) -> float:
+    """Convert an operand or result to float, using NaN when it is missing or not numeric."""
+    if value is None:
+        return _NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        return _NAN
+
+
+def _to_ns(value: TimeBound, default: int) -> int:
+    """Convert a datetime (or nanoseconds since the epoch) to nanoseconds since the epoch."""
+    if value is None:
+        return default
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1_000_000_000)
+    return int(value)
+
+
+class ColumnarHistory:
+    """
+    Calculation history stored column by column instead of as a list of dictionaries.
+    
+    Each entry occupies one slot in parallel arrays: an operation code (1 byte),
+    operands and numeric result as float64, a success flag (1 byte) and a timestamp
+    as int64 nanoseconds. The expression and result text are kept in two string
+    columns so entries can be rendered exactly. Like History, the columns form a
+    ring buffer of max_size slots.
+    
+    Aggregate queries (counts, sums, means, error rates, time windows) scan the
+    numeric columns directly and never build per-entry dictionaries; get_items()
+    and to_dict() build the History dictionary shape on demand.
+    """
+    
+    def __init__(self, max_size: int = 50):
+        """
+        Initialize the columnar history.
+        
+        Args:
+            max_size: Maximum number of calculations to retain (default 50)
+        """
+        if max_size <= 0:
+            raise ValueError("Max size must be greater than 0")
+        self._id = str(uuid.uuid4())
+        self._max_size = max_size
+        self._created_at = datetime.now()
+        self._updated_at = self._created_at
+        self._reset_columns()
+    
+    def _reset_columns(self):
+        self._operation = array('B')
+        self._operand1 = array('d')
+        self._operand2 = array('d')
+        self._result = array('d')
+        self._success = array('B')
+        self._timestamp = array('q')
+        self._expression: List[str] = []
+        self._result_text: List[str] = []
+        self._start = 0
+    
+    def add_calculation(self, operation: Optional[str], operand1, operand2, result,
+                        expression: str, success: bool = True, timestamp: TimeBound = None):
+        """
+        Add a calculation to the history in O(1).
+        
+        Args:
+            operation: Operation name (None or names not in the registry are stored as 'expression')
+            operand1: First operand (string, Decimal or None)
+            operand2: Second operand (string, Decimal or None)
+            result: Result value, or the error message if the calculation failed
+            expression: Expression text
+            success: Whether the calculation succeeded
+            timestamp: When the calculation happened (defaults to now)
+        """
+        row = (
+            _operation_code(operation),
+            _to_float(operand1),
+            _to_float(operand2),
+            _to_float(result) if success else _NAN,
+            1 if success else 0,
+            _to_ns(timestamp, time.time_ns()),
+            expression,
+            str(result)
+        )
+        columns = (self._operation, self._operand1, self._operand2, self._result,
+                   self._success, self._timestamp, self._expression, self._result_text)
+        
+        if len(self._operation) < self._max_size:
+            for column, value in zip(columns, row):
+                column.append(value)
+        else:
+            # Full: overwrite the oldest slot (FIFO)
+            slot = self._start
+            for column, value in zip(columns, row):
+                column[slot] = value
+            self._start = (slot + 1) % self._max_size
+        self._updated_at = datetime.now()
+    
+    def add_item(self, calculation_data: Dict):
+        """
+        Add a calculation from a History-style dictionary.
+        
+        Recognized keys: expression, result or error, and optionally operation,
+        operand1, operand2, status and timestamp (ISO format).
+        
+        Args:
+            calculation_data: Dictionary containing calculation information
+        """
+        success = "error" not in calculation_data and calculation_data.get("status", "success") == "success"
+        timestamp = calculation_data.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        self.add_calculation(
+            calculation_data.get("operation"),
+            calculation_data.get("operand1"),
+            calculation_data.get("operand2"),
+            calculation_data.get("result") if success else calculation_data.get("error", calculation_data.get("result")),
+            calculation_data.get("expression", ""),
+            success=success,
+            timestamp=timestamp
+        )
+    
+    def _physical(self, index: int) -> int:
+        return (self._start + index) % self._max_size
+    
+    def _entry(self, slot: int) -> Dict:
+        """Build the dictionary for a physical slot."""
+        if self._success[slot]:
+            return {"expression": self._expression[slot], "result": self._result_text[slot]}
+        return {"expression": self._expression[slot], "error": self._result_text[slot]}
+    
+    def iter_items(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Iterate over calculations in chronological order, building each dictionary on demand.
+        
+        Args:
+            offset: Index of the first calculation to yield
+            limit: Maximum number of calculations to yield (None for all remaining)
+        """
+        size = self.size()
+        end = size if limit is None else min(size, offset + limit)
+        for index in range(max(offset, 0), end):
+            yield self._entry(self._physical(index))
+    
+    def get_items(self) -> List[Dict]:
+        """
+        Get all calculations in the history.
+        
+        Returns:
+            List of {"expression", "result"} dictionaries ({"expression", "error"} for failures)
+        """
+        return list(self.iter_items())
+    
+    def get_item(self, index: int) -> Optional[Dict]:
+        """
+        Get a specific calculation by index.
+        
+        Args:
+            index: Index of the calculation to retrieve
+        
+        Returns:
+            Calculation dictionary or None if index out of range
+        """
+        if 0 <= index < self.size():
+            return self._entry(self._physical(index))
+        return None
+    
+    def clear(self):
+        """Clear all calculations from the history."""
+        self._reset_columns()
+        self._updated_at = datetime.now()
+    
+    def size(self) -> int:
+        """Get the current number of calculations in history."""
+        return len(self._operation)
+    
+    def is_empty(self) -> bool:
+        """Check if the history is empty."""
+        return len(self._operation) == 0
+    
+    @property
+    def id(self) -> str:
+        """Get the unique identifier for the history."""
+        return self._id
+    
+    @property
+    def max_size(self) -> int:
+        """Get the maximum size of the history."""
+        return self._max_size
+    
+    @max_size.setter
+    def max_size(self, value: int):
+        """Set the maximum size of the history, keeping the newest calculations."""
+        if value <= 0:
+            raise ValueError("Max size must be greater than 0")
+        size = self.size()
+        order = [self._physical(index) for index in range(max(0, size - value), size)]
+        for name in ("_operation", "_operand1", "_operand2", "_result", "_success",
+                     "_timestamp", "_expression", "_result_text"):
+            column = getattr(self, name)
+            reordered = [column[slot] for slot in order]
+            setattr(self, name, array(column.typecode, reordered) if isinstance(column, array) else reordered)
+        self._start = 0
+        self._max_size = value
+    
+    # Aggregate queries
+    
+    def _scan(self, operation: Optional[str], since: TimeBound, until: TimeBound):
+        """Yield (code, success, result) for slots matching the operation and time window."""
+        low = _to_ns(since, -2 ** 63)
+        high = _to_ns(until, 2 ** 63 - 1)
+        wanted = None
+        if operation is not None:
+            wanted = _CODE_BY_OPERATION.get(operation, -1)
+        for code, success, result, timestamp in zip(self._operation, self._success, self._result, self._timestamp):
+            if low <= timestamp <= high and (wanted is None or code == wanted):
+                yield code, success, result
+    
+    def count(self, operation: Optional[str] = None, since: TimeBound = None, until: TimeBound = None) -> int:
+        """Count calculations, optionally for one operation and within [since, until]."""
+        return sum(1 for _ in self._scan(operation, since, until))
+    
+    def error_rate(self, operation: Optional[str] = None, since: TimeBound = None, until: TimeBound = None) -> float:
+        """Fraction of matching calculations that failed (0.0 when nothing matches)."""
+        total = errors = 0
+        for _, success, _ in self._scan(operation, since, until):
+            total += 1
+            errors += not success
+        return errors / total if total else 0.0
+    
+    def _numeric_totals(self, operation: Optional[str], since: TimeBound, until: TimeBound):
+        """Sum and count of the numeric results of matching successful calculations."""
+        total = 0.0
+        count = 0
+        for _, success, result in self._scan(operation, since, until):
+            if success and result == result:  # NaN marks a non-numeric result
+                total += result
+                count += 1
+        return total, count
+    
+    def sum_results(self, operation: Optional[str] = None, since: TimeBound = None, until: TimeBound = None) -> float:
+        """Sum of the numeric results of matching successful calculations."""
+        return self._numeric_totals(operation, since, until)[0]
+    
+    def mean_result(self, operation: Optional[str] = None, since: TimeBound = None,
+                    until: TimeBound = None) -> Optional[float]:
+        """Mean of the numeric results of matching successful calculations (None if there are none)."""
+        total, count = self._numeric_totals(operation, since, until)
+        return total / count if count else None
+    
+    def stats_by_operation(self, since: TimeBound = None, until: TimeBound = None) -> Dict[str, Dict]:
+        """
+        Aggregate matching calculations per operation in a single pass.
+        
+        Returns:
+            {operation: {"count", "errors", "error_rate", "sum", "mean"}}; sum and mean
+            cover successful calculations with a numeric result
+        """
+        # code -> [count, errors, sum, numeric count]
+        totals: Dict[int, List] = {}
+        for code, success, result in self._scan(None, since, until):
+            entry = totals.get(code)
+            if entry is None:
+                entry = totals[code] = [0, 0, 0.0, 0]
+            entry[0] += 1
+            if not success:
+                entry[1] += 1
+            elif result == result:
+                entry[2] += result
+                entry[3] += 1
+        return {
+            OPERATION_CODES[code]: {
+                "count": count,
+                "errors": errors,
+                "error_rate": errors / count,
+                "sum": total,
+                "mean": total / numeric if numeric else None
+            }
+            for code, (count, errors, total, numeric) in sorted(totals.items())
+        }
+    
+    @property
+    def created_at(self) -> datetime:
+        """Get the creation timestamp."""
+        return self._created_at
+    
+    @property
+    def updated_at(self) -> datetime:
+        """Get the last update timestamp."""
+        return self._updated_at
+    
+    def to_dict(self) -> Dict:
+        """Convert the history to a dictionary representation."""
+        return {
+            "id": self.id,
+            "calculations": self.get_items(),
+            "max_size": self._max_size,
+            "created_at": self._created_at.isoformat(),
+            "updated_at": self._updated_at.isoformat(),
+            "total_count": self.size()
+        }
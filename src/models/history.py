@@ -1,10 +1,78 @@
 """
 History model representing a collection of past calculations that can be recalled by the user.
 """
-from typing import List, Dict, Optional
+import threading
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 
 
+# Storage modes accepted by create_history
+HISTORY_STORAGES = ("memory", "columnar", "file")
+
+
+def create_history(storage: str = "memory", max_size: int = 50, path: Optional[str] = None):
+    """
+    Create a history store.
+    
+    Args:
+        storage: "memory" (History), "columnar" (ColumnarHistory, compact with fast
+            aggregates) or "file" (PersistentHistory, kept across restarts)
+        max_size: Maximum number of calculations to retain
+        path: Data file for "file" storage
+    
+    Returns:
+        A history with the add_item/iter_items/size/clear interface of History
+    
+    Raises:
+        ValueError: If the storage mode is unknown, or "file" is given without a path
+    """
+    if storage == "memory":
+        return History(max_size)
+    if storage == "columnar":
+        from src.models.columnar_history import ColumnarHistory
+        return ColumnarHistory(max_size)
+    if storage == "file":
+        if not path:
+            raise ValueError("File history storage requires a path")
+        from src.models.persistent_history import PersistentHistory
+        return PersistentHistory(path, max_size)
+    raise ValueError(f"Unknown history storage: {storage}")
+
+
+class HistoryView(Sequence):
+    """
+    Read-only, zero-copy view of a History in chronological order.
+    
+    The view reads straight from the history's ring buffer, so it always reflects
+    the current contents of the history; use list(view) to take a snapshot.
+    """
+    
+    __slots__ = ("_history",)
+    
+    def __init__(self, history: "History"):
+        self._history = history
+    
+    def __len__(self) -> int:
+        return self._history._count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        count = self._history._count
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("history index out of range")
+        return self._history._physical(index)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        return self._history.iter_items()
+    
+    def __repr__(self) -> str:
+        return f"HistoryView({list(self)!r})"
+
+
 class History:
     """
     Represents a collection of past calculations that can be recalled by the user.
@@ -16,10 +84,20 @@ class History:
         
         Args:
             max_size: Maximum number of calculations to retain (default 50)
+        
+        Raises:
+            ValueError: If max_size is less than 1
         """
+        if max_size <= 0:
+            raise ValueError("Max size must be greater than 0")
         self._id = self._generate_id()
+        # Ring buffer: grows up to max_size, then the oldest slot is overwritten in place
         self._calculations: List[Dict] = []
+        self._start = 0
+        self._count = 0
         self._max_size = max_size
+        # Serializes changes to the buffer, so items can be added from several threads
+        self._lock = threading.Lock()
         self._created_at = datetime.now()
         self._updated_at = datetime.now()
     
@@ -28,32 +106,62 @@ class History:
         import uuid
         return str(uuid.uuid4())
     
+    def _physical(self, index: int) -> Dict:
+        """Get the item at a logical (chronological) index that is known to be in range."""
+        return self._calculations[(self._start + index) % self._max_size]
+    
     def add_item(self, calculation_data: Dict):
         """
-        Add a calculation to the history.
+        Add a calculation to the history in O(1).
         
         Args:
             calculation_data: Dictionary containing calculation information
         """
-        # Update the timestamp
-        self._updated_at = datetime.now()
-        
-        # Add the calculation
-        self._calculations.append(calculation_data)
-        
-        # If we exceed max size, remove the oldest item (FIFO)
-        if len(self._calculations) > self._max_size:
-            self._calculations.pop(0)
+        with self._lock:
+            # Update the timestamp
+            self._updated_at = datetime.now()
+            
+            if self._count < self._max_size:
+                self._calculations.append(calculation_data)
+                self._count += 1
+            else:
+                # Full: overwrite the oldest item (FIFO)
+                self._calculations[self._start] = calculation_data
+                self._start = (self._start + 1) % self._max_size
     
     def get_items(self) -> List[Dict]:
         """
         Get all calculations in the history.
         
         Returns:
-            List of calculation dictionaries
+            List of calculation dictionaries (a copy; use view() or iter_items() to avoid copying)
+        """
+        with self._lock:
+            return list(self.iter_items())
+    
+    def view(self) -> HistoryView:
+        """
+        Get a read-only view of the history without copying it.
+        
+        Returns:
+            Live HistoryView supporting len(), indexing and iteration
+        """
+        return HistoryView(self)
+    
+    def iter_items(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Iterate over calculations in chronological order, optionally one page at a time.
+        
+        Args:
+            offset: Index of the first calculation to yield
+            limit: Maximum number of calculations to yield (None for all remaining)
+            
+        Returns:
+            Iterator over calculation dictionaries
         """
-        # Return a copy to prevent external modification
-        return self._calculations.copy()
+        end = self._count if limit is None else min(self._count, offset + limit)
+        for index in range(max(offset, 0), end):
+            yield self._physical(index)
     
     def get_item(self, index: int) -> Optional[Dict]:
         """
@@ -65,33 +173,47 @@ class History:
         Returns:
             Calculation dictionary or None if index out of range
         """
-        if 0 <= index < len(self._calculations):
-            return self._calculations[index]
+        if 0 <= index < self._count:
+            return self._physical(index)
         return None
     
     def clear(self):
         """Clear all calculations from the history."""
-        self._calculations.clear()
-        self._updated_at = datetime.now()
+        with self._lock:
+            self._calculations = []
+            self._start = 0
+            self._count = 0
+            self._updated_at = datetime.now()
     
     def remove_item(self, index: int):
         """
         Remove a calculation at the specified index.
         
+        This is O(n): the ring buffer is rebuilt without the removed item.
+        
         Args:
             index: Index of the calculation to remove
         """
-        if 0 <= index < len(self._calculations):
-            self._calculations.pop(index)
-            self._updated_at = datetime.now()
+        with self._lock:
+            if 0 <= index < self._count:
+                items = list(self.iter_items())
+                items.pop(index)
+                self._reset(items)
+                self._updated_at = datetime.now()
+    
+    def _reset(self, items: List[Dict]):
+        """Replace the buffer contents with items in chronological order."""
+        self._calculations = items
+        self._start = 0
+        self._count = len(items)
     
     def size(self) -> int:
         """Get the current number of calculations in history."""
-        return len(self._calculations)
+        return self._count
     
     def is_empty(self) -> bool:
         """Check if the history is empty."""
-        return len(self._calculations) == 0
+        return self._count == 0
     
     @property
     def id(self) -> str:
@@ -109,10 +231,11 @@ class History:
         if value <= 0:
             raise ValueError("Max size must be greater than 0")
         
-        self._max_size = value
-        # If the new max size is smaller, remove excess items
-        while len(self._calculations) > self._max_size:
-            self._calculations.pop(0)
+        with self._lock:
+            # Keep the newest items that fit, in a single pass
+            items = list(self.iter_items())[-value:]
+            self._max_size = value
+            self._reset(items)
     
     @property
     def created_at(self) -> datetime:
@@ -128,9 +251,9 @@ class History:
         """Convert the history to a dictionary representation."""
         return {
             "id": self.id,
-            "calculations": self._calculations,
+            "calculations": self.get_items(),
             "max_size": self._max_size,
             "created_at": self._created_at.isoformat(),
             "updated_at": self._updated_at.isoformat(),
-            "total_count": len(self._calculations)
+            "total_count": self._count
         }
\ No newline at end of file
@@ -0,0 +1,370 @@
+"""
+Persistent history model backed by an append-only log file and a memory-mapped offset index.
+"""
+import json
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # No flock on Windows: a store is then only safe to share within one process
+    fcntl = None
+
+
+# Each index record is the little-endian end offset of one entry in the data file
+_OFFSET = struct.Struct("<Q")
+
+
+class PersistentHistory:
+    """
+    Calculation history stored on disk so it survives process restarts.
+    
+    Entries are appended as JSON lines to the data file. A companion index file
+    (data file name + ".idx") holds the end offset of every entry and is read
+    through mmap, so entry N is located in O(1) and only the requested entries are
+    ever read from disk.
+    
+    Crash safety: an entry is written to the data file before its index record.
+    The data file is the source of truth; on open, a torn index record is
+    discarded, and if the index does not end exactly at the end of the data file
+    it is rebuilt from the complete lines of the data file (a partial trailing
+    line is truncated).
+    
+    Only the newest max_size entries are visible. Older entries stay on disk until
+    the log reaches compact_factor * max_size entries, when it is rewritten with
+    just the visible ones.
+    
+    Several processes may share a store (scripts run the CLI many times at once).
+    Appends, compaction and recovery hold an exclusive flock on a companion lock
+    file (data file name + ".lock"), which is never replaced, unlike the data
+    file. Under the lock each process re-reads the file sizes and reopens its
+    files if another process compacted them, so no append is lost.
+    """
+    
+    def __init__(self, path: str, max_size: int = 50, compact_factor: int = 2, fsync: bool = False):
+        """
+        Initialize the persistent history.
+        
+        Args:
+            path: Path of the data file (created if missing)
+            max_size: Maximum number of calculations to retain (default 50)
+            compact_factor: Compact when the log holds this many times max_size entries
+            fsync: Call os.fsync after every append (slower, durable across power loss)
+        """
+        if max_size <= 0:
+            raise ValueError("Max size must be greater than 0")
+        if compact_factor < 1:
+            raise ValueError("Compact factor must be at least 1")
+        self._path = path
+        self._index_path = path + ".idx"
+        self._max_size = max_size
+        self._compact_factor = compact_factor
+        self._fsync = fsync
+        self._index_map: Optional[mmap.mmap] = None
+        self._mapped_count = 0
+        self._count = 0
+        self._data_size = 0
+        self._index_size = 0
+        
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock_file = open(path + ".lock", "a+b")
+        with self._lock():
+            self._open()
+    
+    @contextmanager
+    def _lock(self):
+        """Hold the exclusive lock shared by every process using this store."""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+    
+    def _open(self):
+        """Open the data and index files, recovering from an interrupted write if needed (lock held)."""
+        self._data = open(self._path, "a+b")
+        self._index = open(self._index_path, "a+b")
+        self._recover()
+    
+    def _sync(self):
+        """Catch up with changes made by other processes (lock held)."""
+        try:
+            current = os.stat(self._path)
+        except FileNotFoundError:
+            current = None
+        opened = os.fstat(self._data.fileno())
+        if current is None or (current.st_ino, current.st_dev) != (opened.st_ino, opened.st_dev):
+            # Another process compacted the store; the open files are the replaced ones
+            self._close_files()
+            self._open()
+        elif (opened.st_size != self._data_size
+              or os.fstat(self._index.fileno()).st_size != self._index_size):
+            # Appended to or cleared by another process
+            self._close_map()
+            self._recover()
+    
+    def _refresh(self):
+        """Bring the entry count up to date before reading."""
+        with self._lock():
+            self._sync()
+    
+    def _recover(self):
+        """Make the index consistent with the data file (lock held)."""
+        data_size = os.fstat(self._data.fileno()).st_size
+        index_size = os.fstat(self._index.fileno()).st_size
+        count = index_size // _OFFSET.size
+        
+        last_end = 0
+        if count:
+            self._index.seek((count - 1) * _OFFSET.size)
+            last_end = _OFFSET.unpack(self._index.read(_OFFSET.size))[0]
+        
+        if index_size % _OFFSET.size or last_end != data_size:
+            count = self._rebuild_index()
+        
+        self._count = count
+        self._data_size = os.fstat(self._data.fileno()).st_size
+        self._index_size = count * _OFFSET.size
+    
+    def _rebuild_index(self) -> int:
+        """
+        Rebuild the index from the complete lines of the data file; returns the entry count.
+        
+        Runs with the lock held, so a partial trailing line cannot be another
+        process's append in progress: it was left by a writer that died.
+        """
+        offsets = []
+        position = 0
+        self._data.seek(0)
+        for line in self._data:
+            if not line.endswith(b"\n"):
+                break
+            position += len(line)
+            offsets.append(position)
+        
+        # Drop a partial trailing line left by an interrupted append
+        self._data.truncate(position)
+        self._data.flush()
+        
+        self._close_map()
+        self._index.truncate(0)
+        self._index.write(b"".join(_OFFSET.pack(offset) for offset in offsets))
+        self._index.flush()
+        return len(offsets)
+    
+    def _close_map(self):
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+            self._mapped_count = 0
+    
+    def _offsets(self, entry: int):
+        """Get the (start, end) offsets of an entry in the data file."""
+        if entry >= self._mapped_count:
+            # The index grew since it was mapped; map it again
+            self._close_map()
+            self._index.flush()
+            self._index_map = mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_count = len(self._index_map) // _OFFSET.size
+        end = _OFFSET.unpack_from(self._index_map, entry * _OFFSET.size)[0]
+        start = _OFFSET.unpack_from(self._index_map, (entry - 1) * _OFFSET.size)[0] if entry else 0
+        return start, end
+    
+    def _read_entry(self, entry: int) -> Dict:
+        start, end = self._offsets(entry)
+        self._data.seek(start)
+        return json.loads(self._data.read(end - start))
+    
+    @property
+    def _first_visible(self) -> int:
+        """Index in the log of the oldest visible entry."""
+        return max(0, self._count - self._max_size)
+    
+    def add_item(self, calculation_data: Dict):
+        """
+        Append a calculation to the history.
+        
+        Args:
+            calculation_data: JSON-serializable dictionary containing calculation information
+        """
+        line = json.dumps(calculation_data, separators=(",", ":")).encode("utf-8") + b"\n"
+        
+        with self._lock():
+            self._sync()
+            # Data first, then the index record that commits it
+            self._data.write(line)
+            self._data.flush()
+            if self._fsync:
+                os.fsync(self._data.fileno())
+            self._data_size += len(line)
+            
+            self._index.write(_OFFSET.pack(self._data_size))
+            self._index.flush()
+            if self._fsync:
+                os.fsync(self._index.fileno())
+            self._count += 1
+            self._index_size += _OFFSET.size
+            
+            if self._count >= self._compact_factor * self._max_size and self._count > self._max_size:
+                self._compact()
+    
+    def get_item(self, index: int) -> Optional[Dict]:
+        """
+        Get a specific calculation by index (0 is the oldest visible calculation).
+        
+        Args:
+            index: Index of the calculation to retrieve
+        
+        Returns:
+            Calculation dictionary or None if index out of range
+        """
+        self._refresh()
+        if 0 <= index < min(self._count, self._max_size):
+            return self._read_entry(self._first_visible + index)
+        return None
+    
+    def iter_items(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Iterate over visible calculations in chronological order, reading only what is yielded.
+        
+        Args:
+            offset: Index of the first calculation to yield
+            limit: Maximum number of calculations to yield (None for all remaining)
+        
+        Returns:
+            Iterator over calculation dictionaries
+        """
+        self._refresh()
+        size = min(self._count, self._max_size)
+        end = size if limit is None else min(size, offset + limit)
+        first = self._first_visible
+        for index in range(max(offset, 0), end):
+            yield self._read_entry(first + index)
+    
+    def tail(self, count: int) -> List[Dict]:
+        """Get the newest count calculations in chronological order."""
+        return list(self.iter_items(max(0, self.size() - count)))
+    
+    def get_items(self) -> List[Dict]:
+        """
+        Get all visible calculations in the history.
+        
+        Returns:
+            List of calculation dictionaries
+        """
+        return list(self.iter_items())
+    
+    def size(self) -> int:
+        """Get the current number of visible calculations."""
+        self._refresh()
+        return min(self._count, self._max_size)
+    
+    def is_empty(self) -> bool:
+        """Check if the history is empty."""
+        self._refresh()
+        return self._count == 0
+    
+    def clear(self):
+        """Clear all calculations from the history."""
+        with self._lock():
+            self._sync()
+            self._close_map()
+            self._data.truncate(0)
+            self._data.flush()
+            self._index.truncate(0)
+            self._index.flush()
+            self._count = 0
+            self._data_size = 0
+            self._index_size = 0
+    
+    def compact(self):
+        """Rewrite the log so it only holds the visible calculations."""
+        with self._lock():
+            self._sync()
+            self._compact()
+    
+    def _compact(self):
+        """Rewrite the log (lock held)."""
+        first = self._first_visible
+        if first == 0:
+            return
+        
+        start = self._offsets(first)[0]
+        end = self._data_size
+        offsets = [self._offsets(entry)[1] - start for entry in range(first, self._count)]
+        
+        # Unique names, so an interrupted compaction never collides with a later one
+        data_tmp = self._write_temp(self._path, start, end)
+        try:
+            index_tmp = self._write_temp(self._index_path, content=b"".join(_OFFSET.pack(offset) for offset in offsets))
+        except BaseException:
+            os.unlink(data_tmp)
+            raise
+        
+        # Replace the data file first: if interrupted before the index is replaced,
+        # the stale index will not end at the new data size and is rebuilt on open
+        self._close_files()
+        os.replace(data_tmp, self._path)
+        os.replace(index_tmp, self._index_path)
+        self._open()
+    
+    def _write_temp(self, target: str, start: int = 0, end: int = 0, content: bytes = b"") -> str:
+        """Write content, or the data file's bytes from start to end, to a new temporary file next to target."""
+        # Imported here: only compaction needs it, and it is slow to import for a CLI start
+        import tempfile
+        directory, name = os.path.split(os.path.abspath(target))
+        descriptor, temp_path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(descriptor, "wb") as out:
+                out.write(content)
+                self._data.seek(start)
+                remaining = end - start
+                while remaining:
+                    chunk = self._data.read(min(remaining, 1 << 20))
+                    out.write(chunk)
+                    remaining -= len(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return temp_path
+    
+    @property
+    def max_size(self) -> int:
+        """Get the maximum size of the history."""
+        return self._max_size
+    
+    @max_size.setter
+    def max_size(self, value: int):
+        """Set the maximum size of the history."""
+        if value <= 0:
+            raise ValueError("Max size must be greater than 0")
+        self._max_size = value
+        with self._lock():
+            self._sync()
+            if self._count >= self._compact_factor * self._max_size:
+                self._compact()
+    
+    @property
+    def path(self) -> str:
+        """Get the path of the data file."""
+        return self._path
+    
+    def _close_files(self):
+        self._close_map()
+        self._data.close()
+        self._index.close()
+    
+    def close(self):
+        """Close the underlying files."""
+        if not self._data.closed:
+            self._close_files()
+        self._lock_file.close()
@@ -0,0 +1,246 @@
+"""
+Variables defined by expressions, recomputed incrementally through a dependency graph.
+"""
+import re
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from src.lib.error_handler import ErrorHandler, InvalidInputError
+from src.lib.expression_parser import ExpressionParser, substitute, variable_names
+from src.lib.numeric_backend import DecimalBackend, Number, NumericBackend
+from src.lib.operation_registry import REGISTRY
+
+
+# Valid variable names: identifiers, as in the expression tokenizer
+_NAME_PATTERN = re.compile(r'[A-Za-z_]\w*')
+
+# "name = expression" (but not "==")
+_ASSIGNMENT_PATTERN = re.compile(r'^\s*([A-Za-z_]\w*)\s*=(?!=)(.*)$')
+
+
+class Variable:
+    """One variable: its formula, the variables it references and its current value or error."""
+    __slots__ = ("name", "expression", "node", "dependencies", "value", "error")
+    
+    def __init__(self, name: str, expression: str, node, dependencies: Set[str]):
+        self.name = name
+        self.expression = expression
+        self.node = node
+        self.dependencies = dependencies
+        self.value: Optional[Number] = None
+        self.error: Optional[str] = None
+
+
+class VariableGraph:
+    """
+    Variables defined by expressions that may reference each other, like spreadsheet cells.
+    
+    Each variable keeps its parsed formula and the set of variables it references;
+    the reverse edges (which variables reference it) are kept too. Redefining or
+    removing a variable recomputes only the variables downstream of it, in
+    dependency order, so the cost of a change does not depend on how many
+    unrelated variables exist. Formulas may reference variables that are not
+    defined yet; they evaluate to an error until those are defined. Circular
+    references are rejected.
+    
+    ans holds the last result. It is not a dependency: a formula using ans takes
+    its value at the time the formula is defined.
+    """
+    
+    ANS = "ans"
+    
+    def __init__(self, backend: Optional[NumericBackend] = None):
+        """
+        Initialize an empty graph.
+        
+        Args:
+            backend: Numeric backend used to evaluate formulas (defaults to a DecimalBackend)
+        """
+        self.backend = backend if backend is not None else DecimalBackend()
+        self.parser = ExpressionParser(allow_variables=True)
+        self._variables: Dict[str, Variable] = {}
+        # Values of the variables that evaluated successfully, passed to expression evaluation
+        self._values: Dict[str, Number] = {}
+        # name -> variables whose formula references name (name need not be defined)
+        self._dependents: Dict[str, Set[str]] = {}
+        self.ans: Optional[Number] = None
+        # Names recomputed by the last define() or remove(), in the order they were computed
+        self.last_recomputed: List[str] = []
+    
+    @staticmethod
+    def parse_assignment(line: str) -> Optional[Tuple[str, str]]:
+        """Split "name = expression" into (name, expression), or return None if line is not an assignment."""
+        match = _ASSIGNMENT_PATTERN.match(line)
+        if match is None:
+            return None
+        return match.group(1), match.group(2).strip()
+    
+    def define(self, name: str, expression: str) -> List[str]:
+        """
+        Define or redefine a variable and recompute the variables that depend on it.
+        
+        Args:
+            name: Variable name (an identifier that is not ans or an operation name)
+            expression: Formula, which may reference other variables and ans
+        
+        Returns:
+            The names recomputed, in dependency order (name first)
+        
+        Raises:
+            ValueError: If the name is invalid, the expression cannot be parsed or the
+                definition would create a circular reference; the graph is then unchanged
+        """
+        self._validate_name(name)
+        node = self.parser.parse(expression)
+        dependencies = variable_names(node)
+        if self.ANS in dependencies:
+            if self.ans is None:
+                raise InvalidInputError(f"Undefined variable: {self.ANS}")
+            node = substitute(node, {self.ANS: self.ans})
+            dependencies.discard(self.ANS)
+        
+        # Redefining name changes only its own references, so its dependents stay the same
+        order = self._downstream(name)
+        cycle = dependencies.intersection(order)
+        if cycle:
+            raise InvalidInputError(f"Circular reference: {name} = {expression} (through {', '.join(sorted(cycle))})")
+        
+        previous = self._variables.get(name)
+        if previous is not None:
+            self._unlink(previous)
+        variable = Variable(name, expression, node, dependencies)
+        self._variables[name] = variable
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).add(name)
+        
+        self._recompute(order)
+        if variable.error is None:
+            self.ans = variable.value
+        return order
+    
+    def remove(self, name: str) -> List[str]:
+        """
+        Remove a variable; the variables that depend on it are recomputed (as errors).
+        
+        Returns:
+            The names of the dependents recomputed, in dependency order
+        
+        Raises:
+            ValueError: If the variable is not defined
+        """
+        variable = self._variables.pop(name, None)
+        if variable is None:
+            raise InvalidInputError(f"Undefined variable: {name}")
+        self._unlink(variable)
+        self._values.pop(name, None)
+        order = self._downstream(name)[1:]
+        self._recompute(order)
+        return order
+    
+    def evaluate(self, expression: str) -> Number:
+        """
+        Evaluate an expression against the current variables and store the result in ans.
+        
+        Raises:
+            ValueError: If the expression is invalid, references an undefined variable or fails
+        """
+        node = self.parser.parse(expression)
+        values = self._values
+        if self.ans is not None:
+            values = dict(values)
+            values[self.ANS] = self.ans
+        for dependency in variable_names(node):
+            variable = self._variables.get(dependency)
+            if variable is not None and variable.error is not None:
+                raise InvalidInputError(f"Variable {dependency} has an error")
+        result = self.backend.evaluate(node, values)
+        self.ans = result
+        return result
+    
+    def get(self, name: str) -> Optional[Variable]:
+        """Get a variable by name, or None if it is not defined."""
+        return self._variables.get(name)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._variables
+    
+    def __len__(self) -> int:
+        return len(self._variables)
+    
+    def __iter__(self) -> Iterator[Variable]:
+        """Iterate over the variables in definition order."""
+        return iter(list(self._variables.values()))
+    
+    def dependencies(self, name: str) -> List[str]:
+        """Get the names a variable's formula references (defined or not), sorted."""
+        variable = self._variables.get(name)
+        return sorted(variable.dependencies) if variable is not None else []
+    
+    def dependents(self, name: str) -> List[str]:
+        """Get the names of the variables whose formula references name, sorted."""
+        return sorted(self._dependents.get(name, ()))
+    
+    def _validate_name(self, name: str):
+        if not _NAME_PATTERN.fullmatch(name):
+            raise InvalidInputError(f"Invalid variable name: {name}")
+        if name == self.ANS or name in REGISTRY or REGISTRY.function(name) or REGISTRY.binary_operator(name):
+            raise InvalidInputError(f"Reserved name cannot be assigned: {name}")
+    
+    def _unlink(self, variable: Variable):
+        """Remove the edges from the variables a formula references."""
+        for dependency in variable.dependencies:
+            dependents = self._dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(variable.name)
+                if not dependents:
+                    del self._dependents[dependency]
+    
+    def _downstream(self, name: str) -> List[str]:
+        """
+        Get name followed by every variable that depends on it, in dependency order.
+        
+        The order is a reverse depth-first postorder over the dependent edges, built
+        iteratively so long chains of variables do not hit the recursion limit.
+        """
+        dependents = self._dependents
+        order = []
+        visited = {name}
+        stack = [(name, iter(dependents.get(name, ())))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if child not in visited:
+                    visited.add(child)
+                    stack.append((child, iter(dependents.get(child, ()))))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+        order.reverse()
+        return order
+    
+    def _recompute(self, order: List[str]):
+        """Re-evaluate the given variables, which must be in dependency order."""
+        variables = self._variables
+        values = self._values
+        for name in order:
+            variable = variables.get(name)
+            if variable is None:
+                continue
+            error = None
+            for dependency in variable.dependencies:
+                if dependency not in values:
+                    upstream = variables.get(dependency)
+                    error = (f"Error: Variable {dependency} has an error" if upstream is not None
+                             else f"Error: Undefined variable: {dependency}")
+                    break
+            if error is None:
+                try:
+                    variable.value = self.backend.evaluate(variable.node, values)
+                    variable.error = None
+                    values[name] = variable.value
+                    continue
+                except Exception as e:
+                    error = ErrorHandler.handle_error(e)
+            variable.value = None
+            variable.error = error
+            values.pop(name, None)
+        self.last_recomputed = order
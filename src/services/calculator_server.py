@@ -0,0 +1,293 @@
+"""
+asyncio server exposing CalculatorService as newline-delimited JSON over TCP or a Unix socket.
+"""
+import sys
+import os
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import argparse
+import asyncio
+import json
+from typing import Awaitable, Dict, Optional, Union
+from src.lib.numeric_backend import BACKEND_NAMES, DEFAULT_PRECISION
+from src.models.history import History, create_history
+from src.services.calculator_service import CalculatorService
+from src.services.process_pool import ProcessPoolRunner
+
+
+# Result of a request handler: a response computed inline, or one still being computed
+Outcome = Union[Dict, Awaitable[Dict]]
+
+
+class CalculatorServer:
+    """
+    Serves calculator requests as newline-delimited JSON.
+    
+    Each request is one JSON object per line:
+        
+        {"id": 1, "method": "calculate", "params": {"operation": "add", "operand1": "5", "operand2": "3"}}
+    
+    and each response is one line carrying the same id plus the service result:
+        
+        {"id": 1, "result": "8", "status": "success", "backend": "decimal"}
+    
+    Methods: calculate (operation, operand1, operand2), calculate_from_expression
+    (expression), history (offset, limit) and clear_history. Both calculate methods
+    accept an optional precision for the decimal backend.
+    
+    Clients may pipeline: requests are read as fast as they arrive and responses
+    are written in request order. Each connection holds at most max_pending
+    requests in flight; when that many are waiting (or the client stops reading
+    responses) the server stops reading from the connection, so backpressure
+    reaches the client through the socket. Operations above the process pool's
+    cost threshold are awaited from a worker thread while the pool computes them,
+    so the event loop keeps serving other requests.
+    """
+    
+    def __init__(self, service: Optional[CalculatorService] = None, history=None,
+                 max_pending: int = 64, max_line_bytes: int = 1 << 20):
+        """
+        Initialize the server.
+        
+        Args:
+            service: Calculator service to use (defaults to one with a process pool)
+            history: History store for successful calculations (defaults to an in-memory History)
+            max_pending: Maximum number of requests in flight per connection
+            max_line_bytes: Maximum length of one request line
+        """
+        if max_pending <= 0:
+            raise ValueError("Max pending must be greater than 0")
+        self.service = service if service is not None else CalculatorService(process_pool=ProcessPoolRunner())
+        self.history = history if history is not None else History()
+        self.max_pending = max_pending
+        self.max_line_bytes = max_line_bytes
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._methods = {
+            "calculate": self._calculate,
+            "calculate_from_expression": self._calculate_from_expression,
+            "history": self._history,
+            "clear_history": self._clear_history,
+        }
+    
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, path: Optional[str] = None):
+        """
+        Start listening.
+        
+        Args:
+            host: TCP host to bind
+            port: TCP port to bind (0 picks a free port)
+            path: Unix socket path; when given, host and port are ignored
+        """
+        if path:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=path,
+                                                           limit=self.max_line_bytes)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port,
+                                                      limit=self.max_line_bytes)
+    
+    @property
+    def address(self):
+        """Get the bound address: (host, port) for TCP or the path for a Unix socket."""
+        return self._server.sockets[0].getsockname()
+    
+    async def serve_forever(self):
+        """Serve until cancelled."""
+        await self._server.serve_forever()
+    
+    async def close(self):
+        """Stop listening and shut down the process pool."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.service.process_pool is not None:
+            self.service.process_pool.shutdown(wait=False)
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Read pipelined requests and hand them to the response writer in order."""
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+        responder = asyncio.ensure_future(self._write_responses(pending, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await pending.put(self._error(None, "Request line is too long"))
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    await pending.put(self._dispatch(line))
+        finally:
+            await pending.put(None)
+            await responder
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    
+    async def _write_responses(self, pending: asyncio.Queue, writer: asyncio.StreamWriter):
+        """Write responses in request order, waiting for the client whenever its buffer is full."""
+        connected = True
+        while True:
+            outcome = await pending.get()
+            if outcome is None:
+                break
+            response = outcome if isinstance(outcome, dict) else await outcome
+            if not connected:
+                # Keep consuming so the reader is never stuck on a full queue
+                continue
+            try:
+                writer.write(json.dumps(response, separators=(",", ":")).encode("utf-8") + b"\n")
+                await writer.drain()
+            except ConnectionError:
+                connected = False
+    
+    def _dispatch(self, line: bytes) -> Outcome:
+        """Decode one request line and run its handler."""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return self._error(None, f"Invalid request: {e}")
+        if not isinstance(request, dict):
+            return self._error(None, "Invalid request: expected a JSON object")
+        
+        request_id = request.get("id")
+        handler = self._methods.get(request.get("method"))
+        if handler is None:
+            return self._error(request_id, f"Unknown method: {request.get('method')}")
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            return self._error(request_id, "Invalid request: params must be a JSON object")
+        
+        try:
+            outcome = handler(params)
+        except KeyError as e:
+            return self._error(request_id, f"Missing parameter: {e.args[0]}")
+        except (TypeError, ValueError) as e:
+            return self._error(request_id, f"Invalid parameters: {e}")
+        if isinstance(outcome, dict):
+            return {"id": request_id, **outcome}
+        return asyncio.ensure_future(self._complete(request_id, outcome))
+    
+    @staticmethod
+    async def _complete(request_id, outcome: Awaitable[Dict]) -> Dict:
+        return {"id": request_id, **(await outcome)}
+    
+    @staticmethod
+    def _error(request_id, message: str) -> Dict:
+        return {"id": request_id, "error": f"Error: {message}", "status": "error"}
+    
+    def _in_thread(self, function, *args) -> Awaitable[Dict]:
+        """Run a blocking service call in the loop's default thread executor."""
+        return asyncio.get_running_loop().run_in_executor(None, function, *args)
+    
+    def _record(self, expression: str, result: Dict, **fields) -> Dict:
+        """
+        Add a successful calculation to the history (always called on the event loop).
+        
+        Extra fields (operation and operands) are stored with the entry, so columnar
+        history can aggregate by operation.
+        """
+        if result["status"] == "success":
+            self.history.add_item({"expression": expression, "result": result["result"], **fields})
+        return result
+    
+    async def _record_later(self, expression: str, result: Awaitable[Dict], **fields) -> Dict:
+        return self._record(expression, await result, **fields)
+    
+    # Request handlers
+    
+    def _calculate(self, params: Dict) -> Outcome:
+        # JSON numbers are accepted as operands and validated like strings
+        operation = params["operation"]
+        operand1 = str(params["operand1"])
+        operand2 = str(params["operand2"]) if params.get("operand2") is not None else None
+        precision = params.get("precision")
+        expression = f"{operand1} {operation} {operand2}" if operand2 is not None else f"{operand1} {operation}"
+        fields = {"operation": operation, "operand1": operand1, "operand2": operand2}
+        process_pool = self.service.process_pool
+        if process_pool is not None and process_pool.should_offload(operation, operand1, operand2):
+            return self._record_later(expression, self._in_thread(
+                self.service.calculate, operation, operand1, operand2, precision), **fields)
+        return self._record(expression, self.service.calculate(operation, operand1, operand2, precision), **fields)
+    
+    def _calculate_from_expression(self, params: Dict) -> Outcome:
+        expression = params["expression"]
+        precision = params.get("precision")
+        process_pool = self.service.process_pool
+        if process_pool is not None:
+            try:
+                offload = process_pool.should_offload_expression(
+                    self.service.calculator.expression_parser.parse(expression))
+            except ValueError:
+                # Invalid expressions fail quickly inline with the usual error message
+                offload = False
+            if offload:
+                return self._record_later(expression, self._in_thread(
+                    self.service.calculate_from_expression, expression, precision))
+        return self._record(expression, self.service.calculate_from_expression(expression, precision))
+    
+    def _history(self, params: Dict) -> Dict:
+        offset = int(params.get("offset", 0))
+        limit = params.get("limit")
+        return {
+            "items": list(self.history.iter_items(offset, int(limit) if limit is not None else None)),
+            "size": self.history.size(),
+            "status": "success"
+        }
+    
+    def _clear_history(self, params: Dict) -> Dict:
+        self.history.clear()
+        return {"status": "success"}
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, path: Optional[str] = None, **options):
+    """Run a CalculatorServer until cancelled."""
+    server = CalculatorServer(**options)
+    await server.start(host, port, path)
+    print(f"Calculator server listening on {server.address}", file=sys.stderr)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(args: Optional[list] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Calculator JSON server")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to bind (default: 8765)")
+    parser.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--max-pending", type=int, default=64,
+                        help="Maximum requests in flight per connection (default: 64)")
+    parser.add_argument("--workers", type=int, help="Process pool size (default: CPU count)")
+    parser.add_argument("--offload-threshold", type=float, default=20_000,
+                        help="Estimated cost above which operations run in the process pool")
+    parser.add_argument("--backend", choices=BACKEND_NAMES, default="decimal",
+                        help="Numeric backend (default: decimal)")
+    parser.add_argument("--precision", type=int,
+                        help=f"Significant digits for the decimal backend (default: {DEFAULT_PRECISION})")
+    parser.add_argument("--history-storage", choices=["memory", "columnar"], default="memory",
+                        help="History store for successful calculations (default: memory)")
+    parsed_args = parser.parse_args(args)
+    
+    # Log from a background thread so log writes do not stall the event loop
+    service = CalculatorService(async_logging=True, process_pool=ProcessPoolRunner(
+        max_workers=parsed_args.workers,
+        cost_threshold=parsed_args.offload_threshold
+    ), backend=parsed_args.backend, precision=parsed_args.precision)
+    try:
+        asyncio.run(serve(parsed_args.host, parsed_args.port, parsed_args.unix,
+                          service=service, max_pending=parsed_args.max_pending,
+                          history=create_history(parsed_args.history_storage)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
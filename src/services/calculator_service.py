@@ -6,28 +6,78 @@ import os
 # Add the project root to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
+import threading
 from decimal import Decimal
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from src.models.calculator import Calculator
-from src.lib.error_handler import ErrorHandler
+from src.lib.numeric_backend import DecimalBackend, NumericBackend, create_backend
+from src.lib.error_handler import OK, INVALID_ARGUMENT, INVALID_OPERATION, ErrorHandler
 from src.lib.performance_monitor import PerformanceMonitor
 from src.lib.logger import CalculatorLogger
 
+if TYPE_CHECKING:
+    # Only needed for annotations; importing them pulls in multiprocessing and NumPy
+    from concurrent.futures import Executor, Future
+    from src.services.process_pool import ProcessPoolRunner
+    from src.lib.vector_engine import VectorEngine
+
 
 class CalculatorService:
     """
     Service class that provides calculator functionality with error handling and performance monitoring.
+    
+    A service can be called from many threads at once: arithmetic runs in a
+    thread-local decimal context, the caches lock only around their dictionary
+    updates, and timings are recorded into per-thread histograms. submit(),
+    submit_expression() and map() run calls on an executor.
     """
     
-    def __init__(self):
-        """Initialize the calculator service."""
-        self.calculator = Calculator()
+    def __init__(self, cache_size: int = 0, async_logging: bool = False,
+                 process_pool: Optional["ProcessPoolRunner"] = None,
+                 backend: str = "decimal", precision: Optional[int] = None,
+                 executor: Optional["Executor"] = None, max_workers: Optional[int] = None):
+        """
+        Initialize the calculator service.
+        
+        Args:
+            cache_size: Maximum number of memoized results (0 disables result caching)
+            async_logging: Write log records from a background thread instead of the calling thread
+            process_pool: Runner for operations too expensive to execute inline (optional);
+                calculate() and calculate_from_expression() send work above its cost
+                threshold to the pool
+            backend: Numeric backend: "decimal" (exact decimal arithmetic rounded to
+                precision significant digits) or "float" (native floats, for throughput)
+            precision: Significant digits for the decimal backend (defaults to 10)
+            executor: Executor used by submit(), submit_expression() and map() (optional);
+                by default a thread pool is created on first use and shut down by shutdown()
+            max_workers: Size of the default thread pool (defaults to the executor's default)
+        """
+        self.backend = create_backend(backend, precision)
+        self.calculator = Calculator(cache_size=cache_size, backend=self.backend)
+        self.process_pool = process_pool
         self.error_handler = ErrorHandler()
         self.performance_monitor = PerformanceMonitor()
-        self.logger = CalculatorLogger()
+        self.logger = CalculatorLogger(async_mode=async_logging)
+        # Created on first use, since it may import NumPy
+        self._vector_engine = None
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._max_workers = max_workers
+        self._executor_lock = threading.Lock()
+    
+    def _backend_for(self, precision: Optional[int]) -> NumericBackend:
+        """The service's backend, or a decimal backend with a per-call precision."""
+        if precision is None:
+            return self.backend
+        if not isinstance(self.backend, DecimalBackend):
+            raise ValueError("Precision is only supported by the decimal backend")
+        if precision == self.backend.precision:
+            return self.backend
+        return DecimalBackend(precision)
     
     @PerformanceMonitor.time_operation("basic_calculation")
-    def calculate(self, operation: str, operand1: str, operand2: Optional[str] = None) -> dict:
+    def calculate(self, operation: str, operand1: str, operand2: Optional[str] = None,
+                  precision: Optional[int] = None) -> dict:
         """
         Perform a calculation with error handling and performance monitoring.
         
@@ -35,24 +85,191 @@ class CalculatorService:
             operation: The operation to perform (add, subtract, multiply, divide, power, sqrt, percentage, factorial)
             operand1: First operand as string
             operand2: Second operand as string (optional for unary operations)
+            precision: Significant digits for this call (decimal backend only; defaults
+                to the service's precision)
             
         Returns:
-            Dictionary with result or error information
+            Dictionary with result or error information; results name the backend
+            that produced them
         """
         try:
-            result = self.calculator.calculate(operation, operand1, operand2)
-            self.logger.log_calculation(operation, operand1, operand2, str(result), success=True)
-            return {
-                "result": str(result),
-                "status": "success"
-            }
+            backend = self._backend_for(precision)
+            if self.process_pool is not None and self.process_pool.should_offload(operation, operand1, operand2):
+                value, code = self.process_pool.run(operation, operand1, operand2, backend=backend), OK
+            else:
+                # Common failures (bad input, division by zero) are reported without raising
+                value, code = self.calculator.evaluate(operation, operand1, operand2, backend)
+            if code == OK:
+                result = backend.format(value)
+                self.logger.log_calculation(operation, operand1, operand2, result, success=True)
+                return {
+                    "result": result,
+                    "status": "success",
+                    "backend": backend.name
+                }
         except Exception as e:
-            error_message = self.error_handler.handle_error(e)
-            self.logger.log_calculation(operation, operand1, operand2, error_message, success=False)
+            value, code = e, self.error_handler.classify(e)
+        error_message = self.error_handler.render(code, value)
+        self.logger.log_calculation(operation, operand1, operand2, error_message, success=False)
+        return {
+            "error": error_message,
+            "status": "error"
+        }
+    
+    @PerformanceMonitor.time_operation("batch_calculation")
+    def calculate_many(self, items: Iterable) -> List[dict]:
+        """
+        Perform many calculations in one call.
+        
+        Items are grouped by operation and each group is executed in a single pass
+        through the calculator, without the per-call timing, printing and logging
+        that calculate() performs. One summary line is logged for the whole batch.
+        
+        Args:
+            items: Iterable of (operation, operand1[, operand2]) tuples or dictionaries
+                with "operation", "operand1" and optional "operand2" keys
+            
+        Returns:
+            List of result dictionaries in input order, each shaped like the return
+            value of calculate()
+        """
+        results = []
+        append = results.append
+        failures = 0
+        backend = self.backend
+        render = self.error_handler.render
+        for value, code in self.evaluate_many(items):
+            if code == OK:
+                append({
+                    "result": backend.format(value),
+                    "status": "success",
+                    "backend": backend.name
+                })
+            else:
+                failures += 1
+                append({
+                    "error": render(code, value),
+                    "status": "error"
+                })
+        
+        self.logger.log_info(f"Batch calculation: {len(results)} items, {failures} failed")
+        return results
+    
+    def evaluate_many(self, items: Iterable) -> List[Tuple[Any, int]]:
+        """
+        Perform many calculations without raising, formatting or logging.
+        
+        This is the bulk path: items are grouped by operation like calculate_many(),
+        but each result is a (value, code) tuple and no error message is built.
+        Failed items cost about as much as successful ones.
+        
+        Args:
+            items: Iterable of (operation, operand1[, operand2]) tuples or dictionaries,
+                as accepted by calculate_many()
+            
+        Returns:
+            List in input order of (result, OK) tuples holding the unformatted result,
+            or (detail, code) tuples for failures; ErrorHandler.render(code, detail)
+            gives the message calculate() would report
+        """
+        results: List[Optional[Tuple[Any, int]]] = []
+        groups: Dict[str, Tuple[List[int], List[Tuple[str, Optional[str]]]]] = {}
+        
+        for index, item in enumerate(items):
+            results.append(None)
+            try:
+                operation, operand1, operand2 = self._unpack_batch_item(item)
+            except ValueError as e:
+                results[index] = (e, INVALID_ARGUMENT)
+                continue
+            if not isinstance(operation, str):
+                # Not a valid group key (it may be unhashable) nor a valid operation
+                results[index] = (operation, INVALID_OPERATION)
+                continue
+            group = groups.get(operation)
+            if group is None:
+                group = groups[operation] = ([], [])
+            group[0].append(index)
+            group[1].append((operand1, operand2))
+        
+        for operation, (indexes, operands) in groups.items():
+            for index, outcome in zip(indexes, self.calculator.evaluate_batch(operation, operands)):
+                results[index] = outcome
+        return results
+    
+    @property
+    def executor(self) -> "Executor":
+        """Executor used by submit(), submit_expression() and map()."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    from concurrent.futures import ThreadPoolExecutor
+                    self._executor = ThreadPoolExecutor(max_workers=self._max_workers,
+                                                        thread_name_prefix="calculator")
+        return self._executor
+    
+    def submit(self, operation: str, operand1: str, operand2: Optional[str] = None,
+               precision: Optional[int] = None) -> "Future":
+        """
+        Run calculate() on the executor.
+        
+        Returns:
+            Future resolving to the result dictionary of calculate()
+        """
+        return self.executor.submit(self.calculate, operation, operand1, operand2, precision)
+    
+    def submit_expression(self, expression: str, precision: Optional[int] = None) -> "Future":
+        """Run calculate_from_expression() on the executor."""
+        return self.executor.submit(self.calculate_from_expression, expression, precision)
+    
+    def map(self, items: Iterable, timeout: Optional[float] = None) -> Iterator[dict]:
+        """
+        Run calculate() over many items on the executor.
+        
+        Unlike calculate_many(), every item is a full calculate() call (timed and
+        logged) and items run concurrently.
+        
+        Args:
+            items: Iterable of (operation, operand1[, operand2]) tuples or dictionaries,
+                as accepted by calculate_many()
+            timeout: Seconds to wait for all results, from the time of the call
+            
+        Returns:
+            Iterator over result dictionaries in input order
+        """
+        return self.executor.map(self._calculate_item, items, timeout=timeout)
+    
+    def _calculate_item(self, item) -> dict:
+        try:
+            operation, operand1, operand2 = self._unpack_batch_item(item)
+        except ValueError as e:
             return {
-                "error": error_message,
+                "error": self.error_handler.handle_error(e),
                 "status": "error"
             }
+        return self.calculate(operation, operand1, operand2)
+    
+    def shutdown(self, wait: bool = True):
+        """Shut down the executor if the service created it (a later call creates a new one)."""
+        if not self._owns_executor:
+            return
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+    
+    @staticmethod
+    def _unpack_batch_item(item) -> Tuple[str, str, Optional[str]]:
+        """Normalize a batch item into an (operation, operand1, operand2) tuple."""
+        if isinstance(item, dict):
+            if "operation" not in item or "operand1" not in item:
+                raise ValueError(f"Invalid batch item: {item}")
+            return item["operation"], item["operand1"], item.get("operand2")
+        if isinstance(item, (tuple, list)) and len(item) in (2, 3):
+            operation, operand1 = item[0], item[1]
+            operand2 = item[2] if len(item) == 3 else None
+            return operation, operand1, operand2
+        raise ValueError(f"Invalid batch item: {item}")
     
     def calculate_with_calculation_object(self, operation: str, operand1: str, operand2: Optional[str] = None) -> dict:
         """
@@ -81,16 +298,26 @@ class CalculatorService:
                 "status": "error"
             }
     
-    def calculate_from_expression(self, expression: str) -> dict:
+    @PerformanceMonitor.time_operation("expression_calculation")
+    def calculate_from_expression(self, expression: str, precision: Optional[int] = None) -> dict:
         """
         Parse and calculate from a simple expression string.
+        
+        precision overrides the decimal backend's precision for this call.
         """
         try:
-            result = self.calculator.calculate_from_expression(expression)
+            backend = self._backend_for(precision)
+            if self.process_pool is not None and self.process_pool.should_offload_expression(
+                    self.calculator.expression_parser.parse(expression)):
+                result = self.process_pool.run_expression(expression, backend=backend)
+            else:
+                result = self.calculator.calculate_from_expression(expression, backend)
+            result = backend.format(result)
             self.logger.log_info(f"Expression calculation: {expression} = {result}")
             return {
-                "result": str(result),
-                "status": "success"
+                "result": result,
+                "status": "success",
+                "backend": backend.name
             }
         except Exception as e:
             error_message = self.error_handler.handle_error(e)
@@ -98,4 +325,62 @@ class CalculatorService:
             return {
                 "error": error_message,
                 "status": "error"
-            }
\ No newline at end of file
+            }
+    
+    @property
+    def vector_engine(self) -> "VectorEngine":
+        """Engine used by calculate_array (NumPy when installed, a Python loop otherwise)."""
+        if self._vector_engine is None:
+            from src.lib.vector_engine import VectorEngine
+            self._vector_engine = VectorEngine()
+        return self._vector_engine
+    
+    @PerformanceMonitor.time_operation("vector_calculation")
+    def calculate_array(self, operation: str, operand1, operand2=None) -> dict:
+        """
+        Apply one operation over arrays of operands.
+        
+        Args:
+            operation: add, subtract, multiply, divide, power, sqrt or percentage
+            operand1: Array (or scalar) of first operands
+            operand2: Array (or scalar) of second operands (omitted for sqrt)
+            
+        Returns:
+            Dictionary with a VectorResult under "result" (per-element values and
+            error codes) and the engine that computed it under "backend", or error
+            information if the request itself is invalid
+        """
+        try:
+            result = self.vector_engine.compute(operation, operand1, operand2)
+            self.logger.log_info(
+                f"Vector calculation: {operation} over {len(result)} elements, {result.error_count} failed"
+            )
+            return {
+                "result": result,
+                "status": "success",
+                "backend": result.engine
+            }
+        except Exception as e:
+            error_message = self.error_handler.handle_error(e)
+            self.logger.log_error(f"Vector calculation failed: {operation} - {error_message}")
+            return {
+                "error": error_message,
+                "status": "error"
+            }
+    
+    def get_cache_stats(self) -> Optional[dict]:
+        """
+        Get result cache statistics.
+        
+        Returns:
+            Dictionary with hits, misses, evictions, size, max_entries, bytes, max_bytes and hit_rate,
+            or None if result caching is disabled
+        """
+        if self.calculator.result_cache is None:
+            return None
+        return self.calculator.result_cache.stats()
+    
+    def clear_cache(self):
+        """Clear the result cache and reset its statistics."""
+        if self.calculator.result_cache is not None:
+            self.calculator.result_cache.clear()
@@ -0,0 +1,229 @@
+"""
+Parameter sweeps: one expression evaluated over ranges of its variables.
+"""
+import sys
+import os
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import math
+import re
+from collections import deque
+from decimal import Context, Decimal, MAX_EMAX, MAX_PREC, MIN_EMIN
+from fractions import Fraction
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from src.lib.error_handler import ErrorHandler, InvalidInputError
+from src.lib.expression_compiler import CompiledExpression
+from src.lib.numeric_backend import DecimalBackend, NumericBackend
+from src.lib.validation import Validation
+from src.models.calculator import Calculator
+
+
+# "name=start:stop" or "name=start:stop:step"
+_RANGE_PATTERN = re.compile(r'^\s*([A-Za-z_]\w*)\s*=\s*([^:]+):([^:]+)(?::([^:]+))?$')
+
+# Context wide enough that range values (start + i * step) are never rounded
+_EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+# One swept point: the variable values as text, and the formatted result or the error message
+Row = Tuple[Tuple[str, ...], Optional[str], Optional[str]]
+
+# Expressions compiled by this process (a worker compiles each sweep once, not once per chunk)
+_compiled: Dict[tuple, CompiledExpression] = {}
+
+
+class SweepRange:
+    """
+    The values of one swept variable: start, start + step, ... up to and including stop.
+    
+    Values are computed from their index (start + i * step, exactly), so a range
+    of any length takes constant memory and no rounding error accumulates.
+    """
+    
+    __slots__ = ("name", "start", "stop", "step", "length")
+    
+    def __init__(self, name: str, start: Decimal, stop: Decimal, step: Decimal = Decimal(1)):
+        """
+        Initialize the range.
+        
+        Raises:
+            ValueError: If step is zero or points away from stop
+        """
+        if step == 0:
+            raise InvalidInputError(f"Sweep step cannot be zero: {name}")
+        self.name = name
+        self.start = start
+        self.stop = stop
+        self.step = step
+        # The exact number of steps, without rounding (stop - start) / step
+        self.length = math.floor((Fraction(stop) - Fraction(start)) / Fraction(step)) + 1
+        if self.length <= 0:
+            raise InvalidInputError(f"Sweep range is empty: {name}={start}:{stop}:{step}")
+    
+    @classmethod
+    def parse(cls, spec: str) -> "SweepRange":
+        """
+        Parse "name=start:stop[:step]", e.g. "x=0:1000000:0.5" (step defaults to 1).
+        
+        Raises:
+            ValueError: If the text is not a range or a bound is not a number
+        """
+        match = _RANGE_PATTERN.match(spec)
+        if match is None:
+            raise InvalidInputError(f"Invalid sweep range (expected name=start:stop[:step]): {spec}")
+        name, start, stop, step = match.groups()
+        return cls(name, Validation.validate_operand(start.strip()), Validation.validate_operand(stop.strip()),
+                   Validation.validate_operand(step.strip()) if step is not None else Decimal(1))
+    
+    def __len__(self) -> int:
+        return self.length
+    
+    def __repr__(self) -> str:
+        return f"SweepRange({self.name}={self.start}:{self.stop}:{self.step})"
+    
+    def value(self, index: int) -> Decimal:
+        """Get the index-th value of the range."""
+        return _EXACT_CONTEXT.add(self.start, _EXACT_CONTEXT.multiply(self.step, index))
+
+
+class ParameterSweep:
+    """
+    Evaluates an expression at every point of the cartesian product of its variables' ranges.
+    
+    The product is never built: points are numbered in nested-loop order (the
+    last range varies fastest) and each point's values are derived from its
+    number. The points are split into chunks of consecutive numbers, which are
+    evaluated inline or in worker processes; either way the chunks are returned
+    in order, so the output does not depend on the number of workers. A point
+    that fails is reported with its error message and the sweep continues.
+    """
+    
+    def __init__(self, expression: str, ranges: Sequence[SweepRange], backend: Optional[NumericBackend] = None,
+                 chunk_size: int = 10_000):
+        """
+        Initialize the sweep, checking the expression up front.
+        
+        Args:
+            expression: Expression whose variables are all swept, e.g. "x ^ 2 / 3"
+            ranges: One range per variable, outermost first
+            backend: Numeric backend to evaluate with (defaults to a DecimalBackend)
+            chunk_size: Number of points per chunk of work
+        
+        Raises:
+            ValueError: If the expression cannot be parsed, a variable is swept twice,
+                or the expression references a variable that is not swept
+        """
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be greater than 0")
+        self.expression = expression
+        self.ranges = tuple(ranges)
+        self.names = tuple(r.name for r in self.ranges)
+        if len(set(self.names)) != len(self.names):
+            duplicate = next(name for name in self.names if self.names.count(name) > 1)
+            raise InvalidInputError(f"Variable swept more than once: {duplicate}")
+        self.backend = backend if backend is not None else DecimalBackend()
+        self.chunk_size = chunk_size
+        _compile(expression, self.names, self.backend)
+    
+    @property
+    def size(self) -> int:
+        """Number of points in the sweep (len() fails for sweeps larger than sys.maxsize)."""
+        return math.prod(len(r) for r in self.ranges)
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def chunks(self, workers: int = 1) -> Iterator[List[Row]]:
+        """
+        Evaluate the sweep chunk by chunk.
+        
+        Args:
+            workers: Number of worker processes; with 1 (or a single chunk) the
+                chunks are evaluated in this process
+        
+        Yields:
+            The rows of each chunk, in point order
+        """
+        total = self.size
+        bounds = ((start, min(start + self.chunk_size, total)) for start in range(0, total, self.chunk_size))
+        if workers <= 1 or total <= self.chunk_size:
+            for start, stop in bounds:
+                yield evaluate_chunk(self.expression, self.ranges, self.backend, start, stop)
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            # A few chunks in flight per worker keeps the workers busy while the
+            # results wait in order, without queueing the whole sweep
+            pending = deque()
+            for start, stop in bounds:
+                pending.append(pool.submit(evaluate_chunk, self.expression, self.ranges, self.backend, start, stop))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Stopping early (fail-fast, or the consumer closing the generator) drops queued chunks
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    def __iter__(self) -> Iterator[Row]:
+        """Evaluate the sweep in this process, point by point."""
+        for rows in self.chunks():
+            yield from rows
+
+
+def _compile(expression: str, names: Tuple[str, ...], backend: NumericBackend) -> CompiledExpression:
+    """Compile an expression for a sweep, reusing this process's earlier compilation."""
+    key = (expression, names, backend.key)
+    compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = Calculator().compile_expression(expression, backend=backend, variables=names)
+        _compiled[key] = compiled
+    return compiled
+
+
+def evaluate_chunk(expression: str, ranges: Sequence[SweepRange], backend: NumericBackend,
+                   start: int, stop: int) -> List[Row]:
+    """
+    Evaluate the points numbered start to stop - 1 of a sweep (run in worker processes).
+    
+    Returns:
+        One (values, result, error) row per point, in order
+    """
+    compiled = _compile(expression, tuple(r.name for r in ranges), backend)
+    lengths = [len(r) for r in ranges]
+    # The range indexes of the first point, then advanced like an odometer so
+    # only the values whose index changed are recomputed
+    indexes = []
+    number = start
+    for length in reversed(lengths):
+        number, index = divmod(number, length)
+        indexes.append(index)
+    indexes.reverse()
+    values = [r.value(index) for r, index in zip(ranges, indexes)]
+    texts = [str(value) for value in values]
+    
+    format_result = backend.format
+    handle_error = ErrorHandler.handle_error
+    last = len(ranges) - 1
+    rows = []
+    append = rows.append
+    for _ in range(stop - start):
+        try:
+            append((tuple(texts), format_result(compiled(*values)), None))
+        except Exception as e:
+            append((tuple(texts), None, handle_error(e)))
+        
+        position = last
+        while position >= 0:
+            index = indexes[position] + 1
+            if index == lengths[position]:
+                index = 0
+            indexes[position] = index
+            values[position] = value = ranges[position].value(index)
+            texts[position] = str(value)
+            if index:
+                break
+            position -= 1
+    return rows
@@ -0,0 +1,224 @@
+"""
+Process-pool execution for CPU-heavy calculator operations.
+"""
+import sys
+import os
+import threading
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+from src.lib.expression_parser import BinaryNode, FunctionNode, NegateNode, NumberNode
+from src.lib.numeric_backend import NumericBackend
+from src.lib.operation_registry import REGISTRY
+from src.models.calculator import Calculator
+
+
+# Calculator used by each worker process, created once by the pool initializer
+_worker_calculator: Optional[Calculator] = None
+
+
+def _init_worker():
+    """Create the worker's calculator up front so the first task does not pay for it."""
+    global _worker_calculator
+    _worker_calculator = Calculator()
+
+
+def _run_operation(operation: str, operand1: str, operand2: Optional[str],
+                   backend: Optional[NumericBackend] = None) -> Decimal:
+    """Execute one operation in a worker process."""
+    calculator = _worker_calculator if _worker_calculator is not None else Calculator()
+    return calculator.calculate(operation, operand1, operand2, backend)
+
+
+def _run_expression(expression: str, backend: Optional[NumericBackend] = None) -> Decimal:
+    """Evaluate one expression in a worker process."""
+    calculator = _worker_calculator if _worker_calculator is not None else Calculator()
+    return calculator.calculate_from_expression(expression, backend)
+
+
+def _noop() -> int:
+    return os.getpid()
+
+
+def estimate_cost(operation: str, operand1, operand2=None) -> float:
+    """
+    Estimate the cost of an operation using its registered cost estimator.
+    
+    Unknown operations and operands the estimator cannot parse cost 1, so they
+    fail fast inline.
+    """
+    spec = REGISTRY.get(operation)
+    if spec is None:
+        return 1
+    try:
+        return spec.estimate_cost(operand1, operand2)
+    except (InvalidOperation, ValueError, TypeError, OverflowError):
+        return 1
+
+
+def estimate_expression_cost(node) -> float:
+    """
+    Estimate the cost of evaluating a parsed expression.
+    
+    The costs of all operations in the tree are added up. An operation with a cost
+    estimator whose operands are not literal numbers cannot be estimated without
+    evaluating them, so it is treated as infinitely expensive.
+    """
+    if isinstance(node, BinaryNode):
+        operands = (node.left, node.right)
+    elif isinstance(node, FunctionNode):
+        operands = (node.argument,)
+    elif isinstance(node, NegateNode):
+        return estimate_expression_cost(node.operand)
+    else:
+        return 0
+    
+    total = sum(estimate_expression_cost(operand) for operand in operands)
+    spec = REGISTRY.get(node.operation)
+    if spec is None or spec.cost_estimator is None:
+        return total + 1
+    if not all(isinstance(operand, NumberNode) for operand in operands):
+        return float("inf")
+    return total + estimate_cost(node.operation, *(operand.value for operand in operands))
+
+
+class ProcessPoolRunner:
+    """
+    Runs calculator operations whose estimated cost is above a threshold in a process pool.
+    
+    The pool is created on first use. Workers build their Calculator in the pool
+    initializer; warm_up() starts every worker ahead of time. max_tasks_per_child
+    recycles workers after a number of tasks. A call that exceeds its timeout is
+    cancelled; if it is already running, the pool's workers are terminated and a
+    fresh pool is created for the next call.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, cost_threshold: float = 20_000,
+                 timeout: Optional[float] = None, max_tasks_per_child: Optional[int] = None):
+        """
+        Initialize the process pool runner.
+        
+        Args:
+            max_workers: Number of worker processes (defaults to the CPU count)
+            cost_threshold: Operations with an estimated cost above this run in the pool
+            timeout: Default per-call timeout in seconds (None waits indefinitely)
+            max_tasks_per_child: Recycle a worker after this many tasks (None never recycles)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cost_threshold = cost_threshold
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Guards creating and replacing the pool when called from several threads
+        self._pool_lock = threading.Lock()
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        pool = self._pool
+        if pool is not None:
+            return pool
+        with self._pool_lock:
+            if self._pool is None:
+                kwargs = {}
+                if self.max_tasks_per_child is not None:
+                    kwargs["max_tasks_per_child"] = self.max_tasks_per_child
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    **kwargs
+                )
+            return self._pool
+    
+    def should_offload(self, operation: str, operand1, operand2=None) -> bool:
+        """Check whether an operation is expensive enough to run in the pool."""
+        return estimate_cost(operation, operand1, operand2) > self.cost_threshold
+    
+    def should_offload_expression(self, node) -> bool:
+        """Check whether a parsed expression is expensive enough to evaluate in the pool."""
+        return estimate_expression_cost(node) > self.cost_threshold
+    
+    def warm_up(self):
+        """Start all worker processes now instead of on the first calls."""
+        pool = self._get_pool()
+        for future in [pool.submit(_noop) for _ in range(self.max_workers)]:
+            future.result()
+    
+    def submit(self, operation: str, operand1: str, operand2: Optional[str] = None,
+               backend: Optional[NumericBackend] = None) -> Future:
+        """
+        Submit an operation to the pool without waiting for it.
+        
+        Returns:
+            Future resolving to the result (or raising the calculation error)
+        """
+        return self._get_pool().submit(_run_operation, operation, operand1, operand2, backend)
+    
+    def submit_expression(self, expression: str, backend: Optional[NumericBackend] = None) -> Future:
+        """Submit an expression to the pool without waiting for it."""
+        return self._get_pool().submit(_run_expression, expression, backend)
+    
+    def run(self, operation: str, operand1: str, operand2: Optional[str] = None,
+            timeout: Optional[float] = None, backend: Optional[NumericBackend] = None) -> Decimal:
+        """
+        Run an operation in the pool and wait for its result.
+        
+        Args:
+            operation: The operation to perform
+            operand1: First operand
+            operand2: Second operand (optional for unary operations)
+            timeout: Seconds to wait (defaults to the runner's timeout)
+            backend: Numeric backend the worker uses (defaults to the worker calculator's)
+        
+        Returns:
+            Result of the calculation
+        
+        Raises:
+            ValueError: If the operation fails or does not finish within the timeout
+        """
+        future = self.submit(operation, operand1, operand2, backend)
+        return self.result(future, timeout)
+    
+    def run_expression(self, expression: str, timeout: Optional[float] = None,
+                       backend: Optional[NumericBackend] = None) -> Decimal:
+        """Evaluate an expression in the pool and wait for its result."""
+        return self.result(self.submit_expression(expression, backend), timeout)
+    
+    def result(self, future: Future, timeout: Optional[float] = None) -> Decimal:
+        """Wait for a submitted operation, cancelling it if it times out."""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            if not future.cancel():
+                # Already running in a worker: the only way to stop it is to stop the worker
+                self._terminate()
+            raise ValueError(f"Operation timed out after {timeout} seconds")
+        except BrokenProcessPool:
+            # A worker died (killed or out of memory); start over with a fresh pool
+            self._terminate()
+            raise ValueError("Worker process terminated unexpectedly")
+    
+    def _terminate(self):
+        """Kill the current pool's workers; a new pool is created on the next call."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        terminate_workers = getattr(pool, "terminate_workers", None)
+        if terminate_workers is not None:
+            terminate_workers()
+            return
+        # Before Python 3.14 the executor has no public way to kill its workers
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+    
+    def shutdown(self, wait: bool = True):
+        """Shut down the pool."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
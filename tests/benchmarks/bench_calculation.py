@@ -0,0 +1,75 @@
+"""
+Benchmark: memory and construction throughput of Calculation records.
+
+Compares the current Calculation (__slots__, lazy expression and timestamp,
+counter-based IDs) with a replica of the original record layout (per-instance
+__dict__, uuid4 IDs, datetime.now() and an eagerly built expression string).
+Both use the same operand validation so only the record overhead differs.
+
+Run from the project root:
+    python tests/benchmarks/bench_calculation.py [count]
+"""
+import sys
+import os
+import time
+import tracemalloc
+import uuid
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from datetime import datetime
+from src.lib.validation import Validation
+from src.models.calculation import Calculation
+
+
+class LegacyCalculation:
+    """Replica of the original Calculation metadata handling."""
+    
+    def __init__(self, operand1, operand2, operation, result=None, expression=None):
+        self._id = str(uuid.uuid4())
+        self._operand1 = Validation.validate_operand(operand1)
+        self._operand2 = Validation.validate_operand(operand2) if operand2 is not None else None
+        if not Validation.is_valid_operation(operation):
+            raise ValueError(f"Invalid operation: {operation}")
+        self._operation = operation
+        self._result = result
+        self._timestamp = datetime.now()
+        self._expression = expression if expression else self._create_expression()
+    
+    def _create_expression(self):
+        op_symbol_map = {
+            'add': '+', 'subtract': '-', 'multiply': '*',
+            'divide': '/', 'power': '^', 'percentage': '% of'
+        }
+        symbol = op_symbol_map.get(self._operation, self._operation)
+        return f"{self._operand1} {symbol} {self._operand2}"
+
+
+def measure(cls, count: int):
+    """Return (seconds to construct count records, bytes retained per record)."""
+    start = time.perf_counter()
+    for i in range(count):
+        cls("12.5", "3", "multiply")
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    records = [cls("12.5", "3", "multiply") for _ in range(count)]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return elapsed, retained / count
+
+
+def main(count: int = 100_000):
+    print(f"{'record':<20} {'construct/s':>12} {'bytes/record':>13}")
+    results = {}
+    for label, cls in (("legacy", LegacyCalculation), ("current", Calculation)):
+        elapsed, per_record = measure(cls, count)
+        results[label] = (elapsed, per_record)
+        print(f"{label:<20} {count / elapsed:>12,.0f} {per_record:>13.0f}")
+    legacy, current = results["legacy"], results["current"]
+    print(f"throughput x{legacy[0] / current[0]:.2f}, memory {current[1] / legacy[1]:.0%} of legacy")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,53 @@
+"""
+Benchmark: exact factorial engine versus the original multiply-in-a-loop implementation.
+
+Run from the project root:
+    python tests/benchmarks/bench_factorial.py [n ...]
+"""
+import sys
+import os
+import time
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from decimal import Decimal
+from src.lib.factorial import FactorialEngine
+
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000]
+
+
+def legacy_factorial(num: int) -> int:
+    """The original MathUtils.factorial loop (without its n <= 100 cap)."""
+    result = 1
+    for i in range(1, num + 1):
+        result *= i
+    return result
+
+
+def best_of(func, repeat: int) -> float:
+    """Return the best wall-clock time of func over repeat runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(sizes):
+    engine = FactorialEngine(max_digits=10_000_000)
+    print(f"{'n':>8} {'loop (ms)':>12} {'loop+Decimal (ms)':>18} {'engine (ms)':>12} {'speedup':>8}")
+    for n in sizes:
+        repeat = 5 if n <= 10_000 else 1
+        loop_ms = best_of(lambda: legacy_factorial(n), repeat)
+        # The service must render the result; a huge int has to go through Decimal to do so
+        loop_render_ms = best_of(lambda: Decimal(legacy_factorial(n)), repeat)
+        engine_ms = best_of(lambda: engine.compute(n), repeat)
+        if n <= 10_000:
+            assert engine.compute(n) == Decimal(legacy_factorial(n))
+        print(f"{n:>8} {loop_ms:>12.3f} {loop_render_ms:>18.3f} {engine_ms:>12.3f} {loop_render_ms / engine_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,77 @@
+"""
+Benchmark: per-call cost of operand validation and parsing.
+
+Compares the original flows (pattern looked up on every call, the regex run up to
+twice, the operand parsed to Decimal in validation and again in MathUtils, and in
+Calculation a round trip back through str) with the current single-parse pipeline.
+
+Run from the project root:
+    python tests/benchmarks/bench_operand_pipeline.py
+"""
+import sys
+import os
+import re
+import timeit
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from decimal import Decimal
+from src.lib.math_utils import MathUtils
+from src.lib.validation import Validation
+from src.models.calculator import Calculator
+
+
+def legacy_is_valid_number(value: str) -> bool:
+    if not value:
+        return False
+    pattern = r'^[-+]?(\d+\.?\d*|\.\d+)$'
+    return bool(re.match(pattern, value))
+
+
+def legacy_validate_operand(operand: str) -> Decimal:
+    if not legacy_is_valid_number(operand):
+        raise ValueError(f"Invalid number format: {operand}")
+    return Decimal(operand)
+
+
+def legacy_calculator_pipeline(operand1: str, operand2: str) -> Decimal:
+    """The original Calculator.calculate flow for 'add': validate (and discard), then re-parse in MathUtils."""
+    legacy_validate_operand(operand1)
+    legacy_validate_operand(operand2)
+    return MathUtils.add(operand1, operand2)
+
+
+def legacy_calculation_pipeline(operand1: str, operand2: str) -> Decimal:
+    """The original Calculation flow: is_valid_number + validate_operand, then str() and re-parse in execute()."""
+    parsed1 = legacy_is_valid_number(operand1) and legacy_validate_operand(operand1)
+    parsed2 = legacy_is_valid_number(operand2) and legacy_validate_operand(operand2)
+    return MathUtils.add(str(parsed1), str(parsed2))
+
+
+def single_parse_pipeline(operand1: str, operand2: str) -> Decimal:
+    """The current flow shared by Calculator and Calculation: parse once, pass Decimals on."""
+    return MathUtils.add(Validation.validate_operand(operand1), Validation.validate_operand(operand2))
+
+
+def report(label: str, func, number: int) -> float:
+    best = min(timeit.repeat(func, number=number, repeat=7))
+    per_call_ns = best / number * 1e9
+    print(f"{label:<40} {per_call_ns:>8.0f} ns/call")
+    return per_call_ns
+
+
+def main(number: int = 200_000):
+    operand1, operand2 = "12345.6789", "-0.000123"
+    
+    current = report("single-parse pipeline", lambda: single_parse_pipeline(operand1, operand2), number)
+    legacy = report("legacy Calculator pipeline", lambda: legacy_calculator_pipeline(operand1, operand2), number)
+    print(f"{'  saving':<40} {legacy - current:>8.0f} ns/call ({(legacy - current) / legacy:.0%})")
+    legacy = report("legacy Calculation pipeline", lambda: legacy_calculation_pipeline(operand1, operand2), number)
+    print(f"{'  saving':<40} {legacy - current:>8.0f} ns/call ({(legacy - current) / legacy:.0%})")
+    
+    calculator = Calculator()
+    report("Calculator.calculate end to end", lambda: calculator.calculate("add", operand1, operand2), number)
+
+
+if __name__ == "__main__":
+    main()
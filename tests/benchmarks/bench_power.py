@@ -0,0 +1,86 @@
+"""
+Benchmark: power engine versus the original Decimal ** Decimal implementation.
+
+Run from the project root:
+    python tests/benchmarks/bench_power.py
+
+The original rounded every result to the context precision (10 digits), so the
+exact rows also show the cost of computing the exact result with native ints,
+as exponentiation by squaring on Python ints followed by conversion to Decimal.
+"""
+import sys
+import os
+import time
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from decimal import Context, Decimal, localcontext, MAX_EMAX, MAX_PREC, MIN_EMIN
+from src.lib.power import PowerEngine
+
+
+# (base, exponent) pairs: small exact results, large exact results, fractional exponents
+CASES = [
+    ("1.5", "2"), ("7", "20"), ("2", "1000"), ("3", "20000"), ("3", "200000"),
+    ("1.5", "0.5"), ("1.0001", "12345.67"), ("2", "-50"),
+]
+
+_EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+def legacy_power(base: Decimal, exponent: Decimal) -> Decimal:
+    """The original MathUtils.power (rounded to the global context, no cost check)."""
+    return base ** exponent
+
+
+def native_int_power(base: Decimal, exponent: Decimal) -> Decimal:
+    """Exact integral power by squaring on native ints, converted back to Decimal."""
+    _, digits, scale = base.as_tuple()
+    coefficient = int("".join(map(str, digits)))
+    n = int(exponent)
+    return Decimal(coefficient ** n).scaleb(scale * n, _EXACT_CONTEXT)
+
+
+def best_of(func, repeat: int) -> float:
+    """Return the best wall-clock time of func over repeat runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    engine = PowerEngine()
+    print(f"{'base ^ exponent':>20} {'legacy (ms)':>12} {'engine (ms)':>12} {'native int (ms)':>16} {'digits':>8}")
+    with localcontext() as context:
+        context.prec = 10
+        for base_text, exponent_text in CASES:
+            base, exponent = Decimal(base_text), Decimal(exponent_text)
+            repeat = 1000 if abs(exponent) <= 1000 else 5
+            legacy_ms = best_of(lambda: legacy_power(base, exponent), repeat)
+            engine_ms = best_of(lambda: engine.compute(base, exponent), repeat)
+            result = engine.compute(base, exponent)
+            native_text = "-"
+            if exponent == exponent.to_integral_value() and exponent > 0:
+                # Conversion to Decimal dominates for large results; it is skipped beyond 20 000
+                if exponent <= 20_000:
+                    native_ms = best_of(lambda: native_int_power(base, exponent), min(repeat, 20))
+                    assert native_int_power(base, exponent) == result
+                    native_text = f"{native_ms:.4f}"
+            print(f"{base_text + ' ^ ' + exponent_text:>20} {legacy_ms:>12.4f} {engine_ms:>12.4f} "
+                  f"{native_text:>16} {len(result.as_tuple().digits):>8}")
+        
+        # Requests the original computed (or overflowed on) without any estimate
+        for base_text, exponent_text in (("10", "99999999"), ("1.5", "1E+400")):
+            base, exponent = Decimal(base_text), Decimal(exponent_text)
+            start = time.perf_counter()
+            try:
+                engine.compute(base, exponent)
+            except ValueError as e:
+                print(f"{base_text + ' ^ ' + exponent_text:>20} rejected in "
+                      f"{(time.perf_counter() - start) * 1000:.4f} ms: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""
+Micro-benchmark suite for the calculator hot paths, with JSON baselines and regression checks.
+
+Run from the project root:
+    python tests/benchmarks/run_benchmarks.py --save          # record a baseline
+    python tests/benchmarks/run_benchmarks.py                 # compare against it
+    python tests/benchmarks/run_benchmarks.py --threshold 10 --filter math_utils
+
+Each benchmark reports the best time per call over several repeats. When a
+baseline exists, the runner exits with status 1 if any benchmark is slower than
+its baseline by more than --threshold percent. Baselines depend on the machine,
+so the default baseline file is not committed.
+
+The other bench_*.py scripts in this directory compare current implementations
+against the original ones and are run separately.
+"""
+import sys
+import os
+import argparse
+import contextlib
+import json
+import platform
+import re
+import tempfile
+import time
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+from src.lib.expression_parser import ExpressionParser
+from src.lib.logger import CalculatorLogger
+from src.lib.math_utils import MathUtils
+from src.lib.numeric_backend import FloatBackend
+from src.lib.performance_monitor import PerformanceMonitor
+from src.lib.vector_engine import HAS_NUMPY, VectorEngine
+from src.models.calculator import Calculator
+from src.models.history import History
+from src.services.calculator_service import CalculatorService
+from src.services.parameter_sweep import SweepRange, evaluate_chunk
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+Benchmark = Tuple[str, Callable[[], object]]
+
+# Loggers created for the benchmarks, closed when the run ends
+_open_loggers: List[CalculatorLogger] = []
+
+# Console handlers created during the run write here instead of stderr
+_devnull = open(os.devnull, "w")
+
+
+def _operand(digits: int) -> Decimal:
+    """A parsed operand with the given number of integer digits."""
+    return Decimal("7" * digits + ".25")
+
+
+def math_utils_benchmarks() -> List[Benchmark]:
+    """Every MathUtils operation across operand sizes (operands pre-parsed, as on the hot path)."""
+    benchmarks = []
+    for digits in (1, 10, 100, 1000):
+        a = _operand(digits)
+        b = _operand(max(1, digits // 2))
+        for operation in ("add", "subtract", "multiply", "divide", "percentage"):
+            function = getattr(MathUtils, operation)
+            benchmarks.append((f"math_utils.{operation}[{digits}d]", lambda f=function, a=a, b=b: f(a, b)))
+        benchmarks.append((f"math_utils.sqrt[{digits}d]", lambda a=a: MathUtils.sqrt(a)))
+    for exponent in (2, 100, 10_000):
+        benchmarks.append((f"math_utils.power[e{exponent}]",
+                           lambda e=Decimal(exponent): MathUtils.power(Decimal("1.5"), e)))
+    for n in (10, 100, 1_000, 10_000):
+        benchmarks.append((f"math_utils.factorial[{n}]", lambda n=Decimal(n): MathUtils.factorial(n)))
+    return benchmarks
+
+
+def expression_benchmarks() -> List[Benchmark]:
+    """Expression parsing without the parse cache, full evaluation through the Calculator, compiled evaluation and sweeps."""
+    short = "5 + 3"
+    long = "(2 + 3) * sqrt(16) ^ 2 - factorial(5) / (7 % 3 + 1) * -(4 - 1.5)"
+    uncached = ExpressionParser(cache_size=0)
+    calculator = Calculator()
+    formula = "x ^ 2 + 3 * x"
+    compiled = calculator.compile_expression(formula)
+    compiled_float = calculator.compile_expression(formula, backend=FloatBackend())
+    x = Decimal("1.25")
+    values = [Decimal(value) / 7 for value in range(1000)]
+    sweep_ranges = [SweepRange.parse("x=0:1000000:0.5")]
+    return [
+        ("expression.parse[short]", lambda: uncached.parse(short)),
+        ("expression.parse[long]", lambda: uncached.parse(long)),
+        ("expression.calculate[short]", lambda: calculator.calculate_from_expression(short)),
+        ("expression.calculate[long]", lambda: calculator.calculate_from_expression(long)),
+        ("expression.compiled[decimal]", lambda: compiled(x)),
+        ("expression.compiled[float]", lambda: compiled_float(x)),
+        ("expression.compiled.map[decimal,1000]", lambda: compiled.map(values)),
+        ("sweep.chunk[decimal,1000]",
+         lambda: evaluate_chunk(formula, sweep_ranges, calculator.backend, 500_000, 501_000)),
+    ]
+
+
+def history_benchmarks() -> List[Benchmark]:
+    """History.add_item on a full history of different sizes (the steady state, with eviction)."""
+    benchmarks = []
+    item = {"expression": "5 + 3", "result": "8"}
+    for size in (50, 1_000, 100_000):
+        history = History(max_size=size)
+        for _ in range(size):
+            history.add_item(item)
+        benchmarks.append((f"history.add_item[{size}]", lambda h=history: h.add_item(item)))
+    return benchmarks
+
+
+def vector_benchmarks() -> List[Benchmark]:
+    """VectorEngine over 100 000 operand pairs, with NumPy when installed and with the Python loop."""
+    operand1 = [float(value) for value in range(100_000)]
+    operand2 = [float(value % 7) for value in range(100_000)]
+    engines = [VectorEngine(use_numpy=False)]
+    if HAS_NUMPY:
+        engines.append(VectorEngine(use_numpy=True))
+    return [
+        (f"vector.{operation}[{engine.engine},100000]",
+         lambda e=engine, op=operation: e.compute(op, operand1, operand2))
+        for engine in engines
+        for operation in ("multiply", "divide")
+    ]
+
+
+def _quiet_logger(log_file: str, name: str, async_mode: bool = False) -> CalculatorLogger:
+    """A logger whose console handler writes to os.devnull."""
+    with contextlib.redirect_stderr(_devnull):
+        logger = CalculatorLogger(log_file=log_file, name=name, async_mode=async_mode)
+    _open_loggers.append(logger)
+    return logger
+
+
+def logger_benchmarks(directory: str) -> List[Benchmark]:
+    """CalculatorLogger.log_calculation throughput, synchronous and asynchronous."""
+    sync_logger = _quiet_logger(os.path.join(directory, "sync.log"), "benchmark.sync")
+    async_logger = _quiet_logger(os.path.join(directory, "async.log"), "benchmark.async", async_mode=True)
+    return [
+        ("logger.log_calculation[sync]",
+         lambda: sync_logger.log_calculation("add", "5", "3", "8")),
+        ("logger.log_calculation[async]",
+         lambda: async_logger.log_calculation("add", "5", "3", "8")),
+    ]
+
+
+def service_benchmarks(directory: str) -> List[Benchmark]:
+    """Full CalculatorService.calculate round-trips, including validation, timing and logging."""
+    service = _quiet_service(directory, "benchmark.service")
+    cached = _quiet_service(directory, "benchmark.service_cached", cache_size=1024)
+    # Error-heavy batch: division by zero, bad input and negative square roots
+    failing = [("divide", str(value), "0") for value in range(100)] + [("add", "x", "1"), ("sqrt", "-4")] * 50
+    return [
+        ("service.calculate[add]", lambda: service.calculate("add", "5", "3")),
+        ("service.calculate[divide]", lambda: service.calculate("divide", "22", "7")),
+        ("service.calculate[error]", lambda: service.calculate("divide", "1", "0")),
+        ("service.calculate[cached]", lambda: cached.calculate("power", "1.5", "100")),
+        ("service.calculate_from_expression", lambda: service.calculate_from_expression("(2 + 3) * 4")),
+        ("service.calculate_many[errors,200]", lambda: service.calculate_many(failing)),
+        ("service.evaluate_many[errors,200]", lambda: service.evaluate_many(failing)),
+    ]
+
+
+def _quiet_service(directory: str, name: str, **options) -> CalculatorService:
+    with contextlib.redirect_stderr(_devnull):
+        service = CalculatorService(**options)
+    service.logger = _quiet_logger(os.path.join(directory, name + ".log"), name)
+    return service
+
+
+def collect_benchmarks(directory: str) -> List[Benchmark]:
+    """Build every benchmark; loggers write their files into directory."""
+    return (math_utils_benchmarks() + expression_benchmarks() + history_benchmarks()
+            + vector_benchmarks() + logger_benchmarks(directory) + service_benchmarks(directory))
+
+
+def measure(function: Callable[[], object], repeat: int = 5, min_time: float = 0.05) -> float:
+    """
+    Time a callable.
+    
+    The number of calls per repeat grows until one repeat takes at least min_time
+    seconds; the best of repeat runs is reported.
+    
+    Returns:
+        Best time per call in nanoseconds
+    """
+    def run(number: int) -> int:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            function()
+        return time.perf_counter_ns() - start
+    
+    number = 1
+    elapsed = run(number)
+    while elapsed < min_time * 1e9:
+        number *= 2 if elapsed * 10 > min_time * 1e9 else 10
+        elapsed = run(number)
+    best = elapsed
+    for _ in range(repeat - 1):
+        best = min(best, run(number))
+    return best / number
+
+
+def run_benchmarks(pattern: Optional[str] = None, repeat: int = 5, min_time: float = 0.05) -> Dict[str, float]:
+    """
+    Run the benchmarks whose name matches pattern (a regular expression).
+    
+    Returns:
+        {benchmark name: best nanoseconds per call}
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        results = {}
+        for name, function in collect_benchmarks(directory):
+            if pattern and not re.search(pattern, name):
+                continue
+            results[name] = measure(function, repeat, min_time)
+        while _open_loggers:
+            _open_loggers.pop().close()
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[Dict]:
+    """
+    Compare results with a baseline.
+    
+    Args:
+        results: {name: ns per call} from this run
+        baseline: {name: ns per call} from the baseline file
+        threshold: Allowed slowdown in percent
+    
+    Returns:
+        One row per benchmark with name, ns, baseline_ns, change_percent and regressed
+    """
+    rows = []
+    for name, ns in results.items():
+        baseline_ns = baseline.get(name)
+        row = {"name": name, "ns": ns, "baseline_ns": baseline_ns, "change_percent": None, "regressed": False}
+        if baseline_ns:
+            row["change_percent"] = (ns - baseline_ns) / baseline_ns * 100
+            row["regressed"] = not PerformanceMonitor.check_performance_threshold(
+                ns / 1e6, baseline_ns * (1 + threshold / 100) / 1e6
+            )
+        rows.append(row)
+    return rows
+
+
+def load_baseline(path: str) -> Optional[Dict[str, float]]:
+    """Load baseline results, or None if the file does not exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)["results"]
+
+
+def save_baseline(path: str, results: Dict[str, float], existing: Optional[Dict[str, float]] = None):
+    """Write results to a baseline file, keeping existing entries that were not re-run."""
+    merged = dict(existing or {})
+    merged.update(results)
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": {name: round(ns, 1) for name, ns in sorted(merged.items())}
+    }
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(document, baseline_file, indent=2)
+        baseline_file.write("\n")
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.3f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.3f} us"
+    return f"{ns:.1f} ns"
+
+
+def main(args: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Calculator micro-benchmarks")
+    parser.add_argument("--filter", metavar="REGEX", help="Only run benchmarks whose name matches")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=25.0,
+                        help="Allowed slowdown against the baseline, in percent (default: 25)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeats per benchmark; the best is kept (default: 5)")
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="Minimum seconds per repeat (default: 0.05)")
+    parser.add_argument("--json", metavar="FILE", help="Also write this run's results to FILE")
+    parsed_args = parser.parse_args(args)
+    
+    results = run_benchmarks(parsed_args.filter, parsed_args.repeat, parsed_args.min_time)
+    baseline = load_baseline(parsed_args.baseline)
+    rows = compare(results, baseline or {}, parsed_args.threshold)
+    
+    print(f"{'benchmark':<40} {'time/call':>12} {'baseline':>12} {'change':>8}")
+    for row in rows:
+        baseline_text = _format_ns(row["baseline_ns"]) if row["baseline_ns"] else "-"
+        change_text = f"{row['change_percent']:+.1f}%" if row["change_percent"] is not None else "-"
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"{row['name']:<40} {_format_ns(row['ns']):>12} {baseline_text:>12} {change_text:>8}{flag}")
+    
+    if parsed_args.json:
+        save_baseline(parsed_args.json, results)
+    if parsed_args.save:
+        save_baseline(parsed_args.baseline, results, baseline)
+        print(f"Baseline saved to {parsed_args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"No baseline at {parsed_args.baseline}; run with --save to create one")
+        return 0
+    
+    regressions = [row["name"] for row in rows if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {parsed_args.threshold:g}%: "
+              + ", ".join(regressions))
+        return 1
+    print(f"No regressions beyond {parsed_args.threshold:g}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
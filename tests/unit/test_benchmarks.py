@@ -0,0 +1,62 @@
+"""
+Unit tests for the benchmark runner's measurement, baseline and regression logic.
+"""
+import json
+import os
+import tempfile
+from tests.benchmarks import run_benchmarks
+
+
+class TestBenchmarkRunner:
+    """Test the benchmark runner in tests/benchmarks/run_benchmarks.py."""
+    
+    def setup_method(self):
+        """Set up a temporary baseline path."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.baseline = os.path.join(self.directory.name, "baseline.json")
+    
+    def teardown_method(self):
+        """Remove the temporary directory."""
+        self.directory.cleanup()
+    
+    def test_measure_reports_time_per_call(self):
+        """Test that measure returns a positive time per call in nanoseconds."""
+        ns = run_benchmarks.measure(lambda: sum(range(100)), repeat=2, min_time=0.001)
+        assert 0 < ns < 1e9
+    
+    def test_compare_flags_regressions_past_threshold(self):
+        """Test that only slowdowns beyond the threshold are regressions."""
+        rows = run_benchmarks.compare(
+            {"fast": 100.0, "slow": 200.0, "new": 50.0},
+            {"fast": 95.0, "slow": 100.0},
+            threshold=25
+        )
+        by_name = {row["name"]: row for row in rows}
+        assert not by_name["fast"]["regressed"]
+        assert by_name["slow"]["regressed"]
+        assert by_name["slow"]["change_percent"] == 100.0
+        assert by_name["new"]["baseline_ns"] is None
+        assert not by_name["new"]["regressed"]
+    
+    def test_save_then_compare(self, capsys):
+        """Test that a saved baseline is used and a regression makes the runner exit with 1."""
+        args = ["--filter", r"history\.add_item\[50\]", "--baseline", self.baseline,
+                "--repeat", "1", "--min-time", "0.001"]
+        assert run_benchmarks.main(args + ["--save"]) == 0
+        with open(self.baseline, encoding="utf-8") as baseline_file:
+            saved = json.load(baseline_file)
+        assert list(saved["results"]) == ["history.add_item[50]"]
+        
+        # Pretend the baseline was much faster than anything this machine can do
+        saved["results"]["history.add_item[50]"] = 0.001
+        with open(self.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(saved, baseline_file)
+        assert run_benchmarks.main(args) == 1
+        assert "REGRESSION" in capsys.readouterr().out
+    
+    def test_missing_baseline_passes(self, capsys):
+        """Test that running without a baseline reports results and succeeds."""
+        args = ["--filter", r"expression\.parse\[short\]", "--baseline", self.baseline,
+                "--repeat", "1", "--min-time", "0.001"]
+        assert run_benchmarks.main(args) == 0
+        assert "No baseline" in capsys.readouterr().out
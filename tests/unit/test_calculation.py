@@ -0,0 +1,46 @@
+"""
+Unit tests for the Calculation model.
+"""
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from src.models.calculation import Calculation
+
+
+class TestCalculation:
+    """Test the compact Calculation record."""
+    
+    def test_execute_and_expression(self):
+        """Test that results and lazily built expressions are correct."""
+        calculation = Calculation("4.5", "2", "multiply")
+        assert calculation.result == Decimal("9.0")
+        assert calculation.expression == "4.5 * 2"
+        assert str(Calculation("16", None, "sqrt")) == "sqrt(16) = 4"
+    
+    def test_explicit_expression_is_kept(self):
+        """Test that an expression supplied by the caller is used as-is."""
+        assert Calculation("5", "3", "add", expression="5+3").expression == "5+3"
+    
+    def test_ids_are_unique_and_increasing(self):
+        """Test that IDs are process-unique and follow creation order."""
+        ids = [Calculation("1", "1", "add").id for _ in range(100)]
+        assert len(set(ids)) == 100
+        sequence = [int(i.rsplit("-", 1)[1]) for i in ids]
+        assert sequence == sorted(sequence)
+    
+    def test_record_has_no_instance_dict(self):
+        """Test that Calculation uses __slots__."""
+        with pytest.raises(AttributeError):
+            Calculation("1", "1", "add").__dict__
+    
+    def test_to_dict_shape(self):
+        """Test the dictionary representation."""
+        data = Calculation("10", "4", "subtract").to_dict()
+        assert set(data) == {"id", "operand1", "operand2", "operation", "result", "timestamp", "expression"}
+        assert data["result"] == "6"
+        assert isinstance(datetime.fromisoformat(data["timestamp"]), datetime)
+    
+    def test_invalid_operand(self):
+        """Test that invalid operands are rejected with the operand name."""
+        with pytest.raises(ValueError, match="Invalid number format for operand2"):
+            Calculation("1", "x", "add")
@@ -0,0 +1,216 @@
+"""
+Unit tests for the calculator command-line interface.
+"""
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import pytest
+from src.cli.calculator_cli import CalculatorCLI
+
+
+class TestCalculatorCLIVariables:
+    """Test variables in interactive mode."""
+    
+    def setup_method(self):
+        """Set up the CLI for each test."""
+        self.cli = CalculatorCLI(history_file=None)
+    
+    def _run_lines(self, capsys, *lines):
+        capsys.readouterr()
+        for line in lines:
+            self.cli.execute_line(line)
+        return capsys.readouterr().out.splitlines()
+    
+    def test_assignments_and_recomputation(self, capsys):
+        """Test that changing a variable reports the dependents it recomputed."""
+        output = self._run_lines(capsys, "x = 5 * 3", "y = x + 1", "x = 10", "y * 2", "ans / 4")
+        assert output == ["x = 15", "y = 16", "x = 10", "Recomputed 1 dependent: y = 11",
+                          "Result: 22", "Result: 5.5"]
+        assert [item["expression"] for item in self.cli.history.get_items()][-2:] == ["y * 2", "ans / 4"]
+    
+    def test_inspection_commands(self, capsys):
+        """Test the vars, deps, recomputed and del commands."""
+        output = self._run_lines(capsys, "a = 2", "b = a ^ 2", "c = b / 0", "vars", "deps b", "recomputed",
+                                 "del a", "deps a")
+        assert output[3:7] == ["Variables (3):", "  a = 2  [2]", "  b = 4  [a ^ 2]",
+                               "  c: Error: Cannot divide by zero  [b / 0]"]
+        assert output[7:10] == ["b = 4  [a ^ 2]", "  depends on: a", "  used by: c"]
+        assert output[10] == "Recomputed 1 variable: c (error)"
+        assert output[11:13] == ["Removed a", "Recomputed 2 dependents: b (error), c (error)"]
+        assert output[13:] == ["a (not defined)", "  depends on: -", "  used by: b"]
+    
+    def test_plain_expressions_use_service(self, capsys):
+        """Test that expressions without variables still go through the service and set ans."""
+        output = self._run_lines(capsys, "2 + 3", "ans * ans", "nope + 1", "sqrt = 3")
+        assert output == ["Result: 5", "Result: 25", "Error: Undefined variable: nope",
+                          "Error: Reserved name cannot be assigned: sqrt"]
+
+
+class TestCalculatorCLIBatch:
+    """Test streaming batch mode."""
+    
+    def setup_method(self):
+        """Set up the CLI for each test."""
+        self.cli = CalculatorCLI(history_file=None)
+    
+    def _write_input(self, tmp_path, lines):
+        path = tmp_path / "expressions.txt"
+        path.write_text("\n".join(lines) + "\n")
+        return str(path)
+    
+    def test_batch_jsonl_output(self, tmp_path):
+        """Test that every expression produces one JSON line in input order."""
+        source = self._write_input(tmp_path, ["5 + 3", "", "10 / 0", "sqrt(16)"])
+        output, summary_output = io.StringIO(), io.StringIO()
+        
+        summary = self.cli.run_batch(source, "jsonl", output=output, summary_output=summary_output)
+        
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [r["line"] for r in records] == [1, 3, 4]
+        assert records[0]["result"] == "8"
+        assert records[1]["status"] == "error"
+        assert "Cannot divide by zero" in records[1]["error"]
+        assert records[2]["result"] == "4"
+        assert summary["total"] == 3
+        assert summary["failed"] == 1
+        assert "Batch complete: 3 expressions" in summary_output.getvalue()
+    
+    def test_batch_csv_fail_fast(self, tmp_path):
+        """Test CSV output stops after the first error when fail_fast is set."""
+        source = self._write_input(tmp_path, ["2 * 4", "1 / 0", "3 + 3"])
+        output = io.StringIO()
+        
+        summary = self.cli.run_batch(source, "csv", fail_fast=True,
+                                     output=output, summary_output=io.StringIO())
+        
+        lines = output.getvalue().splitlines()
+        assert lines[0] == "line,expression,status,result,error"
+        assert lines[1] == "1,2 * 4,success,8,"
+        assert lines[2].startswith("2,1 / 0,error,,")
+        assert len(lines) == 3
+        assert summary["stopped_early"] is True
+    
+    def test_batch_flag_parsing(self, tmp_path, capsys):
+        """Test that --batch is wired into parse_and_execute."""
+        source = self._write_input(tmp_path, ["1 + 1"])
+        self.cli.parse_and_execute(["--batch", source])
+        captured = capsys.readouterr()
+        assert '"result": "2"' in captured.out
+        assert "Batch complete" in captured.err
+    
+    def test_batch_missing_file(self, tmp_path, capsys):
+        """Test that a missing batch file is reported as an error instead of a traceback."""
+        source = str(tmp_path / "missing.txt")
+        self.cli.parse_and_execute(["--batch", source])
+        assert capsys.readouterr().out == f"Error: Cannot read batch file {source}: No such file or directory\n"
+
+
+class TestCalculatorCLISweep:
+    """Test parameter sweep mode."""
+    
+    def setup_method(self):
+        """Set up the CLI for each test."""
+        self.cli = CalculatorCLI(history_file=None)
+    
+    def test_sweep_csv_fail_fast(self):
+        """Test CSV output of a nested sweep, stopping at the first failing point."""
+        output = io.StringIO()
+        summary = self.cli.run_sweep("x / y", ["x=1:2", "y=-1:1"], "csv", fail_fast=True,
+                                     output=output, summary_output=io.StringIO())
+        assert output.getvalue().splitlines() == ["x,y,status,result,error", "1,-1,success,-1,",
+                                                  "1,0,error,,Error: Cannot divide by zero"]
+        assert summary["total"] == 2
+        assert summary["stopped_early"] is True
+    
+    def test_sweep_flag_parsing(self, capsys):
+        """Test that --expr and --sweep are wired into parse_and_execute."""
+        self.cli.parse_and_execute(["--expr", "x ^ 2 / 4", "--sweep", "x=0:2:0.5", "--workers", "2"])
+        captured = capsys.readouterr()
+        records = [json.loads(line) for line in captured.out.splitlines()]
+        assert [record["values"]["x"] for record in records] == ["0.0", "0.5", "1.0", "1.5", "2.0"]
+        assert [record["result"] for record in records] == ["0", "0.0625", "0.25", "0.5625", "1.00"]
+        assert "Sweep complete: 5 points" in captured.err
+        
+        self.cli.parse_and_execute(["--expr", "x + y", "--sweep", "x=0:1"])
+        assert capsys.readouterr().out == "Error: Undefined variable: y\n"
+
+
+class TestCalculatorCLIHistory:
+    """Test that history persists across CLI instances."""
+    
+    def test_history_survives_restart(self, tmp_path, capsys):
+        """Test that --history shows calculations from a previous run."""
+        history_file = str(tmp_path / "history.jsonl")
+        CalculatorCLI(history_file=history_file).parse_and_execute(["-op", "add", "-o1", "2", "-o2", "3"])
+        capsys.readouterr()
+        
+        CalculatorCLI(history_file=history_file).parse_and_execute(["--history"])
+        output = capsys.readouterr().out
+        assert "Calculation History (last 1 items):" in output
+        assert "2 add 3 = 5" in output
+    
+    def test_columnar_storage(self, capsys):
+        """Test that --history-storage selects the columnar store."""
+        from src.models.columnar_history import ColumnarHistory
+        cli = CalculatorCLI()
+        cli.parse_and_execute(["--history-storage", "columnar", "-op", "multiply", "-o1", "6", "-o2", "7"])
+        assert isinstance(cli.history, ColumnarHistory)
+        assert cli.history.stats_by_operation()["multiply"]["sum"] == 42.0
+        assert "Result: 42" in capsys.readouterr().out
+
+
+class TestCalculatorCLIStartup:
+    """Test that CLI startup only loads what the requested action needs."""
+    
+    CLI_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "src", "cli", "calculator_cli.py")
+    
+    # Allowed cold-start time on top of a bare interpreter start, in milliseconds
+    STARTUP_BUDGET_MS = 250
+    
+    def _run(self, tmp_path, *args, importtime=False):
+        command = [sys.executable] + (["-X", "importtime"] if importtime else []) + [self.CLI_PATH, *args]
+        return subprocess.run(command, cwd=tmp_path, capture_output=True, text=True, timeout=60)
+    
+    def _imported_modules(self, tmp_path, *args):
+        stderr = self._run(tmp_path, *args, importtime=True).stderr
+        return {line.rsplit("|", 1)[1].strip() for line in stderr.splitlines() if line.startswith("import time:")}
+    
+    def _best_time_ms(self, command, cwd, runs=3):
+        best = float("inf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, cwd=cwd, capture_output=True, timeout=60)
+            best = min(best, (time.perf_counter() - start) * 1000)
+        return best
+    
+    def test_single_expression_argument(self, tmp_path):
+        """Test that a single positional expression is evaluated, including a leading minus."""
+        result = self._run(tmp_path, "5 + 3")
+        assert result.stdout.strip() == "Result: 8"
+        assert self._run(tmp_path, "-5 + 3").stdout.strip() == "Result: -2"
+    
+    def test_help_imports_no_service_stack(self, tmp_path):
+        """Test that --help neither imports the service stack nor creates the log file."""
+        modules = self._imported_modules(tmp_path, "--help")
+        assert "argparse" in modules
+        assert "src.services.calculator_service" not in modules
+        assert "logging" not in modules
+        assert not (tmp_path / "calculator.log").exists()
+    
+    def test_expression_skips_argparse_and_process_pool(self, tmp_path):
+        """Test that evaluating an expression imports neither argparse nor multiprocessing."""
+        modules = self._imported_modules(tmp_path, "2 * 3")
+        assert "src.services.calculator_service" in modules
+        assert "argparse" not in modules
+        assert "multiprocessing" not in modules
+        assert "concurrent.futures" not in modules
+    
+    def test_cold_start_within_budget(self, tmp_path):
+        """Test that a cold CLI start stays within the budget over a bare interpreter start."""
+        bare = self._best_time_ms([sys.executable, "-c", "pass"], tmp_path)
+        for args in (["--help"], ["5 + 3"]):
+            elapsed = self._best_time_ms([sys.executable, self.CLI_PATH, *args], tmp_path)
+            assert elapsed - bare <= self.STARTUP_BUDGET_MS, f"{args}: {elapsed:.0f} ms (bare interpreter {bare:.0f} ms)"
@@ -0,0 +1,197 @@
+"""
+Unit tests for the asyncio JSON calculator server, its client and the load generator.
+"""
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from src.cli.calculator_client import CalculatorClient
+from src.cli.load_test import run_load
+from src.models.history import create_history
+from src.services.calculator_server import CalculatorServer
+from src.services.calculator_service import CalculatorService
+from src.services.process_pool import ProcessPoolRunner
+
+
+async def _exchange(server: CalculatorServer, requests: list) -> list:
+    """Pipeline raw request lines to a started server and read one response per line."""
+    host, port = server.address[:2]
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+    writer.write(b"".join(
+        (request if isinstance(request, bytes) else json.dumps(request).encode()) + b"\n"
+        for request in requests
+    ))
+    await writer.drain()
+    responses = [json.loads(await reader.readline()) for _ in requests]
+    writer.close()
+    return responses
+
+
+def _run_with_server(scenario, **options):
+    """Start a server on a free port, run an async scenario against it and close it."""
+    async def main():
+        server = CalculatorServer(service=options.pop("service", CalculatorService()), **options)
+        await server.start(port=0)
+        try:
+            return await scenario(server)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+class TestCalculatorServer:
+    """Test the CalculatorServer request handling."""
+    
+    def test_pipelined_responses_keep_request_order(self):
+        """Test that pipelined requests are answered in order with matching ids."""
+        requests = [
+            {"id": index, "method": "calculate", "params": {"operation": "add", "operand1": str(index), "operand2": "1"}}
+            for index in range(200)
+        ]
+        responses = _run_with_server(lambda server: _exchange(server, requests), max_pending=4)
+        assert [response["id"] for response in responses] == list(range(200))
+        assert [response["result"] for response in responses] == [str(index + 1) for index in range(200)]
+    
+    def test_expression_and_history(self):
+        """Test expression evaluation and that successful results are queryable as history."""
+        requests = [
+            {"id": 1, "method": "calculate_from_expression", "params": {"expression": "(2 + 3) * 4"}},
+            {"id": 2, "method": "calculate", "params": {"operation": "divide", "operand1": 1, "operand2": 0}},
+            {"id": 3, "method": "calculate", "params": {"operation": "sqrt", "operand1": "16"}},
+            {"id": 4, "method": "history", "params": {"offset": 0, "limit": 10}},
+            {"id": 5, "method": "clear_history"},
+            {"id": 6, "method": "history"},
+        ]
+        responses = _run_with_server(lambda server: _exchange(server, requests))
+        assert responses[0] == {"id": 1, "result": "20", "status": "success", "backend": "decimal"}
+        assert responses[1]["status"] == "error"
+        assert responses[1]["error"] == "Error: Cannot divide by zero"
+        assert responses[3]["size"] == 2
+        assert responses[3]["items"] == [
+            {"expression": "(2 + 3) * 4", "result": "20"},
+            {"expression": "16 sqrt", "result": "4", "operation": "sqrt", "operand1": "16", "operand2": None},
+        ]
+        assert responses[5]["size"] == 0
+    
+    def test_columnar_history_aggregates_by_operation(self):
+        """Test that calculate requests are recorded with their operation for columnar history."""
+        history = create_history("columnar")
+        requests = [
+            {"id": 1, "method": "calculate", "params": {"operation": "add", "operand1": "2", "operand2": "3"}},
+            {"id": 2, "method": "calculate", "params": {"operation": "multiply", "operand1": "4", "operand2": "5"}},
+            {"id": 3, "method": "calculate", "params": {"operation": "add", "operand1": "1", "operand2": "4"}},
+            {"id": 4, "method": "calculate_from_expression", "params": {"expression": "2 * 3"}},
+        ]
+        _run_with_server(lambda server: _exchange(server, requests), history=history)
+        stats = history.stats_by_operation()
+        assert stats["add"] == {"count": 2, "errors": 0, "error_rate": 0.0, "sum": 10.0, "mean": 5.0}
+        assert stats["multiply"]["sum"] == 20.0
+        assert stats["expression"]["count"] == 1
+    
+    def test_invalid_requests(self):
+        """Test that malformed requests get error responses without closing the connection."""
+        requests = [
+            b"not json",
+            {"id": 1, "method": "unknown"},
+            {"id": 2, "method": "calculate", "params": {"operand1": "1"}},
+            {"id": 3, "method": "calculate", "params": {"operation": "add", "operand1": "1", "operand2": "2"}},
+        ]
+        responses = _run_with_server(lambda server: _exchange(server, requests))
+        assert responses[0]["id"] is None
+        assert responses[0]["error"].startswith("Error: Invalid request")
+        assert responses[1]["error"] == "Error: Unknown method: unknown"
+        assert responses[2]["error"] == "Error: Missing parameter: operation"
+        assert responses[3]["result"] == "3"
+    
+    def test_concurrent_clients(self):
+        """Test that many connections are served concurrently."""
+        async def scenario(server):
+            return await asyncio.gather(*(
+                _exchange(server, [{"id": client, "method": "calculate_from_expression",
+                                    "params": {"expression": f"{client} * 2"}}])
+                for client in range(20)
+            ))
+        results = _run_with_server(scenario)
+        assert [responses[0]["result"] for responses in results] == [str(client * 2) for client in range(20)]
+    
+    def test_heavy_operation_does_not_block_loop(self):
+        """Test that an offloaded factorial does not hold up a cheap request on another connection."""
+        runner = ProcessPoolRunner(max_workers=1, cost_threshold=1000)
+        
+        async def scenario(server):
+            runner.warm_up()
+            heavy = asyncio.ensure_future(_exchange(server, [
+                {"id": 1, "method": "calculate", "params": {"operation": "factorial", "operand1": "60000"}}
+            ]))
+            await asyncio.sleep(0.01)
+            cheap = await _exchange(server, [{"id": 2, "method": "calculate_from_expression",
+                                              "params": {"expression": "1 + 1"}}])
+            finished_first = not heavy.done()
+            return cheap, await heavy, finished_first
+        
+        cheap, heavy, finished_first = _run_with_server(scenario, service=CalculatorService(process_pool=runner))
+        assert cheap[0]["result"] == "2"
+        assert heavy[0]["status"] == "success"
+        assert len(heavy[0]["result"]) > 250_000
+        assert finished_first
+    
+    def test_unix_socket(self):
+        """Test serving over a Unix socket."""
+        async def main(path):
+            server = CalculatorServer(service=CalculatorService())
+            await server.start(path=path)
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+                writer.write(b'{"id": 7, "method": "calculate_from_expression", "params": {"expression": "2 ^ 10"}}\n')
+                response = json.loads(await reader.readline())
+                writer.close()
+                return response
+            finally:
+                await server.close()
+        
+        with tempfile.TemporaryDirectory() as directory:
+            response = asyncio.run(main(os.path.join(directory, "calculator.sock")))
+        assert response == {"id": 7, "result": "1024", "status": "success", "backend": "decimal"}
+
+
+class TestCalculatorClient:
+    """Test the blocking client and the load generator against a server in a background thread."""
+    
+    def setup_method(self):
+        """Start a server on a free port in a background event loop."""
+        self.loop = asyncio.new_event_loop()
+        self.server = CalculatorServer(service=CalculatorService())
+        self.loop.run_until_complete(self.server.start(port=0))
+        self.port = self.server.address[1]
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+    
+    def teardown_method(self):
+        """Stop the background server."""
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+    
+    def test_client_calls(self):
+        """Test single calls and pipelining through the client."""
+        with CalculatorClient(port=self.port, timeout=10) as client:
+            assert client.calculate("multiply", "6", "7")["result"] == "42"
+            assert client.calculate_from_expression("sqrt(81)")["result"] == "9"
+            responses = client.pipeline(
+                (("calculate", {"operation": "power", "operand1": "2", "operand2": str(n)}) for n in range(30)),
+                window=16
+            )
+            assert [response["result"] for response in responses] == [str(2 ** n) for n in range(30)]
+            assert client.history(limit=1)["items"] == [
+                {"expression": "6 multiply 7", "result": "42", "operation": "multiply", "operand1": "6", "operand2": "7"}
+            ]
+    
+    def test_load_generator(self):
+        """Test that the load generator reports throughput and latency."""
+        summary = asyncio.run(run_load(port=self.port, connections=3, requests=50, pipeline=8))
+        assert summary["requests"] == 150
+        assert summary["errors"] == 0
+        assert summary["requests_per_second"] > 0
+        assert summary["latency_ms"]["p50_ms"] <= summary["latency_ms"]["max_ms"]
@@ -76,4 +76,54 @@ class TestCalculatorServiceBasicOperations:
         """Test expression calculation: '10 / 2' -> 5"""
         result = self.service.calculate_from_expression("10 / 2")
         assert result["status"] == "success"
-        assert result["result"] == "5"
\ No newline at end of file
+        assert result["result"] == "5"
+
+class TestCalculatorServiceBatch:
+    """Test batch evaluation through calculate_many."""
+    
+    def setup_method(self):
+        """Set up calculator service for each test."""
+        self.service = CalculatorService()
+    
+    def test_batch_matches_single_calls(self):
+        """Test that batch results are identical to individual calculate() calls."""
+        items = [
+            ("add", "5", "3"),
+            ("divide", "10", "4"),
+            ("sqrt", "16"),
+            ("add", "1.5", "2.25"),
+            ("factorial", "5"),
+            ("percentage", "20", "150"),
+        ]
+        results = self.service.calculate_many(items)
+        assert results == [self.service.calculate(*item) for item in items]
+    
+    def test_batch_preserves_order_with_error_slots(self):
+        """Test that errors occupy their own slot without affecting other items."""
+        results = self.service.calculate_many([
+            ("divide", "10", "0"),
+            ("add", "2", "2"),
+            ("invalid_op", "1", "1"),
+            ("add", "5", "abc"),
+            ("subtract", "5"),
+        ])
+        assert results[0]["status"] == "error"
+        assert "Cannot divide by zero" in results[0]["error"]
+        assert results[1] == {"result": "4", "status": "success", "backend": "decimal"}
+        assert "Invalid operation" in results[2]["error"]
+        assert "Invalid number format" in results[3]["error"]
+        assert "requires two operands" in results[4]["error"]
+    
+    def test_batch_accepts_dict_items(self):
+        """Test that request-shaped dictionaries are accepted."""
+        results = self.service.calculate_many([
+            {"operation": "multiply", "operand1": "4", "operand2": "5"},
+            {"operation": "sqrt", "operand1": "9"},
+        ])
+        assert [r["result"] for r in results] == ["20", "3"]
+    
+    def test_batch_malformed_item(self):
+        """Test that malformed items produce an error slot."""
+        results = self.service.calculate_many([("add",)])
+        assert results[0]["status"] == "error"
+        assert "Invalid batch item" in results[0]["error"]
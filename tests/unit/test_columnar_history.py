@@ -0,0 +1,93 @@
+"""
+Unit tests for the columnar history model and its aggregate queries.
+"""
+import pytest
+from datetime import datetime, timedelta
+from src.lib.operation_registry import REGISTRY, register_operation
+from src.models.columnar_history import ColumnarHistory
+from src.models.history import History, create_history
+
+
+class TestColumnarHistory:
+    """Test columnar storage and aggregates."""
+    
+    def setup_method(self):
+        """Populate a history with a mix of operations and failures."""
+        self.history = ColumnarHistory(max_size=100)
+        self.history.add_calculation("add", "5", "3", "8", "5 + 3")
+        self.history.add_calculation("add", "1", "1", "2", "1 + 1")
+        self.history.add_calculation("divide", "1", "0", "Error: Cannot divide by zero", "1 / 0", success=False)
+        self.history.add_calculation("divide", "10", "4", "2.5", "10 / 4")
+        self.history.add_item({"expression": "sqrt(16)", "result": "4"})
+    
+    def test_items_keep_history_shape(self):
+        """Test that entries are rendered as History dictionaries on demand."""
+        assert self.history.get_item(0) == {"expression": "5 + 3", "result": "8"}
+        assert self.history.get_item(2) == {"expression": "1 / 0", "error": "Error: Cannot divide by zero"}
+        assert self.history.get_items()[-1] == {"expression": "sqrt(16)", "result": "4"}
+        assert self.history.to_dict()["total_count"] == 5
+        assert set(self.history.to_dict()) == set(History().to_dict())
+    
+    def test_aggregates(self):
+        """Test count, sum, mean and error rate queries."""
+        assert self.history.count() == 5
+        assert self.history.count("add") == 2
+        assert self.history.sum_results("add") == 10.0
+        assert self.history.mean_result("divide") == 2.5
+        assert self.history.error_rate("divide") == 0.5
+        assert self.history.error_rate() == pytest.approx(0.2)
+        assert self.history.mean_result("factorial") is None
+    
+    def test_stats_by_operation(self):
+        """Test per-operation statistics in one pass."""
+        stats = self.history.stats_by_operation()
+        assert stats["add"] == {"count": 2, "errors": 0, "error_rate": 0.0, "sum": 10.0, "mean": 5.0}
+        assert stats["divide"]["errors"] == 1
+        assert stats["expression"]["count"] == 1
+    
+    def test_time_window(self):
+        """Test filtering by timestamp."""
+        history = ColumnarHistory()
+        now = datetime.now()
+        history.add_calculation("add", "1", "1", "2", "1 + 1", timestamp=now - timedelta(hours=2))
+        history.add_calculation("add", "2", "2", "4", "2 + 2", timestamp=now)
+        assert history.count(since=now - timedelta(hours=1)) == 1
+        assert history.sum_results(until=now - timedelta(hours=1)) == 2.0
+    
+    def test_ring_buffer_eviction(self):
+        """Test that the oldest entries are evicted once full."""
+        history = ColumnarHistory(max_size=3)
+        for i in range(5):
+            history.add_calculation("add", str(i), "0", str(i), f"{i} + 0")
+        assert [item["result"] for item in history.get_items()] == ["2", "3", "4"]
+        assert history.sum_results() == 9.0
+        history.max_size = 2
+        assert [item["result"] for item in history.get_items()] == ["3", "4"]
+        history.add_calculation("add", "5", "0", "5", "5 + 0")
+        assert [item["result"] for item in history.get_items()] == ["4", "5"]
+    
+    def test_plugin_operations_have_their_own_code(self):
+        """Test that operations registered as plugins are aggregated under their own name."""
+        register_operation("cube", lambda a: a ** 3, arity=1)
+        try:
+            self.history.add_calculation("cube", "2", None, "8", "cube(2)")
+            self.history.add_calculation("unknown", "2", None, "8", "unknown(2)")
+            stats = self.history.stats_by_operation()
+            assert stats["cube"]["count"] == 1
+            assert stats["expression"]["count"] == 2
+            assert self.history.count("cube") == 1
+        finally:
+            REGISTRY.unregister("cube")
+    
+    def test_create_history(self, tmp_path):
+        """Test that the history factory selects the storage mode."""
+        assert isinstance(create_history("memory"), History)
+        assert isinstance(create_history("columnar", max_size=10), ColumnarHistory)
+        stored = create_history("file", path=str(tmp_path / "h.jsonl"))
+        stored.add_item({"expression": "1 + 1", "result": "2"})
+        assert stored.size() == 1
+        stored.close()
+        with pytest.raises(ValueError, match="requires a path"):
+            create_history("file")
+        with pytest.raises(ValueError, match="Unknown history storage"):
+            create_history("tape")
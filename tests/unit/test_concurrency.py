@@ -0,0 +1,161 @@
+"""
+Stress tests for calling the calculator service from many threads.
+"""
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, localcontext
+import pytest
+from src.lib.metrics import MetricsRegistry
+from src.lib.result_cache import ResultCache
+from src.models.history import History
+from src.services.calculator_service import CalculatorService
+
+
+THREADS = 16
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    """Switch threads every few bytecodes so races show up quickly."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _run_threads(target, count: int = THREADS):
+    """Run target(index) in count threads started together, re-raising the first failure."""
+    barrier = threading.Barrier(count)
+    errors = []
+    
+    def run(index):
+        barrier.wait()
+        try:
+            target(index)
+        except BaseException as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+class TestConcurrentService:
+    """Test that one CalculatorService gives correct results under many threads."""
+    
+    def setup_method(self):
+        """Set up a shared service with caching enabled."""
+        self.service = CalculatorService(cache_size=64, max_workers=8)
+    
+    def teardown_method(self):
+        """Shut down the service's executor."""
+        self.service.shutdown()
+    
+    def test_per_thread_precision(self):
+        """Test that threads using different precisions never see each other's context."""
+        def work(index):
+            precision = 5 + index
+            with localcontext() as context:
+                # Changing a thread's own context must not affect the service either
+                context.prec = 2
+                for value in range(1, 40):
+                    response = self.service.calculate("divide", str(value), "7", precision=precision)
+                    assert response["result"] == str(self._divide(value, 7, precision))
+                    assert self.service.calculate_from_expression(f"{value} / 3")["result"] == \
+                        str(self._divide(value, 3, 10))
+        
+        _run_threads(work)
+    
+    @staticmethod
+    def _divide(a, b, precision):
+        """Divide with the given precision in a local context."""
+        with localcontext() as context:
+            context.prec = precision
+            return Decimal(a) / Decimal(b)
+    
+    def test_shared_caches(self):
+        """Test that the result and parse caches stay consistent when shared."""
+        def work(index):
+            for value in range(200):
+                operand = str(value % 100)
+                assert self.service.calculate("multiply", operand, "3")["result"] == str(int(operand) * 3)
+                expression = f"{value % 300} + {index}"
+                assert self.service.calculate_from_expression(expression)["result"] == str(value % 300 + index)
+        
+        _run_threads(work)
+        stats = self.service.get_cache_stats()
+        assert stats["hits"] + stats["misses"] == THREADS * 200
+        assert stats["size"] <= 64
+    
+    def test_submit_and_map(self):
+        """Test that submit() and map() return correct results in input order."""
+        futures = [self.service.submit("add", str(value), "1") for value in range(200)]
+        assert [future.result()["result"] for future in futures] == [str(value + 1) for value in range(200)]
+        
+        items = [("power", "2", str(value)) for value in range(100)] + [("bogus",)]
+        results = list(self.service.map(items))
+        assert [result["result"] for result in results[:100]] == [str(2 ** value) for value in range(100)]
+        assert results[-1] == {"error": "Error: Invalid batch item: ('bogus',)", "status": "error"}
+        assert self.service.submit_expression("sqrt(16) * 2").result()["result"] == "8"
+    
+    def test_external_executor(self):
+        """Test that a supplied executor is used and not shut down by the service."""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            service = CalculatorService(executor=executor)
+            assert service.submit("subtract", "10", "4").result()["result"] == "6"
+            service.shutdown()
+            assert service.executor is executor
+            assert service.submit("subtract", "10", "5").result()["result"] == "5"
+
+
+class TestConcurrentRecording:
+    """Test that metrics, caches and history do not lose updates under many threads."""
+    
+    def test_metrics_count_every_sample(self):
+        """Test that per-thread histograms merge to the exact number of samples."""
+        registry = MetricsRegistry()
+        
+        def work(index):
+            for sample in range(1, 2001):
+                registry.record("op", sample * 1000)
+        
+        _run_threads(work)
+        histogram = registry.histogram("op")
+        assert histogram.count == THREADS * 2000
+        assert sum(histogram.counts) == THREADS * 2000
+        assert histogram.sum_ns == THREADS * sum(range(1, 2001)) * 1000
+        # Shards of finished threads are folded into one
+        assert len(registry._shards) == 1
+    
+    def test_result_cache_statistics(self):
+        """Test that cache statistics add up when threads hit and evict concurrently."""
+        cache = ResultCache(max_entries=32)
+        
+        def work(index):
+            for value in range(500):
+                key = cache.make_key("add", value % 64, index % 4)
+                assert cache.get_or_compute(key, lambda: value % 64 + index % 4) == value % 64 + index % 4
+        
+        _run_threads(work)
+        stats = cache.stats()
+        assert stats["hits"] + stats["misses"] == THREADS * 500
+        assert stats["size"] == 32
+        # Two threads missing on the same key both store it; the second store replaces, not evicts
+        assert stats["evictions"] <= stats["misses"] - 32
+    
+    def test_history_keeps_every_item(self):
+        """Test that concurrent add_item calls are neither lost nor duplicated."""
+        history = History(max_size=THREADS * 300)
+        
+        def work(index):
+            for value in range(300):
+                history.add_item({"expression": f"{index}:{value}", "result": "0"})
+        
+        _run_threads(work)
+        expressions = [item["expression"] for item in history.get_items()]
+        assert len(expressions) == len(set(expressions)) == THREADS * 300
@@ -0,0 +1,109 @@
+"""
+Unit tests for error codes, message rendering and the non-raising evaluation path.
+"""
+from decimal import Decimal
+import pytest
+from src.lib import error_handler
+from src.lib.error_handler import (OK, DIVISION_BY_ZERO, FACTORIAL_TOO_LARGE, INVALID_ARGUMENT, INVALID_INPUT,
+                                   INVALID_OPERATION, MISSING_OPERAND, NEGATIVE_FACTORIAL, NEGATIVE_SQRT,
+                                   UNDEFINED, UNEXPECTED, CalculatorError, ErrorHandler)
+from src.lib.numeric_backend import FloatBackend
+from src.models.calculator import Calculator
+from src.services.calculator_service import CalculatorService
+
+
+class TestErrorCodes:
+    """Test that errors carry codes and render the same messages as before."""
+    
+    def test_raised_errors_carry_codes(self):
+        """Test that calculator exceptions are ValueErrors with a code."""
+        calculator = Calculator()
+        cases = [
+            (("divide", "1", "0"), DIVISION_BY_ZERO),
+            (("sqrt", "-4"), NEGATIVE_SQRT),
+            (("factorial", "-3"), NEGATIVE_FACTORIAL),
+            (("factorial", "100000000"), FACTORIAL_TOO_LARGE),
+            (("power", "-8", "0.5"), UNDEFINED),
+            (("add", "x", "1"), INVALID_INPUT),
+            (("bogus", "1", "1"), INVALID_OPERATION),
+            (("add", "1"), MISSING_OPERAND),
+        ]
+        for arguments, code in cases:
+            with pytest.raises(ValueError) as raised:
+                calculator.calculate(*arguments)
+            assert isinstance(raised.value, CalculatorError)
+            assert ErrorHandler.classify(raised.value) == code
+    
+    def test_classify_untyped_errors(self):
+        """Test that errors without a code are classified by their message."""
+        assert ErrorHandler.classify(ValueError("Division by zero is not allowed")) == DIVISION_BY_ZERO
+        assert ErrorHandler.classify(ValueError("Something else")) == INVALID_ARGUMENT
+        assert ErrorHandler.classify(TypeError("bad type")) == UNEXPECTED
+        assert ErrorHandler.handle_error(TypeError("bad type")) == "Unexpected error: bad type"
+    
+    def test_render(self):
+        """Test messages rendered from a code and a detail."""
+        assert ErrorHandler.render(DIVISION_BY_ZERO) == "Error: Cannot divide by zero"
+        assert ErrorHandler.render(INVALID_INPUT, "abc") == "Error: Invalid number format: abc"
+        assert ErrorHandler.render(INVALID_OPERATION, "bogus") == "Error: Invalid operation: bogus"
+        assert ErrorHandler.render(MISSING_OPERAND, "add") == "Error: Operation 'add' requires two operands"
+        assert ErrorHandler.render(UNDEFINED) == "Error: Result is undefined"
+        assert ErrorHandler.render(INVALID_ARGUMENT, ValueError("Bad value")) == "Error: Bad value"
+        # Codes are distinct
+        codes = [value for name, value in vars(error_handler).items() if name.isupper() and not name.startswith("_")]
+        assert len(codes) == len(set(codes))
+
+
+class TestNonRaisingEvaluation:
+    """Test Calculator.evaluate and CalculatorService.evaluate_many."""
+    
+    def setup_method(self):
+        """Set up a calculator and a service for each test."""
+        self.calculator = Calculator()
+        self.service = CalculatorService()
+    
+    def test_evaluate_matches_calculate(self):
+        """Test that evaluate returns calculate()'s result, or the code and message it would raise."""
+        cases = [("divide", "10", "4"), ("divide", "1", "0"), ("power", "0", "-2"), ("sqrt", "-1"),
+                 ("factorial", "-0.5"), ("factorial", "-1.5"), ("add", "1", "1e5"), ("multiply", None, "1"),
+                 ("percentage", "50"), ("nope", "1", "2"), ("power", "-8", "0.5")]
+        for arguments in cases:
+            value, code = self.calculator.evaluate(*arguments)
+            try:
+                expected = self.calculator.calculate(*arguments)
+            except ValueError as e:
+                assert code == ErrorHandler.classify(e)
+                assert ErrorHandler.render(code, value) == ErrorHandler.handle_error(e)
+            else:
+                assert (value, code) == (expected, OK)
+    
+    def test_evaluate_float_backend(self):
+        """Test that the checks also apply to float operands."""
+        backend = FloatBackend()
+        assert self.calculator.evaluate("divide", "1", "4", backend) == (0.25, OK)
+        assert self.calculator.evaluate("divide", "1", "0", backend) == (None, DIVISION_BY_ZERO)
+        assert self.calculator.evaluate("power", "0", "-1", backend) == (None, DIVISION_BY_ZERO)
+    
+    def test_evaluate_many(self):
+        """Test that evaluate_many returns raw values and codes in input order."""
+        results = self.service.evaluate_many([
+            ("add", "2", "2"),
+            ("divide", "1", "0"),
+            ("add",),
+            ("add", "x", "1"),
+            {"operation": "sqrt", "operand1": "9"},
+        ])
+        assert results[0] == (Decimal("4"), OK)
+        assert results[1] == (None, DIVISION_BY_ZERO)
+        assert results[2][1] == INVALID_ARGUMENT
+        assert results[3] == ("x", INVALID_INPUT)
+        assert results[4] == (Decimal("3"), OK)
+        assert ErrorHandler.render(*reversed(results[2])) == "Error: Invalid batch item: ('add',)"
+    
+    def test_unhashable_operation(self):
+        """Test that an operation that is not a string fails its own item, not the whole batch."""
+        results = self.service.evaluate_many([(["add"], "1", "2"), ("add", "1", "2")])
+        assert results == [(["add"], INVALID_OPERATION), (Decimal("3"), OK)]
+        batch = self.service.calculate_many([({"op": "add"}, "1", "2")])
+        assert batch[0]["error"] == "Error: Invalid operation: {'op': 'add'}"
+        assert self.service.calculate(["add"], "1", "2")["error"] == "Error: Invalid operation: ['add']"
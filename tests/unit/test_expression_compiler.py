@@ -0,0 +1,100 @@
+"""
+Unit tests for compiling expressions with variables into closures.
+"""
+import re
+from decimal import Decimal
+import pytest
+from src.lib.expression_compiler import compile_expression
+from src.lib.expression_parser import ExpressionParser, substitute
+from src.lib.numeric_backend import DecimalBackend, FloatBackend
+from src.lib.operation_registry import REGISTRY, register_operation
+from src.models.calculator import Calculator
+
+
+EXPRESSIONS = [
+    "x ^ 2 + 3 * x",
+    "-(x - y) / 4 + sqrt(x * x) - y % 50",
+    "factorial(3) * x ^ 0.5 - 2 ^ 10",
+    "(x + 1) / (y - 2)",
+    "-x ^ 2",
+]
+
+
+class TestExpressionCompiler:
+    """Test that compiled expressions match tree evaluation on both backends."""
+    
+    @staticmethod
+    def _reference(expression, backend, x, y):
+        """Evaluate by substituting the values into the parsed tree."""
+        node = ExpressionParser(allow_variables=True).parse(expression)
+        return backend.evaluate(substitute(node, {"x": Decimal(x), "y": Decimal(y)}))
+    
+    @pytest.mark.parametrize("backend", [DecimalBackend(), DecimalBackend(30), FloatBackend()],
+                             ids=["decimal", "decimal30", "float"])
+    def test_matches_tree_evaluation(self, backend):
+        """Test results and errors against the interpreted tree for many bindings."""
+        values = ["0", "2", "-3.5", "7", "1234.5678", "0.001"]
+        for expression in EXPRESSIONS:
+            compiled = compile_expression(expression, backend=backend, variables=("x", "y"))
+            for x in values:
+                for y in values:
+                    try:
+                        expected = self._reference(expression, backend, x, y)
+                    except ValueError as e:
+                        with pytest.raises(ValueError, match=re.escape(str(e))):
+                            compiled(x, y)
+                    else:
+                        assert compiled(x, y) == expected, (expression, x, y)
+    
+    def test_bindings(self):
+        """Test positional, named and bulk bindings."""
+        compiled = compile_expression("x ^ 2 + 3 * x")
+        assert compiled.variables == ("x",)
+        assert compiled(4) == compiled(x=Decimal(4)) == compiled("4") == 28
+        assert compiled(0.5) == Decimal("1.75")
+        assert compiled.map([1, 2, Decimal("0.5")]) == [4, 10, Decimal("1.75")]
+        
+        pair = compile_expression("a - b", variables=("b", "a"))
+        assert pair(1, 10) == 9
+        assert pair.map([(1, 10), {"a": 5, "b": 2}]) == [9, 3]
+        with pytest.raises(ValueError, match="Undefined variable: a"):
+            pair(b=1)
+        with pytest.raises(ValueError, match="Expected 2 variable values"):
+            pair(1)
+        with pytest.raises(ValueError, match="Invalid number format: abc"):
+            pair("abc", 1)
+        with pytest.raises(ValueError, match="Undefined variable: z"):
+            compile_expression("x + z", variables=("x",))
+        with pytest.raises(TypeError):
+            compile_expression("x + y", ("y", "x"))
+        with pytest.raises(TypeError):
+            Calculator().compile_expression("x + y", ("y", "x"))
+    
+    def test_constant_folding(self):
+        """Test that constant sub-expressions are computed once, and failures at evaluation."""
+        assert compile_expression("2 ^ 10 + sqrt(16)").constant
+        assert compile_expression("2 ^ 10 + sqrt(16)")() == 1028
+        assert not compile_expression("x * (2 + 3)").constant
+        failing = compile_expression("x + 1 / 0")
+        with pytest.raises(ValueError, match="Division by zero"):
+            failing(1)
+    
+    def test_precision_and_float_range(self):
+        """Test that Decimal results use the backend precision and floats are range checked."""
+        assert compile_expression("x / 3", backend=DecimalBackend(5))(1) == Decimal("0.33333")
+        assert compile_expression("x ^ 2", backend=DecimalBackend(5))(Decimal("1.23456")) == Decimal("1.5241383936")
+        overflow = compile_expression("x * x", backend=FloatBackend())
+        with pytest.raises(ValueError, match="out of range"):
+            overflow(1e200)
+        with pytest.raises(ValueError, match="Power is undefined"):
+            compile_expression("x ^ 0.5", backend=FloatBackend())(-8)
+    
+    def test_registered_operations(self):
+        """Test that plugin operations compile, including ones without a float implementation."""
+        register_operation("modulo", lambda a, b: a % b, symbols=("mod",))
+        try:
+            calculator = Calculator()
+            assert calculator.compile_expression("x mod 4")(10) == 2
+            assert calculator.compile_expression("x mod 4", backend=FloatBackend())(10) == 2.0
+        finally:
+            REGISTRY.unregister("modulo")
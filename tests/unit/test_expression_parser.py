@@ -0,0 +1,95 @@
+"""
+Unit tests for the expression parser and expression evaluation.
+"""
+import pytest
+from decimal import Decimal
+from src.lib.expression_parser import ExpressionParser, substitute, variable_names
+from src.lib.numeric_backend import DecimalBackend
+from src.models.calculator import Calculator
+
+
+class TestExpressionEvaluation:
+    """Test precedence, parentheses and functions in expressions."""
+    
+    def setup_method(self):
+        """Set up calculator for each test."""
+        self.calculator = Calculator()
+    
+    @pytest.mark.parametrize("expression, expected", [
+        ("5 + 3", "8"),
+        ("2 + 3 * 4", "14"),
+        ("(2 + 3) * 4", "20"),
+        ("(2 + 3) * sqrt(16) ^ 2", "80"),
+        ("2 ^ 3 ^ 2", "512"),
+        ("2 ** 10", "1024"),
+        ("-2 ^ 2", "-4"),
+        ("5 - -3", "8"),
+        ("20 % 100", "20"),
+        ("factorial(5) / 4", "30"),
+        ("sqrt(sqrt(16))", "2"),
+        ("  10   /   2 ", "5"),
+    ])
+    def test_expressions(self, expression, expected):
+        """Test that expressions follow standard precedence rules."""
+        assert self.calculator.calculate_from_expression(expression) == Decimal(expected)
+    
+    @pytest.mark.parametrize("expression, message", [
+        ("10 / 0", "Division by zero is not allowed"),
+        ("sqrt(-4)", "Square root of negative number is not allowed"),
+        ("foo(3)", "Unsupported unary operation: foo"),
+        ("5 $ 3", "Unsupported operator: \\$"),
+        ("5 3", "Invalid expression format"),
+        ("(1 + 2", "Invalid expression format"),
+        ("", "Invalid expression format"),
+    ])
+    def test_expression_errors(self, expression, message):
+        """Test that error messages match those ErrorHandler expects."""
+        with pytest.raises(ValueError, match=message):
+            self.calculator.calculate_from_expression(expression)
+
+
+class TestExpressionParserCache:
+    """Test the compiled-expression LRU cache."""
+    
+    def test_normalized_source_reuses_ast(self):
+        """Test that whitespace variants map to the same cached AST."""
+        parser = ExpressionParser(cache_size=4)
+        assert parser.parse("1 + 2") is parser.parse("  1   +  2 ")
+        assert parser.cache_size() == 1
+    
+    def test_cache_is_bounded(self):
+        """Test that the least recently used expression is evicted."""
+        parser = ExpressionParser(cache_size=2)
+        first = parser.parse("1 + 1")
+        parser.parse("2 + 2")
+        parser.parse("1 + 1")
+        parser.parse("3 + 3")
+        assert parser.cache_size() == 2
+        assert parser.parse("1 + 1") is first
+    
+    def test_cache_disabled(self):
+        """Test that a zero-sized cache stores nothing."""
+        parser = ExpressionParser(cache_size=0)
+        parser.parse("1 + 1")
+        assert parser.cache_size() == 0
+
+
+class TestExpressionVariables:
+    """Test parsing and evaluating expressions with variables."""
+    
+    def test_variables_only_when_allowed(self):
+        """Test that names parse as variables only for parsers that allow them."""
+        with pytest.raises(ValueError, match="Invalid expression format"):
+            ExpressionParser().parse("x + 1")
+        node = ExpressionParser(allow_variables=True).parse("x * sqrt(y) - -x")
+        assert variable_names(node) == {"x", "y"}
+        assert DecimalBackend().evaluate(node, {"x": Decimal(2), "y": Decimal(9)}) == 8
+        with pytest.raises(ValueError, match="Undefined variable: y"):
+            DecimalBackend().evaluate(node, {"x": Decimal(2)})
+    
+    def test_substitute(self):
+        """Test that substitution replaces only the given variables, without changing the original."""
+        node = ExpressionParser(allow_variables=True).parse("a + b")
+        bound = substitute(node, {"a": Decimal(1)})
+        assert variable_names(bound) == {"b"}
+        assert variable_names(node) == {"a", "b"}
@@ -0,0 +1,87 @@
+"""
+Unit tests for the calculation history model.
+"""
+import pytest
+from src.models.history import History
+
+
+def _entry(i):
+    return {"expression": f"{i} + 0", "result": str(i)}
+
+
+class TestHistory:
+    """Test ring-buffer history behaviour."""
+    
+    def test_fifo_eviction(self):
+        """Test that the oldest items are evicted once max_size is reached."""
+        history = History(max_size=3)
+        for i in range(5):
+            history.add_item(_entry(i))
+        assert history.size() == 3
+        assert [item["result"] for item in history.get_items()] == ["2", "3", "4"]
+        assert history.get_item(0)["result"] == "2"
+        assert history.get_item(2)["result"] == "4"
+        assert history.get_item(3) is None
+    
+    def test_view_is_read_only_and_live(self):
+        """Test that views do not copy and reflect later additions."""
+        history = History(max_size=2)
+        view = history.view()
+        history.add_item(_entry(1))
+        history.add_item(_entry(2))
+        history.add_item(_entry(3))
+        assert len(view) == 2
+        assert view[0]["result"] == "2"
+        assert view[-1]["result"] == "3"
+        assert [item["result"] for item in view[0:2]] == ["2", "3"]
+        with pytest.raises(TypeError):
+            view[0] = _entry(9)
+        with pytest.raises(IndexError):
+            view[2]
+    
+    def test_paged_iteration(self):
+        """Test iterating over one page of the history."""
+        history = History(max_size=10)
+        for i in range(15):
+            history.add_item(_entry(i))
+        page = [item["result"] for item in history.iter_items(offset=2, limit=3)]
+        assert page == ["7", "8", "9"]
+    
+    def test_shrinking_max_size_keeps_newest(self):
+        """Test that reducing max_size keeps the newest items."""
+        history = History(max_size=5)
+        for i in range(7):
+            history.add_item(_entry(i))
+        history.max_size = 2
+        assert [item["result"] for item in history.get_items()] == ["5", "6"]
+        history.add_item(_entry(7))
+        assert [item["result"] for item in history.get_items()] == ["6", "7"]
+    
+    def test_growing_max_size(self):
+        """Test that increasing max_size allows more items."""
+        history = History(max_size=2)
+        for i in range(3):
+            history.add_item(_entry(i))
+        history.max_size = 4
+        for i in range(3, 6):
+            history.add_item(_entry(i))
+        assert [item["result"] for item in history.get_items()] == ["2", "3", "4", "5"]
+    
+    def test_remove_and_clear(self):
+        """Test removing a single item and clearing the history."""
+        history = History(max_size=3)
+        for i in range(4):
+            history.add_item(_entry(i))
+        history.remove_item(1)
+        assert [item["result"] for item in history.get_items()] == ["1", "3"]
+        history.clear()
+        assert history.is_empty()
+        assert history.to_dict()["total_count"] == 0
+    
+    def test_invalid_max_size(self):
+        """Test that a non-positive max_size is rejected, in the constructor too."""
+        with pytest.raises(ValueError):
+            History().max_size = 0
+        for max_size in (0, -1):
+            with pytest.raises(ValueError, match="Max size must be greater than 0"):
+                History(max_size=max_size)
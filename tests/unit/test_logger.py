@@ -0,0 +1,75 @@
+"""
+Unit tests for calculator logging, including asynchronous mode.
+"""
+import queue
+import logging
+import pytest
+from src.lib.logger import CalculatorLogger, _RecordQueueHandler, DROP
+
+
+class TestAsyncLogger:
+    """Test the queue-based asynchronous logger."""
+    
+    def _make_logger(self, tmp_path, name, **kwargs):
+        log_file = tmp_path / "calc.log"
+        logger = CalculatorLogger(log_file=str(log_file), async_mode=True, name=name, **kwargs)
+        # Keep console output out of the test run
+        logger._handlers[1].setLevel(logging.CRITICAL)
+        return logger, log_file
+    
+    def test_close_flushes_all_records(self, tmp_path):
+        """Test that every queued record is written before close() returns."""
+        logger, log_file = self._make_logger(tmp_path, "CalculatorTestAsyncFlush")
+        assert logger.async_mode
+        for i in range(500):
+            logger.log_calculation("add", str(i), "1", str(i + 1))
+        logger.log_calculation("divide", "1", "0", "Error: Cannot divide by zero", success=False)
+        logger.close()
+        
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 501
+        assert lines[0].endswith("Calculation: 0 add 1 = 1")
+        assert "Calculation Failed: 1 divide 0 - Error: Cannot divide by zero" in lines[-1]
+    
+    def test_records_are_not_formatted_on_enqueue(self):
+        """Test that the queue handler stores the record without formatting it."""
+        record_queue = queue.Queue()
+        handler = _RecordQueueHandler(record_queue, "block")
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "value %s", ("a",), None)
+        handler.handle(record)
+        queued = record_queue.get_nowait()
+        assert queued is record
+        assert queued.msg == "value %s"
+    
+    def test_drop_policy_counts_dropped_records(self):
+        """Test that a full queue drops records under the drop policy."""
+        handler = _RecordQueueHandler(queue.Queue(maxsize=1), DROP)
+        for _ in range(3):
+            handler.handle(logging.LogRecord("x", logging.INFO, __file__, 1, "m", None, None))
+        assert handler.dropped == 2
+    
+    def test_close_keeps_handlers_of_other_instances(self, tmp_path):
+        """Test that closing one logger does not stop another logger sharing its name."""
+        first, log_file = self._make_logger(tmp_path, "CalculatorTestShared")
+        second = CalculatorLogger(log_file=str(log_file), async_mode=True, name="CalculatorTestShared")
+        first.close()
+        assert second.async_mode
+        second.log_info("still logged")
+        second.close()
+        assert log_file.read_text().splitlines()[-1].endswith("still logged")
+        assert not logging.getLogger("CalculatorTestShared").handlers
+    
+    def test_async_mode_on_synchronous_logger_warns(self, tmp_path):
+        """Test that async_mode is not silently ignored when the logger is already synchronous."""
+        log_file = str(tmp_path / "calc.log")
+        synchronous = CalculatorLogger(log_file=log_file, name="CalculatorTestSyncFirst")
+        with pytest.warns(RuntimeWarning, match="async_mode is ignored"):
+            late = CalculatorLogger(log_file=log_file, async_mode=True, name="CalculatorTestSyncFirst")
+        assert not late.async_mode
+        late.close()
+        synchronous.close()
+    
+    def test_invalid_policy(self, tmp_path):
+        """Test that an unknown full-queue policy is rejected."""
+        with pytest.raises(ValueError, match="Invalid queue full policy"):
+            CalculatorLogger(log_file=str(tmp_path / "x.log"), full_policy="spill")
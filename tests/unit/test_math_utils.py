@@ -39,6 +39,50 @@ class TestMathUtils:
         result = MathUtils.power("2", "3")
         assert result == Decimal("8")
     
+    def test_power_integral_exponents_are_exact(self):
+        """Test that integral exponents give exact results regardless of precision."""
+        from decimal import localcontext
+        with localcontext() as context:
+            context.prec = 10
+            assert MathUtils.power("2", "100") == 2 ** 100
+            assert str(MathUtils.power("1.5", "3")) == "3.375"
+            assert str(MathUtils.power("2.0", "3.0")) == "8.000"
+            assert MathUtils.power("-3", "3") == -27
+            # Negative and fractional exponents are rounded to the precision
+            assert MathUtils.power("3", "-1") == Decimal("0.3333333333")
+            assert MathUtils.power("2", "0.5") == Decimal("1.414213562")
+    
+    def test_power_budget_downgrades_to_precision(self):
+        """Test that exact results over the digit budget are rounded instead."""
+        from decimal import localcontext
+        from src.lib.power import PowerEngine
+        engine = PowerEngine(max_digits=100)
+        with localcontext() as context:
+            context.prec = 10
+            assert engine.compute(Decimal(2), Decimal(300)) == 2 ** 300
+            assert str(engine.compute(Decimal(2), Decimal(1000))) == "1.071508607E+301"
+    
+    def test_power_too_large_raises_error(self):
+        """Test that results beyond the context's exponent limit are rejected before computing."""
+        with pytest.raises(ValueError, match="Power result is too large"):
+            MathUtils.power("10", "99999999")
+        with pytest.raises(ValueError, match="Power result is too large"):
+            MathUtils.power("1.5", "1E+400")
+    
+    def test_power_zero_base_large_exponent(self):
+        """Test that zero raised to a huge exponent is zero rather than an estimation error."""
+        assert MathUtils.power("0", "10000000") == 0
+        assert MathUtils.power("0.00", "1E+400") == 0
+        with pytest.raises(ValueError, match="Division by zero is not allowed"):
+            MathUtils.power("0", "-10000000")
+    
+    def test_power_invalid_operands(self):
+        """Test that undefined powers raise ValueError."""
+        with pytest.raises(ValueError, match="Power is undefined for -8 \\^ 0.5"):
+            MathUtils.power("-8", "0.5")
+        with pytest.raises(ValueError, match="Division by zero is not allowed"):
+            MathUtils.power("0", "-1")
+    
     def test_sqrt(self):
         """Test square root operation."""
         result = MathUtils.sqrt("16")
@@ -70,6 +114,42 @@ class TestMathUtils:
             MathUtils.factorial("-5")
     
     def test_factorial_large_input_raises_error(self):
-        """Test that factorial of very large number raises ValueError."""
+        """Test that factorial above the cost ceiling raises ValueError."""
         with pytest.raises(ValueError, match="Factorial input is too large"):
-            MathUtils.factorial("200")
\ No newline at end of file
+            MathUtils.factorial("1000000")
+    
+    def test_factorial_huge_input_raises_error(self):
+        """Test that inputs too large for a float estimate are rejected as too large, not unexpected."""
+        from src.lib.factorial import FactorialEngine
+        from src.services.process_pool import estimate_cost
+        operand = "9" * 400
+        with pytest.raises(ValueError, match="Factorial input is too large"):
+            MathUtils.factorial(operand)
+        assert FactorialEngine.estimate_digits(int(operand)) > FactorialEngine().max_digits
+        assert estimate_cost("factorial", operand) == 1
+    
+    def test_factorial_above_previous_cap(self):
+        """Test that factorials beyond 100 are computed exactly."""
+        import math
+        for n in (101, 257, 1000, 5000):
+            assert MathUtils.factorial(str(n)) == math.factorial(n)
+    
+    def test_factorial_result_is_printable(self):
+        """Test that very large factorials can be converted to strings."""
+        result = MathUtils.factorial("10000")
+        assert len(str(result)) == 35660
+    
+    def test_factorial_configurable_ceiling(self):
+        """Test that the cost ceiling is configurable."""
+        from src.lib.factorial import FactorialEngine
+        engine = FactorialEngine(max_digits=100)
+        assert engine.compute(69) > 0
+        with pytest.raises(ValueError, match="Factorial input is too large"):
+            engine.compute(70)
+    
+    def test_parsed_operands_pass_through(self):
+        """Test that Decimals from Validation are accepted without re-parsing."""
+        from src.lib.validation import Validation
+        operand = Validation.validate_operand("2.5")
+        assert Validation.validate_operand(operand) is operand
+        assert MathUtils.multiply(operand, Decimal("4")) == Decimal("10")
@@ -0,0 +1,89 @@
+"""
+Unit tests for the metrics registry and performance monitoring.
+"""
+import json
+import pytest
+from src.lib.metrics import Histogram, MetricsRegistry
+from src.lib.performance_monitor import PerformanceMonitor
+
+
+class TestHistogram:
+    """Test fixed-bucket latency histograms."""
+    
+    def test_counts_and_max(self):
+        """Test that count, sum and max are tracked exactly."""
+        histogram = Histogram()
+        for duration in (1_500, 3_000, 40_000):
+            histogram.record(duration)
+        assert histogram.count == 3
+        assert histogram.sum_ns == 44_500
+        assert histogram.max_ns == 40_000
+    
+    def test_percentiles_within_bucket_bounds(self):
+        """Test that percentile estimates fall inside the bucket holding the sample."""
+        histogram = Histogram()
+        for _ in range(99):
+            histogram.record(1_500)  # bucket (1us, 2us]
+        histogram.record(7_000_000)  # bucket (5ms, 10ms]
+        assert 1_000 <= histogram.percentile(50) <= 2_000
+        assert 1_000 <= histogram.percentile(95) <= 2_000
+        assert histogram.percentile(100) == 7_000_000
+    
+    def test_memory_is_constant(self):
+        """Test that recording samples does not grow the histogram."""
+        histogram = Histogram()
+        buckets = len(histogram.counts)
+        for duration in range(0, 10_000_000, 997):
+            histogram.record(duration)
+        assert len(histogram.counts) == buckets
+    
+    def test_empty_histogram(self):
+        """Test summary values of an empty histogram."""
+        assert Histogram().summary()["p99_ms"] == 0.0
+
+
+class TestMetricsRegistry:
+    """Test registry export formats."""
+    
+    def setup_method(self):
+        """Set up a registry with two operations."""
+        self.registry = MetricsRegistry()
+        self.registry.record("add", 2_000)
+        self.registry.record("add", 4_000)
+        self.registry.record("divide", 1_000_000)
+    
+    def test_json_export(self, tmp_path):
+        """Test JSON export to a file."""
+        path = tmp_path / "metrics.json"
+        self.registry.export("json", str(path))
+        data = json.loads(path.read_text())
+        assert data["add"]["count"] == 2
+        assert data["divide"]["max_ms"] == 1.0
+    
+    def test_prometheus_export(self):
+        """Test Prometheus histogram exposition."""
+        text = self.registry.export("prometheus")
+        assert "# TYPE calculator_operation_duration_seconds histogram" in text
+        assert 'calculator_operation_duration_seconds_bucket{operation="add",le="+Inf"} 2' in text
+        assert 'calculator_operation_duration_seconds_count{operation="divide"} 1' in text
+    
+    def test_unknown_format(self):
+        """Test that unknown export formats are rejected."""
+        with pytest.raises(ValueError, match="Unsupported metrics format"):
+            self.registry.export("xml")
+
+
+class TestPerformanceMonitor:
+    """Test that time_operation records into the registry instead of printing."""
+    
+    def test_time_operation_records_without_printing(self, capsys):
+        """Test that timings go to the registry and nothing is printed."""
+        PerformanceMonitor.registry.reset()
+        
+        @PerformanceMonitor.time_operation("unit_test_operation")
+        def operation():
+            return 42
+        
+        assert operation() == 42
+        assert PerformanceMonitor.registry.histogram("unit_test_operation").count == 1
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,72 @@
+"""
+Unit tests for the Decimal and float numeric backends.
+"""
+from decimal import Decimal, getcontext, localcontext
+import pytest
+from src.lib.numeric_backend import DecimalBackend, FloatBackend, create_backend
+from src.lib.operation_registry import REGISTRY, register_operation
+from src.models.calculator import Calculator
+from src.services.calculator_service import CalculatorService
+
+
+class TestNumericBackends:
+    """Test backend selection, per-call precision and the float fast path."""
+    
+    def test_global_context_untouched(self):
+        """Test that calculations use their own context, whatever the global one is."""
+        calculator = Calculator()
+        with localcontext() as context:
+            context.prec = 3
+            assert calculator.calculate("divide", "10", "3") == Decimal("3.333333333")
+            assert calculator.calculate_from_expression("2 / 3") == Decimal("0.6666666667")
+            assert getcontext().prec == 3
+    
+    def test_service_and_call_precision(self):
+        """Test that precision is chosen per service and can be overridden per call."""
+        service = CalculatorService(precision=20)
+        assert service.calculate("divide", "1", "3")["result"] == "0." + "3" * 20
+        assert service.calculate("divide", "1", "3", precision=5)["result"] == "0.33333"
+        assert service.calculate_from_expression("2 / 3", precision=4)["result"] == "0.6667"
+        assert service.calculate("divide", "1", "3", precision=0)["error"] == "Error: Precision must be between 1 and 1000"
+    
+    def test_cache_separates_precisions(self):
+        """Test that cached results are not shared between precisions."""
+        service = CalculatorService(cache_size=8)
+        assert service.calculate("divide", "2", "3", precision=3)["result"] == "0.667"
+        assert service.calculate("divide", "2", "3", precision=6)["result"] == "0.666667"
+    
+    def test_float_backend(self):
+        """Test that the float backend computes with native floats and reports itself."""
+        service = CalculatorService(backend="float")
+        result = service.calculate("add", "0.1", "0.2")
+        assert result == {"result": "0.30000000000000004", "status": "success", "backend": "float"}
+        assert service.calculate("power", "2", "10")["result"] == "1024"
+        assert service.calculate_from_expression("-(2 + 3) * sqrt(16)")["result"] == "-20"
+        assert service.calculate_many([("multiply", "1.5", "4")])[0]["result"] == "6"
+    
+    def test_float_backend_errors(self):
+        """Test that float errors are reported like Decimal ones and overflow is rejected."""
+        service = CalculatorService(backend="float")
+        assert service.calculate("divide", "1", "0")["error"] == "Error: Cannot divide by zero"
+        assert service.calculate("add", "abc", "1")["error"] == "Error: Invalid number format: abc"
+        assert service.calculate("factorial", "171")["error"] == "Error: Result is out of range for the float backend"
+        assert service.calculate("multiply", "1" + "0" * 308, "10")["error"] == \
+            "Error: Result is out of range for the float backend"
+        assert service.calculate("add", "1", "2", precision=5)["error"] == \
+            "Error: Precision is only supported by the decimal backend"
+    
+    def test_float_fallback_for_plugins(self):
+        """Test that operations without a float implementation run in Decimal and are converted."""
+        register_operation("halve", lambda a: a / 2, arity=1)
+        try:
+            assert Calculator(backend=FloatBackend()).calculate("halve", "5") == 2.5
+        finally:
+            REGISTRY.unregister("halve")
+    
+    def test_create_backend(self):
+        """Test backend construction by name."""
+        assert create_backend().precision == 10
+        assert isinstance(create_backend("float"), FloatBackend)
+        assert DecimalBackend(25).key == ("decimal", 25)
+        with pytest.raises(ValueError, match="Unknown numeric backend: int"):
+            create_backend("int")
@@ -0,0 +1,91 @@
+"""
+Unit tests for the operation registry and plugin operations.
+"""
+import sys
+import types
+from decimal import Decimal
+import pytest
+from src.lib.expression_parser import ExpressionParser
+from src.lib.operation_registry import REGISTRY, OperationRegistry, OperationSpec, register_operation
+from src.lib.validation import Validation
+from src.models.calculation import Calculation
+from src.models.calculator import Calculator
+from src.services.process_pool import estimate_cost, estimate_expression_cost
+
+
+class TestOperationRegistry:
+    """Test OperationRegistry and operations registered as plugins."""
+    
+    def setup_method(self):
+        """Register two plugin operations."""
+        register_operation("modulo", lambda a, b: a % b, symbols=("mod", "//"), label="mod")
+        register_operation("double", lambda a: a * 2, arity=1, symbols=("twice",),
+                           cost_estimator=lambda a, b: int(a))
+        self.calculator = Calculator()
+    
+    def teardown_method(self):
+        """Remove the plugin operations."""
+        REGISTRY.unregister("modulo")
+        REGISTRY.unregister("double")
+    
+    def test_builtins_registered(self):
+        """Test that every built-in operation is in the registry with its arity."""
+        for name in ("add", "subtract", "multiply", "divide", "percentage", "power"):
+            assert REGISTRY.require(name).arity == 2
+        for name in ("sqrt", "factorial"):
+            assert REGISTRY.require(name).arity == 1
+        assert REGISTRY.binary_operator("**") is REGISTRY.get("power")
+    
+    def test_plugin_dispatch_and_validation(self):
+        """Test that a plugin operation works through Calculator, Validation and Calculation."""
+        assert Validation.is_valid_operation("modulo")
+        assert self.calculator.calculate("modulo", "17", "5") == Decimal("2")
+        assert self.calculator.calculate("double", "21") == Decimal("42")
+        calculation = Calculation("17", "5", "modulo")
+        assert calculation.execute() == Decimal("2")
+        assert calculation.expression == "17 mod 5"
+    
+    def test_plugin_in_expressions(self):
+        """Test that plugin symbols and functions are parsed with their precedence."""
+        assert self.calculator.calculate_from_expression("17 mod 5 + 1") == Decimal("3")
+        assert self.calculator.calculate_from_expression("17 // 5") == Decimal("2")
+        assert self.calculator.calculate_from_expression("twice(3) * double(2)") == Decimal("24")
+    
+    def test_parse_cache_invalidated(self):
+        """Test that cached parses are dropped when an operation is removed."""
+        parser = ExpressionParser()
+        parser.parse("7 mod 2")
+        REGISTRY.unregister("modulo")
+        with pytest.raises(ValueError, match="Invalid expression format"):
+            parser.parse("7 mod 2")
+    
+    def test_cost_routing(self):
+        """Test that cost estimates come from the registered estimator."""
+        assert estimate_cost("double", "50000") == 50000
+        assert estimate_cost("modulo", "7", "2") == 1
+        parser = ExpressionParser()
+        assert estimate_expression_cost(parser.parse("double(10) mod 3")) == 11
+        assert estimate_expression_cost(parser.parse("double(1 + 2)")) == float("inf")
+    
+    def test_duplicate_registration(self):
+        """Test that names and symbols cannot be registered twice without replace."""
+        with pytest.raises(ValueError, match="Operation already registered: modulo"):
+            register_operation("modulo", lambda a, b: a)
+        with pytest.raises(ValueError, match="Symbol already registered: \\+"):
+            register_operation("plus", lambda a, b: a + b, symbols=("+",))
+    
+    def test_unregister(self):
+        """Test that an unregistered operation is rejected everywhere."""
+        REGISTRY.unregister("modulo")
+        assert not Validation.is_valid_operation("modulo")
+        with pytest.raises(ValueError, match="Invalid operation: modulo"):
+            self.calculator.calculate("modulo", "7", "2")
+    
+    def test_load_plugin(self, monkeypatch):
+        """Test that load_plugin calls the module's register function."""
+        module = types.ModuleType("calculator_test_plugin")
+        module.register = lambda registry: registry.register(OperationSpec("negate", lambda a: -a, arity=1))
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+        registry = OperationRegistry()
+        registry.load_plugin(module.__name__)
+        assert registry.function("negate").call(Decimal("3"), None) == Decimal("-3")
@@ -0,0 +1,76 @@
+"""
+Unit tests for parameter sweeps.
+"""
+from decimal import Decimal
+import pytest
+from src.lib.numeric_backend import FloatBackend
+from src.services.parameter_sweep import ParameterSweep, SweepRange, evaluate_chunk
+
+
+class TestSweepRange:
+    """Test parsing and indexing sweep ranges."""
+    
+    def test_parse_and_values(self):
+        """Test that stop is included and values are exact multiples of the step."""
+        sweep_range = SweepRange.parse("x=0:1:0.1")
+        assert sweep_range.name == "x"
+        assert len(sweep_range) == 11
+        assert sweep_range.value(3) == Decimal("0.3")
+        assert sweep_range.value(10) == Decimal(1)
+        assert len(SweepRange.parse("y = 1:2")) == 2
+        assert len(SweepRange.parse("z=5:-5:-2.5")) == 5
+        # Stop is only included when a step lands on it
+        assert len(SweepRange.parse("x=0:1:0.3")) == 4
+    
+    def test_invalid_ranges(self):
+        """Test that malformed, empty and zero-step ranges are rejected."""
+        with pytest.raises(ValueError, match="Invalid sweep range"):
+            SweepRange.parse("x=1")
+        with pytest.raises(ValueError, match="Invalid number format"):
+            SweepRange.parse("x=a:b")
+        with pytest.raises(ValueError, match="cannot be zero"):
+            SweepRange.parse("x=0:1:0")
+        with pytest.raises(ValueError, match="empty"):
+            SweepRange.parse("x=1:0")
+
+
+class TestParameterSweep:
+    """Test evaluating sweeps."""
+    
+    def test_nested_sweep_order_and_errors(self):
+        """Test that the last range varies fastest and failing points are reported in place."""
+        sweep = ParameterSweep("x / y", [SweepRange.parse("x=1:2"), SweepRange.parse("y=-1:1")])
+        assert len(sweep) == 6
+        assert list(sweep) == [
+            (("1", "-1"), "-1", None),
+            (("1", "0"), None, "Error: Cannot divide by zero"),
+            (("1", "1"), "1", None),
+            (("2", "-1"), "-2", None),
+            (("2", "0"), None, "Error: Cannot divide by zero"),
+            (("2", "1"), "2", None),
+        ]
+    
+    def test_chunks_start_anywhere(self):
+        """Test that chunk boundaries do not change the points or their order."""
+        ranges = [SweepRange.parse("a=0:4"), SweepRange.parse("b=0:2"), SweepRange.parse("c=1:3")]
+        expected = list(ParameterSweep("a * 100 + b * 10 + c", ranges))
+        assert len(expected) == 45
+        assert [row[1] for row in expected[:4]] == ["1", "2", "3", "11"]
+        rows = [row for start in range(0, 45, 7)
+                for row in evaluate_chunk("a * 100 + b * 10 + c", ranges, FloatBackend(), start, min(start + 7, 45))]
+        assert [values for values, _, _ in rows] == [values for values, _, _ in expected]
+        assert [float(result) for _, result, _ in rows] == [float(result) for _, result, _ in expected]
+    
+    def test_parallel_matches_inline(self):
+        """Test that worker processes return the same rows in the same order."""
+        sweep = ParameterSweep("x ^ 2 / 3 + 1 / (x - 2)", [SweepRange.parse("x=0:10:0.25")], chunk_size=8)
+        chunks = list(sweep.chunks(workers=2))
+        assert [len(rows) for rows in chunks] == [8, 8, 8, 8, 8, 1]
+        assert [row for rows in chunks for row in rows] == list(sweep)
+    
+    def test_invalid_sweeps(self):
+        """Test that unswept variables and duplicate ranges are rejected before evaluating."""
+        with pytest.raises(ValueError, match="Undefined variable: y"):
+            ParameterSweep("x + y", [SweepRange.parse("x=0:1")])
+        with pytest.raises(ValueError, match="more than once: x"):
+            ParameterSweep("x", [SweepRange.parse("x=0:1"), SweepRange.parse("x=2:3")])
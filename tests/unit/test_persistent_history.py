@@ -0,0 +1,139 @@
+"""
+Unit tests for the persistent, append-only history store.
+"""
+import multiprocessing
+import os
+import pytest
+from src.models.persistent_history import PersistentHistory, fcntl
+
+
+def _entry(i):
+    return {"expression": f"{i} + 0", "result": str(i)}
+
+
+def _append_items(path, writer, count, start):
+    """Append count entries tagged with the writer's name, in a separate process."""
+    history = PersistentHistory(path, max_size=50)
+    start.wait()
+    for i in range(count):
+        history.add_item({"expression": writer, "result": str(i)})
+    history.close()
+
+
+class TestPersistentHistory:
+    """Test on-disk history storage."""
+    
+    def test_entries_survive_reopen(self, tmp_path):
+        """Test that entries are readable after reopening the store."""
+        path = str(tmp_path / "history.jsonl")
+        history = PersistentHistory(path)
+        for i in range(3):
+            history.add_item(_entry(i))
+        history.close()
+        
+        reopened = PersistentHistory(path)
+        assert reopened.size() == 3
+        assert reopened.get_item(1) == _entry(1)
+        assert reopened.get_items() == [_entry(0), _entry(1), _entry(2)]
+        reopened.close()
+    
+    def test_random_access_and_paging(self, tmp_path):
+        """Test O(1) access to entry N and paged reads."""
+        history = PersistentHistory(str(tmp_path / "h.jsonl"), max_size=1000)
+        for i in range(500):
+            history.add_item(_entry(i))
+        assert history.get_item(123) == _entry(123)
+        assert history.get_item(500) is None
+        assert [e["result"] for e in history.iter_items(offset=10, limit=3)] == ["10", "11", "12"]
+        assert history.tail(2) == [_entry(498), _entry(499)]
+        history.close()
+    
+    def test_max_size_window_and_compaction(self, tmp_path):
+        """Test that only max_size entries are visible and the log is compacted."""
+        path = str(tmp_path / "h.jsonl")
+        history = PersistentHistory(path, max_size=5, compact_factor=2)
+        for i in range(9):
+            history.add_item(_entry(i))
+        assert history.size() == 5
+        assert history.get_item(0) == _entry(4)
+        history.add_item(_entry(9))  # reaches 2 * max_size and compacts
+        assert history.get_items() == [_entry(i) for i in range(5, 10)]
+        assert os.path.getsize(path + ".idx") == 5 * 8
+        history.close()
+        
+        reopened = PersistentHistory(path, max_size=5)
+        assert reopened.get_items() == [_entry(i) for i in range(5, 10)]
+        reopened.close()
+    
+    def test_recovers_from_torn_append(self, tmp_path):
+        """Test that a partial data line and a torn index record are discarded."""
+        path = str(tmp_path / "h.jsonl")
+        history = PersistentHistory(path)
+        history.add_item(_entry(0))
+        history.add_item(_entry(1))
+        history.close()
+        
+        with open(path, "ab") as data:
+            data.write(b'{"expression": "2 +')
+        with open(path + ".idx", "ab") as index:
+            index.write(b"\x01\x02\x03")
+        
+        recovered = PersistentHistory(path)
+        assert recovered.get_items() == [_entry(0), _entry(1)]
+        recovered.add_item(_entry(2))
+        assert recovered.get_item(2) == _entry(2)
+        recovered.close()
+    
+    def test_rebuilds_missing_index(self, tmp_path):
+        """Test that an entry written without its index record is recovered."""
+        path = str(tmp_path / "h.jsonl")
+        history = PersistentHistory(path)
+        history.add_item(_entry(0))
+        history.add_item(_entry(1))
+        history.close()
+        with open(path + ".idx", "r+b") as index:
+            index.truncate(8)
+        
+        recovered = PersistentHistory(path)
+        assert recovered.get_items() == [_entry(0), _entry(1)]
+        recovered.close()
+    
+    def test_clear(self, tmp_path):
+        """Test clearing the store."""
+        history = PersistentHistory(str(tmp_path / "h.jsonl"))
+        history.add_item(_entry(0))
+        history.clear()
+        assert history.is_empty()
+        history.add_item(_entry(1))
+        assert history.get_items() == [_entry(1)]
+        history.close()
+    
+    def test_invalid_max_size(self, tmp_path):
+        """Test that a non-positive max_size is rejected."""
+        with pytest.raises(ValueError):
+            PersistentHistory(str(tmp_path / "h.jsonl"), max_size=0)
+    
+    @pytest.mark.skipif(fcntl is None, reason="needs flock")
+    def test_concurrent_writers(self, tmp_path):
+        """Test that two processes appending and compacting the same store lose no entries."""
+        path = str(tmp_path / "h.jsonl")
+        start = multiprocessing.Event()
+        writers = [multiprocessing.Process(target=_append_items, args=(path, name, 300, start))
+                   for name in ("a", "b")]
+        for writer in writers:
+            writer.start()
+        start.set()
+        for writer in writers:
+            writer.join(60)
+        assert [writer.exitcode for writer in writers] == [0, 0]
+        
+        history = PersistentHistory(path, max_size=50)
+        items = history.get_items()
+        assert len(items) == 50
+        assert items[-1]["result"] == "299"
+        # Each writer's visible entries are its newest ones, with none missing
+        for name in ("a", "b"):
+            results = [int(item["result"]) for item in items if item["expression"] == name]
+            assert results == list(range(300 - len(results), 300))
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+        history.close()
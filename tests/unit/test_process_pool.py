@@ -0,0 +1,115 @@
+"""
+Unit tests for offloading CPU-heavy operations to a process pool.
+"""
+import os
+import time
+import pytest
+from src.lib.math_utils import MathUtils
+from src.services.calculator_service import CalculatorService
+from src.lib.expression_parser import ExpressionParser
+from src.services.process_pool import ProcessPoolRunner, estimate_cost, estimate_expression_cost
+
+
+class TestProcessPoolRunner:
+    """Test the ProcessPoolRunner and its integration with CalculatorService."""
+    
+    def setup_method(self):
+        """Set up a small pool for each test."""
+        self.runner = ProcessPoolRunner(max_workers=2, cost_threshold=20_000)
+    
+    def teardown_method(self):
+        """Shut the pool down after each test."""
+        self.runner.shutdown()
+    
+    def test_cost_estimate(self):
+        """Test that only large factorials and exact powers are estimated as expensive."""
+        assert estimate_cost("add", "1", "2") == 1
+        assert estimate_cost("power", "2", "1000000") == 301030
+        # Rounded to the context precision: fractional exponents and powers past the digit budget
+        assert estimate_cost("power", "2", "0.5") == 1
+        assert estimate_cost("power", "2", "10000000") == 1
+        assert estimate_cost("factorial", "abc") == 1
+        assert estimate_cost("factorial", "10000") == 35660
+        # Rejected by the factorial engine before computing anything
+        assert estimate_cost("factorial", "10000000") == 1
+    
+    def test_cheap_operations_stay_inline(self):
+        """Test that operations below the threshold never start the pool."""
+        service = CalculatorService(process_pool=self.runner)
+        assert service.calculate("add", "5", "3")["result"] == "8"
+        assert service.calculate("factorial", "20")["result"] == "2432902008176640000"
+        assert self.runner._pool is None
+    
+    def test_expensive_operation_runs_in_pool(self):
+        """Test that a large factorial is computed in the pool with the same result."""
+        service = CalculatorService(process_pool=self.runner)
+        result = service.calculate("factorial", "10000")
+        assert result["status"] == "success"
+        assert result["result"] == str(MathUtils.factorial("10000"))
+        assert self.runner._pool is not None
+    
+    def test_expression_cost_estimate(self):
+        """Test that expression costs add up and non-literal factorial arguments count as expensive."""
+        parser = ExpressionParser()
+        assert estimate_expression_cost(parser.parse("2 + 3 * 4")) == 2
+        assert estimate_expression_cost(parser.parse("factorial(10000) + 1")) == 35661
+        assert estimate_expression_cost(parser.parse("factorial(2 + 3)")) == float("inf")
+    
+    def test_expensive_expression_runs_in_pool(self):
+        """Test that an expression containing a large factorial is evaluated in the pool."""
+        service = CalculatorService(process_pool=self.runner)
+        assert service.calculate_from_expression("1 + 2")["result"] == "3"
+        assert self.runner._pool is None
+        result = service.calculate_from_expression("factorial(10000) - factorial(10000)")
+        assert result == {"result": "0", "status": "success", "backend": "decimal"}
+        assert self.runner._pool is not None
+    
+    def test_worker_errors_are_reported(self):
+        """Test that an error raised in a worker reaches the caller as a ValueError."""
+        with pytest.raises(ValueError, match="Invalid number format"):
+            self.runner.run("factorial", "1e5")
+    
+    def test_timeout_cancels_and_recycles_pool(self):
+        """Test that a call exceeding its timeout fails and the next call still works."""
+        with pytest.raises(ValueError, match="timed out"):
+            self.runner.run("factorial", "100000", timeout=0.01)
+        assert self.runner.run("factorial", "5") == 120
+    
+    def test_timeout_reported_by_service(self):
+        """Test that the service turns a timeout into an error result."""
+        runner = ProcessPoolRunner(max_workers=1, cost_threshold=20_000, timeout=0.01)
+        try:
+            result = CalculatorService(process_pool=runner).calculate("factorial", "100000")
+        finally:
+            runner.shutdown()
+        assert result["status"] == "error"
+        assert "timed out" in result["error"]
+    
+    def test_warm_up_and_worker_recycling(self):
+        """Test warm-up and that workers are replaced after max_tasks_per_child tasks."""
+        runner = ProcessPoolRunner(max_workers=1, max_tasks_per_child=1)
+        try:
+            runner.warm_up()
+            results = [runner.run("factorial", str(n)) for n in range(3, 7)]
+        finally:
+            runner.shutdown()
+        assert results == [6, 24, 120, 720]
+    
+    @pytest.mark.skipif((os.cpu_count() or 1) < 2, reason="needs at least two CPU cores")
+    def test_large_factorials_run_in_parallel(self):
+        """Test that independent large factorials finish faster across cores than one after another."""
+        operands = ["60000", "60001"]
+        self.runner.warm_up()
+        
+        start = time.perf_counter()
+        for operand in operands:
+            self.runner.run("factorial", operand)
+        serial = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        futures = [self.runner.submit("factorial", operand) for operand in operands]
+        for future in futures:
+            self.runner.result(future)
+        parallel = time.perf_counter() - start
+        
+        assert parallel < serial * 0.8
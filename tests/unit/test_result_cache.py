@@ -0,0 +1,87 @@
+"""
+Unit tests for result memoization in the calculator service.
+"""
+import pytest
+from src.lib.result_cache import ResultCache
+from src.services.calculator_service import CalculatorService
+
+
+class TestResultCache:
+    """Test the LRU result cache behind Calculator.calculate."""
+    
+    def test_cache_disabled_by_default(self):
+        """Test that no cache statistics are reported without a cache."""
+        assert CalculatorService().get_cache_stats() is None
+    
+    def test_equivalent_operands_share_entry(self):
+        """Test that 5, 5.0 and +5 map to one cache entry."""
+        service = CalculatorService(cache_size=8)
+        service.calculate("power", "5", "2")
+        service.calculate("power", "5.0", "2")
+        service.calculate("power", "+5", "2.00")
+        stats = service.get_cache_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+        assert stats["size"] == 1
+    
+    def test_cached_results_match(self):
+        """Test that cached results equal freshly computed ones."""
+        service = CalculatorService(cache_size=8)
+        first = service.calculate("factorial", "10")
+        second = service.calculate("factorial", "10")
+        assert first == second == {"result": "3628800", "status": "success", "backend": "decimal"}
+    
+    def test_cached_failure_returns_same_error(self):
+        """Test that a cached failure reports the same error."""
+        service = CalculatorService(cache_size=8)
+        first = service.calculate("factorial", "100000000")
+        second = service.calculate("factorial", "100000000.0")
+        assert first == second
+        assert "Factorial input is too large" in second["error"]
+        assert service.get_cache_stats()["hits"] == 1
+    
+    def test_checked_failure_skips_cache(self):
+        """Test that a division by zero is reported before the cache is consulted."""
+        service = CalculatorService(cache_size=8)
+        first = service.calculate("divide", "1", "0")
+        second = service.calculate("divide", "1.0", "0")
+        assert first == second
+        assert "Cannot divide by zero" in second["error"]
+        assert service.get_cache_stats()["hits"] + service.get_cache_stats()["misses"] == 0
+    
+    def test_eviction(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = ResultCache(max_entries=2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("c", lambda: 3)
+        assert cache.stats()["evictions"] == 1
+        assert cache.get_or_compute("a", lambda: pytest.fail("should be cached")) == 1
+    
+    def test_byte_budget(self):
+        """Test that large results are weighted by size, and results over the budget are not cached."""
+        import math
+        import sys
+        large = math.factorial(5000)
+        cache = ResultCache(max_entries=100, max_bytes=2 * sys.getsizeof(large) + 100)
+        for n in range(10):
+            cache.get_or_compute(("small", n), lambda: n)
+        cache.get_or_compute("large", lambda: large)
+        cache.get_or_compute("larger", lambda: large + 1)
+        stats = cache.stats()
+        assert stats["bytes"] <= stats["max_bytes"]
+        assert stats["evictions"] > 0
+        assert cache.get_or_compute("larger", lambda: pytest.fail("should be cached")) == large + 1
+        
+        huge = math.factorial(20000)
+        cache.get_or_compute("huge", lambda: huge)
+        assert cache.get_or_compute("huge", lambda: 0) == 0
+        assert cache.stats()["bytes"] <= cache.max_bytes
+    
+    def test_invalid_max_entries(self):
+        """Test that a non-positive limit is rejected."""
+        with pytest.raises(ValueError):
+            ResultCache(max_entries=0)
+        with pytest.raises(ValueError):
+            ResultCache(max_bytes=0)
@@ -0,0 +1,115 @@
+"""
+Unit tests for dependency-tracked variables.
+"""
+import time
+from decimal import Decimal
+import pytest
+from src.models.variable_graph import VariableGraph
+
+
+class TestVariableGraph:
+    """Test definitions, incremental recomputation and error states."""
+    
+    def setup_method(self):
+        """Set up an empty graph for each test."""
+        self.graph = VariableGraph()
+    
+    def _value(self, name):
+        return self.graph.get(name).value
+    
+    def test_recompute_only_downstream(self):
+        """Test that a change recomputes its dependents in order and nothing else."""
+        self.graph.define("x", "5 * 3")
+        self.graph.define("y", "x + 1")
+        self.graph.define("z", "y * x")
+        self.graph.define("other", "2")
+        assert self._value("z") == Decimal("240")
+        
+        recomputed = self.graph.define("x", "10")
+        assert recomputed == ["x", "y", "z"]
+        assert self.graph.last_recomputed == recomputed
+        assert self._value("y") == 11 and self._value("z") == 110
+        assert self.graph.dependencies("z") == ["x", "y"]
+        assert self.graph.dependents("x") == ["y", "z"]
+    
+    def test_forward_references_and_removal(self):
+        """Test that undefined references are errors until defined, and again after removal."""
+        self.graph.define("b", "a * 2")
+        assert self.graph.get("b").error == "Error: Undefined variable: a"
+        assert self.graph.define("a", "4") == ["a", "b"]
+        assert self._value("b") == 8
+        assert self.graph.remove("a") == ["b"]
+        assert "a" not in self.graph
+        assert self.graph.get("b").error == "Error: Undefined variable: a"
+    
+    def test_failures_propagate(self):
+        """Test that a failing formula marks its dependents, and recovers when fixed."""
+        self.graph.define("d", "0")
+        self.graph.define("q", "1 / d")
+        self.graph.define("r", "q + 1")
+        assert self.graph.get("q").error == "Error: Cannot divide by zero"
+        assert self.graph.get("r").error == "Error: Variable q has an error"
+        with pytest.raises(ValueError, match="Variable q has an error"):
+            self.graph.evaluate("q * 2")
+        self.graph.define("d", "4")
+        assert self._value("r") == Decimal("1.25")
+    
+    def test_rejected_definitions_leave_graph_unchanged(self):
+        """Test that cycles, reserved names and parse errors are rejected."""
+        self.graph.define("x", "1")
+        self.graph.define("y", "x + 1")
+        with pytest.raises(ValueError, match="Circular reference"):
+            self.graph.define("x", "y * 2")
+        with pytest.raises(ValueError, match="Circular reference"):
+            self.graph.define("x", "x + 1")
+        for name in ("ans", "sqrt", "add"):
+            with pytest.raises(ValueError, match="Reserved name"):
+                self.graph.define(name, "1")
+        with pytest.raises(ValueError, match="Invalid expression format"):
+            self.graph.define("x", "2 +")
+        assert self.graph.get("x").expression == "1"
+        assert self.graph.dependents("x") == ["y"]
+    
+    def test_ans(self):
+        """Test that ans is the last result and is captured when a formula is defined."""
+        with pytest.raises(ValueError, match="Undefined variable: ans"):
+            self.graph.evaluate("ans + 1")
+        assert self.graph.evaluate("6 * 7") == 42
+        self.graph.define("half", "ans / 2")
+        assert self._value("half") == 21
+        assert self.graph.ans == 21
+        assert self.graph.evaluate("half + ans") == 42
+        # half keeps the value ans had when it was defined
+        self.graph.define("one", "1")
+        self.graph.define("one", "2")
+        assert self._value("half") == 21
+    
+    def test_parse_assignment(self):
+        """Test recognizing assignments."""
+        assert VariableGraph.parse_assignment("x = 5 * 3") == ("x", "5 * 3")
+        assert VariableGraph.parse_assignment("  rate_2=0.5") == ("rate_2", "0.5")
+        assert VariableGraph.parse_assignment("x == 5") is None
+        assert VariableGraph.parse_assignment("5 + 3") is None
+    
+    def test_large_graphs_stay_incremental(self):
+        """Test a long chain and a wide fan-out: changes cost only what they affect."""
+        self.graph.define("v0", "1")
+        for index in range(1, 3000):
+            self.graph.define(f"v{index}", f"v{index - 1} + 1")
+        for index in range(3000):
+            self.graph.define(f"w{index}", f"base * {index}")
+        self.graph.define("leaf", "v2999 * 2")
+        
+        start = time.perf_counter()
+        recomputed = self.graph.define("leaf", "v2999 * 3")
+        leaf_time = time.perf_counter() - start
+        assert recomputed == ["leaf"]
+        assert leaf_time < 0.05
+        
+        recomputed = self.graph.define("v0", "10")
+        assert recomputed[:3] == ["v0", "v1", "v2"] and len(recomputed) == 3001
+        assert self._value("leaf") == (10 + 2999) * 3
+        
+        recomputed = self.graph.define("base", "2")
+        assert len(recomputed) == 3001
+        assert self._value("w2999") == 5998
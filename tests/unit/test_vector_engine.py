@@ -0,0 +1,95 @@
+"""
+Unit tests for the vectorized engine, with and without NumPy.
+"""
+import math
+import pytest
+from src.lib import vector_engine
+from src.lib.vector_engine import (
+    DIVISION_BY_ZERO, NEGATIVE_SQRT, OK, OUT_OF_RANGE, UNDEFINED, VectorEngine
+)
+from src.services.calculator_service import CalculatorService
+
+
+class TestVectorEnginePython:
+    """Test the pure Python fallback, which is used when NumPy is missing."""
+    
+    def setup_method(self):
+        """Set up an engine that never uses NumPy."""
+        self.engine = VectorEngine(use_numpy=False)
+    
+    def test_elementwise_operations(self):
+        """Test that each operation is applied element by element."""
+        assert list(self.engine.compute("add", [1, 2, 3], [10, 20, 30]).values) == [11, 22, 33]
+        assert list(self.engine.compute("power", [2, 3], [10, 2]).values) == [1024, 9]
+        assert list(self.engine.compute("percentage", [10, 50], [200, 4]).values) == [20, 2]
+        assert list(self.engine.compute("sqrt", [16, 2.25]).values) == [4, 1.5]
+    
+    def test_scalar_broadcast(self):
+        """Test that a scalar operand is applied to every element."""
+        assert list(self.engine.compute("multiply", [1, 2, 3], 1.5).values) == [1.5, 3, 4.5]
+        assert list(self.engine.compute("subtract", 10, [1, 2]).values) == [9, 8]
+    
+    def test_error_codes(self):
+        """Test that failed elements are masked with ErrorHandler error codes and messages."""
+        result = self.engine.compute("divide", [1, 2, 3], [1, 0, 2])
+        assert list(result.errors) == [OK, DIVISION_BY_ZERO, OK]
+        assert result.masked() == [1, None, 1.5]
+        assert math.isnan(result.values[1])
+        assert result.error_messages() == [None, "Error: Cannot divide by zero", None]
+        assert result.error_count == 1
+        
+        assert list(self.engine.compute("sqrt", [4, -4]).errors) == [OK, NEGATIVE_SQRT]
+        result = self.engine.compute("power", [10, -8, 0], [400, 0.5, -1])
+        assert list(result.errors) == [OUT_OF_RANGE, UNDEFINED, DIVISION_BY_ZERO]
+        assert result.error_messages() == ["Error: Result is out of range for the float backend",
+                                           "Error: Result is undefined", "Error: Cannot divide by zero"]
+    
+    def test_invalid_requests(self):
+        """Test that unsupported operations and mismatched arrays raise ValueError."""
+        with pytest.raises(ValueError, match="Unsupported vector operation: factorial"):
+            self.engine.compute("factorial", [1])
+        with pytest.raises(ValueError, match="Operand arrays must have the same length"):
+            self.engine.compute("add", [1, 2], [1, 2, 3])
+        with pytest.raises(ValueError, match="requires two operands"):
+            self.engine.compute("add", [1, 2])
+    
+    def test_service_fallback(self, monkeypatch):
+        """Test that the service falls back cleanly when NumPy is not installed."""
+        monkeypatch.setattr(vector_engine, "HAS_NUMPY", False)
+        service = CalculatorService()
+        response = service.calculate_array("divide", [6, 1], [3, 0])
+        assert response["status"] == "success"
+        assert response["backend"] == "python"
+        assert response["result"].masked() == [2, None]
+        assert service.calculate_array("modulo", [1], [2])["error"] == "Error: Unsupported vector operation: modulo"
+        with pytest.raises(ValueError, match="NumPy is not installed"):
+            VectorEngine(use_numpy=True)
+
+
+class TestVectorEngineNumPy:
+    """Test the NumPy engine against the Python fallback."""
+    
+    def setup_method(self):
+        """Set up both engines."""
+        self.np = pytest.importorskip("numpy")
+        self.engine = VectorEngine(use_numpy=True)
+        self.fallback = VectorEngine(use_numpy=False)
+    
+    def test_matches_fallback(self):
+        """Test that NumPy results and error codes match the Python fallback."""
+        operand1 = [1.5, -4, 0, 10, -8, 2, 0]
+        operand2 = [2, 0, 3, 400, 0.5, -1, -1]
+        for operation in vector_engine.VECTOR_OPERATIONS:
+            expected = self.fallback.compute(operation, operand1, operand2)
+            result = self.engine.compute(operation, self.np.array(operand1), self.np.array(operand2))
+            assert list(result.errors) == list(expected.errors), operation
+            assert self.np.allclose(result.masked().filled(0), [value or 0 for value in expected.masked()]), operation
+    
+    def test_large_arrays_with_scalar(self):
+        """Test a million-element operation against a scalar."""
+        operand = self.np.arange(1_000_000, dtype=self.np.float64)
+        result = self.engine.compute("divide", 1.0, operand)
+        assert len(result) == 1_000_000
+        assert result.error_count == 1
+        assert result.errors[0] == DIVISION_BY_ZERO
+        assert result.values[4] == 0.25